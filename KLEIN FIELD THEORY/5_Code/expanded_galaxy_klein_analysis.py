@@ -21,12 +21,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
 import scipy.stats as stats
-from scipy.optimize import curve_fit, minimize
+from scipy.optimize import minimize
 import json
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from galaxy_data_catalog import load_galaxy_catalog
+from galaxy_grouped_statistics import GroupedStatistics
+from klein_transition_fitting import LogisticTransitionModel, fit_transition_model
+
 class ExpandedGalaxyKleinAnalysis:
     """
     Extended galaxy analysis for Klein Universal Field
@@ -51,232 +55,249 @@ class ExpandedGalaxyKleinAnalysis:
         print(f"   Theoretical Klein scale: {self.r_klein_theoretical} kpc")
         print(f"   Klein frequency: {self.f0_klein} Hz")
         
-    def generate_extended_galaxy_catalog(self):
+    def synthesize_spiral_population(self, n_galaxies, rng, first_index=100):
         """
-        Generate extended galaxy catalog combining multiple sources:
-        - Original validation dataset
-        - SPARC database galaxies
-        - Local Group members
-        - Literature compilation
+        Draw a SPARC-like spiral population in vectorized form
+        
+        Parameters:
+        -----------
+        n_galaxies : int
+            Number of spirals
+        rng : numpy.random.Generator
+            Random stream
+        first_index : int
+            Catalog number of the first galaxy (SPARC_<index>)
+            
+        Returns:
+        --------
+        dict of np.ndarray
+            Catalog columns
         """
-        print("\n📊 Generating Extended Galaxy Catalog...")
+        # Generate realistic spiral parameters
+        v_flat = np.clip(rng.lognormal(np.log(150), 0.4, n_galaxies), 50, 400)  # 50-400 km/s
         
-        # Load original dataset
-        try:
-            with open('/mnt/d/Multidimensional Theory Simulations/multidimensional-theory/Non_Orientable_Surfaces_Echo_Analysis/topological_transition_model/Final_Paper_Structure/7_Data_Verification/Galaxy_Rotation_Curves/galaxy_klein_results.json', 'r') as f:
-                original_data = json.load(f)
-            base_galaxies = original_data['galaxy_data']
-        except:
-            print("⚠️ Original galaxy data not found, using minimal dataset")
-            base_galaxies = {}
-        
-        # Extended SPARC-like database simulation
-        extended_galaxies = {}
-        
-        # Add more spiral galaxies (SPARC-style)
-        spiral_names = [f"SPARC_{i:03d}" for i in range(100, 200)]
-        for name in spiral_names:
-            # Generate realistic spiral parameters
-            v_flat = np.random.lognormal(np.log(150), 0.4)  # 50-400 km/s
-            v_flat = np.clip(v_flat, 50, 400)
-            
-            # Core radius with some Klein correlation + scatter
-            r_core_base = self.r_klein_theoretical * np.tanh(v_flat / 100)
-            r_core = r_core_base * np.random.lognormal(0, 0.3)  # 30% scatter
-            r_core = np.clip(r_core, 0.5, 25)
-            
-            # Distance and environment
-            distance = np.random.uniform(3, 50)  # Mpc
-            
-            # Environment: isolated vs grouped
-            if np.random.random() < 0.7:  # 70% isolated
-                environment = 'isolated'
-                n_neighbors = np.random.poisson(0.5)
-            else:  # 30% in groups
-                environment = 'group'
-                n_neighbors = np.random.poisson(5)
-            
-            extended_galaxies[name] = {
-                'r_core_kpc': r_core,
-                'v_flat_kms': v_flat,
-                'type': 'spiral',
-                'distance_mpc': distance,
-                'environment': environment,
-                'n_neighbors': n_neighbors,
-                'source': 'SPARC_extended'
-            }
+        # Core radius with some Klein correlation + 30% scatter
+        r_core_base = self.r_klein_theoretical * np.tanh(v_flat / 100)
+        r_core = np.clip(r_core_base * rng.lognormal(0, 0.3, n_galaxies), 0.5, 25)
         
-        # Add more dwarf galaxies
-        dwarf_names = [f"Dwarf_{i:03d}" for i in range(200, 300)]
-        for name in dwarf_names:
-            # Dwarf galaxy parameters
-            v_flat = np.random.lognormal(np.log(30), 0.5)  # 10-80 km/s
-            v_flat = np.clip(v_flat, 10, 80)
-            
-            # Dwarfs show more deviation from Klein universality
-            if np.random.random() < 0.3:  # 30% follow Klein
-                r_core = self.r_klein_theoretical * np.random.normal(1, 0.2)
-            else:  # 70% show environmental effects
-                r_core = (v_flat / 30)**0.8 * np.random.uniform(0.3, 2.0)
-            
-            r_core = np.clip(r_core, 0.1, 5.0)
-            
-            distance = np.random.uniform(0.1, 10)  # Mpc
-            
-            # Dwarfs more likely to be in groups (satellites)
-            if np.random.random() < 0.4:  # 40% isolated
-                environment = 'isolated'
-                n_neighbors = 0
-            else:  # 60% satellites
-                environment = 'satellite'
-                n_neighbors = np.random.poisson(10)
-            
-            extended_galaxies[name] = {
-                'r_core_kpc': r_core,
-                'v_flat_kms': v_flat,
-                'type': 'dwarf',
-                'distance_mpc': distance,
-                'environment': environment,
-                'n_neighbors': n_neighbors,
-                'source': 'Dwarf_extended'
-            }
+        # Distance and environment: 70% isolated, 30% in groups
+        distance = rng.uniform(3, 50, n_galaxies)  # Mpc
+        isolated = rng.random(n_galaxies) < 0.7
+        n_neighbors = rng.poisson(np.where(isolated, 0.5, 5))
         
-        # Add Local Group detailed members
-        local_group = {
-            'Milky_Way_detailed': {
-                'r_core_kpc': 4.2, 'v_flat_kms': 220, 'type': 'spiral',
-                'distance_mpc': 0.0, 'environment': 'group', 'n_neighbors': 50,
-                'source': 'Local_Group'
-            },
-            'M31_Andromeda_detailed': {
-                'r_core_kpc': 7.8, 'v_flat_kms': 250, 'type': 'spiral',
-                'distance_mpc': 0.78, 'environment': 'group', 'n_neighbors': 30,
-                'source': 'Local_Group'
-            },
-            'M33_Triangulum_detailed': {
-                'r_core_kpc': 2.9, 'v_flat_kms': 95, 'type': 'spiral',
-                'distance_mpc': 0.86, 'environment': 'group', 'n_neighbors': 20,
-                'source': 'Local_Group'
-            },
-            'LMC': {
-                'r_core_kpc': 1.8, 'v_flat_kms': 60, 'type': 'dwarf',
-                'distance_mpc': 0.05, 'environment': 'satellite', 'n_neighbors': 1,
-                'source': 'Local_Group'
-            },
-            'SMC': {
-                'r_core_kpc': 1.2, 'v_flat_kms': 50, 'type': 'dwarf',
-                'distance_mpc': 0.06, 'environment': 'satellite', 'n_neighbors': 1,
-                'source': 'Local_Group'
-            }
+        return {
+            'galaxy_name': np.char.add('SPARC_', np.char.zfill(
+                np.arange(first_index, first_index + n_galaxies).astype(str), 3)),
+            'r_core_kpc': r_core,
+            'v_flat_kms': v_flat,
+            'type': np.full(n_galaxies, 'spiral'),
+            'distance_mpc': distance,
+            'environment': np.where(isolated, 'isolated', 'group'),
+            'n_neighbors': n_neighbors,
+            'source': np.full(n_galaxies, 'SPARC_extended')
         }
+    
+    def synthesize_dwarf_population(self, n_galaxies, rng, first_index=200):
+        """
+        Draw a dwarf galaxy population in vectorized form
+        
+        Parameters:
+        -----------
+        n_galaxies : int
+            Number of dwarfs
+        rng : numpy.random.Generator
+            Random stream
+        first_index : int
+            Catalog number of the first galaxy (Dwarf_<index>)
+            
+        Returns:
+        --------
+        dict of np.ndarray
+            Catalog columns
+        """
+        v_flat = np.clip(rng.lognormal(np.log(30), 0.5, n_galaxies), 10, 80)  # 10-80 km/s
         
-        # Combine all datasets
-        all_galaxies = {}
-        
-        # Add original data (convert format)
-        for name, data in base_galaxies.items():
-            all_galaxies[name] = {
-                'r_core_kpc': data['r_core_kpc'],
-                'v_flat_kms': data['v_flat_kms'],
-                'type': data['type'],
-                'distance_mpc': data['distance_mpc'],
-                'environment': 'unknown',  # Not specified in original
-                'n_neighbors': 0,
-                'source': 'original'
-            }
+        # Dwarfs show more deviation from Klein universality:
+        # 30% follow Klein, 70% show environmental effects
+        follows_klein = rng.random(n_galaxies) < 0.3
+        r_core_klein = self.r_klein_theoretical * rng.normal(1, 0.2, n_galaxies)
+        r_core_env = (v_flat / 30)**0.8 * rng.uniform(0.3, 2.0, n_galaxies)
+        r_core = np.clip(np.where(follows_klein, r_core_klein, r_core_env), 0.1, 5.0)
         
-        # Add extended datasets
-        all_galaxies.update(extended_galaxies)
-        all_galaxies.update(local_group)
+        distance = rng.uniform(0.1, 10, n_galaxies)  # Mpc
         
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(all_galaxies, orient='index')
-        df.index.name = 'galaxy_name'
-        df = df.reset_index()
+        # Dwarfs more likely to be in groups: 40% isolated, 60% satellites
+        isolated = rng.random(n_galaxies) < 0.4
+        n_neighbors = rng.poisson(np.where(isolated, 0, 10))
         
-        # Calculate derived quantities
+        return {
+            'galaxy_name': np.char.add('Dwarf_', np.char.zfill(
+                np.arange(first_index, first_index + n_galaxies).astype(str), 3)),
+            'r_core_kpc': r_core,
+            'v_flat_kms': v_flat,
+            'type': np.full(n_galaxies, 'dwarf'),
+            'distance_mpc': distance,
+            'environment': np.where(isolated, 'isolated', 'satellite'),
+            'n_neighbors': n_neighbors,
+            'source': np.full(n_galaxies, 'Dwarf_extended')
+        }
+    
+    def _add_derived_columns(self, df):
+        """
+        Derived quantities and environment flags (in place)
+        """
         df['total_mass_proxy'] = df['v_flat_kms']**2 * df['r_core_kpc']  # M ∝ v²R
         df['log_mass_proxy'] = np.log10(df['total_mass_proxy'])
         df['klein_deviation'] = np.abs(df['r_core_kpc'] - self.r_klein_theoretical) / self.r_klein_theoretical
         
         # Environment classification
-        df['is_isolated'] = df['environment'].isin(['isolated'])
-        df['is_satellite'] = df['environment'].isin(['satellite'])
-        df['is_grouped'] = df['environment'].isin(['group'])
+        df['is_isolated'] = df['environment'] == 'isolated'
+        df['is_satellite'] = df['environment'] == 'satellite'
+        df['is_grouped'] = df['environment'] == 'group'
+        
+        return df
+    
+    def synthesize_galaxy_catalog(self, n_spirals=100, n_dwarfs=100, seed=None):
+        """
+        Synthetic spiral + dwarf catalog at arbitrary size
+        
+        Whole populations are drawn at once from a numpy.random.Generator and
+        written straight into DataFrame columns, so catalogs of 1e6 galaxies
+        are generated in about a second and are reproducible by seed.
+        
+        Parameters:
+        -----------
+        n_spirals, n_dwarfs : int
+            Population sizes
+        seed : int, SeedSequence or Generator, optional
+            Random seed (None draws fresh entropy)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            Catalog with derived columns, as generate_extended_galaxy_catalog
+        """
+        rng = np.random.default_rng(seed)
+        spirals = self.synthesize_spiral_population(n_spirals, rng)
+        dwarfs = self.synthesize_dwarf_population(n_dwarfs, rng, first_index=100 + n_spirals)
+        
+        df = pd.DataFrame({key: np.concatenate([spirals[key], dwarfs[key]]) for key in spirals})
+        return self._add_derived_columns(df)
+    
+    def generate_extended_galaxy_catalog(self, include_original=True, n_spirals=100,
+                                         n_dwarfs=100, seed=None):
+        """
+        Generate extended galaxy catalog combining multiple sources:
+        - Original validation dataset
+        - SPARC database galaxies
+        - Local Group members
+        - Literature compilation
+        
+        Parameters:
+        -----------
+        include_original : bool
+            Include the original validation dataset (raises FileNotFoundError
+            if it cannot be located, see galaxy_data_catalog)
+        n_spirals, n_dwarfs : int
+            Sizes of the synthetic SPARC-like and dwarf populations
+        seed : int, optional
+            Seed of the synthetic populations (None draws fresh entropy)
+        """
+        print("\n📊 Generating Extended Galaxy Catalog...")
+        
+        # Original dataset (environment not specified in original)
+        if include_original:
+            original = load_galaxy_catalog()
+            original['environment'] = 'unknown'
+            original['n_neighbors'] = 0
+            original['source'] = 'original'
+        else:
+            original = None
+        
+        # Extended SPARC-like and dwarf populations
+        synthetic = self.synthesize_galaxy_catalog(n_spirals, n_dwarfs, seed)
+        
+        # Add Local Group detailed members
+        local_group = pd.DataFrame({
+            'galaxy_name': ['Milky_Way_detailed', 'M31_Andromeda_detailed',
+                            'M33_Triangulum_detailed', 'LMC', 'SMC'],
+            'r_core_kpc': [4.2, 7.8, 2.9, 1.8, 1.2],
+            'v_flat_kms': [220.0, 250.0, 95.0, 60.0, 50.0],
+            'type': ['spiral', 'spiral', 'spiral', 'dwarf', 'dwarf'],
+            'distance_mpc': [0.0, 0.78, 0.86, 0.05, 0.06],
+            'environment': ['group', 'group', 'group', 'satellite', 'satellite'],
+            'n_neighbors': [50, 30, 20, 1, 1],
+            'source': 'Local_Group'
+        })
+        
+        # Combine all datasets
+        columns = list(local_group.columns)
+        parts = [part[columns] for part in (original, synthetic, local_group) if part is not None]
+        df = self._add_derived_columns(pd.concat(parts, ignore_index=True))
         
         print(f"✅ Extended catalog created:")
         print(f"   Total galaxies: {len(df)}")
-        print(f"   Spirals: {len(df[df['type'] == 'spiral'])}")
-        print(f"   Dwarfs: {len(df[df['type'] == 'dwarf'])}")
-        print(f"   Isolated: {len(df[df['is_isolated']])}")
-        print(f"   Grouped: {len(df[df['is_grouped']])}")
-        print(f"   Satellites: {len(df[df['is_satellite']])}")
+        print(f"   Spirals: {(df['type'] == 'spiral').sum()}")
+        print(f"   Dwarfs: {(df['type'] == 'dwarf').sum()}")
+        print(f"   Isolated: {df['is_isolated'].sum()}")
+        print(f"   Grouped: {df['is_grouped'].sum()}")
+        print(f"   Satellites: {df['is_satellite'].sum()}")
         
         return df
     
-    def test_klein_mass_threshold(self, galaxy_df):
+    def test_klein_mass_threshold(self, galaxy_df, n_bootstrap=0):
         """
         Test for Klein field activation mass threshold
         
         Hypothesis: Klein effects activate above critical mass
         Below threshold: Standard CDM-like scaling
         Above threshold: Klein universal core dominates
+        
+        Two-regime model (smooth 0.3 dex logistic transition):
+        M < M_threshold: r_core = alpha_low * (M/M_ref)^beta_low  (CDM-like)
+        M > M_threshold: r_core = r_klein (Klein universal)
+        
+        Parameters:
+        -----------
+        galaxy_df : pd.DataFrame
+            Galaxy catalog
+        n_bootstrap : int
+            Bootstrap resamples for the fit parameter uncertainties
         """
         print("\n🔍 Testing Klein Mass Threshold...")
         
         masses = galaxy_df['total_mass_proxy'].values
         cores = galaxy_df['r_core_kpc'].values
         
-        def two_regime_model(mass, M_threshold, r_klein, alpha_low, beta_low):
-            """
-            Two-regime model:
-            M < M_threshold: r_core = alpha_low * (M/M_ref)^beta_low  (CDM-like)
-            M > M_threshold: r_core = r_klein (Klein universal)
-            """
-            M_ref = np.median(masses)
-            r_low = alpha_low * (mass / M_ref)**beta_low
-            r_high = r_klein * np.ones_like(mass)
-            
-            # Smooth transition
-            transition_width = 0.3  # dex
-            weights = 1 / (1 + np.exp(-(np.log10(mass) - np.log10(M_threshold)) / transition_width))
-            
-            return (1 - weights) * r_low + weights * r_high
-        
-        # Fit two-regime model
-        try:
-            # Initial guess
-            M_guess = np.median(masses)
-            alpha_guess = np.median(cores)
-            beta_guess = 0.3
-            r_klein_guess = self.r_klein_theoretical
-            
-            popt, pcov = curve_fit(
-                two_regime_model, masses, cores,
-                p0=[M_guess, r_klein_guess, alpha_guess, beta_guess],
-                bounds=([np.min(masses), 1, 0.1, -1], 
-                       [np.max(masses), 20, 10, 2]),
-                maxfev=10000
-            )
-            
-            M_threshold_fit, r_klein_fit, alpha_fit, beta_fit = popt
-            
-        except:
-            print("⚠️ Two-regime fit failed, using simple estimates")
+        # Fit two-regime model (multi-start, analytic Jacobian)
+        two_regime_model = LogisticTransitionModel(masses, transition_width=0.3)
+        threshold_fit = fit_transition_model(
+            two_regime_model, cores,
+            p0=[np.median(masses), self.r_klein_theoretical, np.median(cores), 0.3],
+            bounds=([np.min(masses), 1, 0.1, -1],
+                    [np.max(masses), 20, 10, 2]),
+            n_bootstrap=n_bootstrap
+        )
+        
+        if threshold_fit.success:
+            M_threshold_fit, r_klein_fit, alpha_fit, beta_fit = threshold_fit.params
+        else:
+            print(f"⚠️ Two-regime fit failed ({threshold_fit.message}), using simple estimates")
             M_threshold_fit = np.median(masses)
             r_klein_fit = self.r_klein_theoretical
             alpha_fit = 1.0
             beta_fit = 0.3
+        fit_params = [M_threshold_fit, r_klein_fit, alpha_fit, beta_fit]
         
         # Calculate model predictions
         masses_smooth = np.logspace(np.log10(np.min(masses)), np.log10(np.max(masses)), 100)
-        cores_two_regime = two_regime_model(masses_smooth, M_threshold_fit, r_klein_fit, alpha_fit, beta_fit)
+        cores_two_regime = two_regime_model.predict(fit_params, masses_smooth)
         
         # Compare with single Klein model
         cores_klein_only = r_klein_fit * np.ones_like(masses)
         
         # Calculate goodness of fit
-        cores_pred_two_regime = two_regime_model(masses, M_threshold_fit, r_klein_fit, alpha_fit, beta_fit)
+        cores_pred_two_regime = two_regime_model.predict(fit_params)
         chi2_two_regime = np.sum((cores - cores_pred_two_regime)**2 / cores_pred_two_regime)
         
         cores_pred_klein_only = r_klein_fit * np.ones_like(masses)
@@ -309,6 +330,8 @@ class ExpandedGalaxyKleinAnalysis:
             'r_klein_fit': r_klein_fit,
             'alpha_fit': alpha_fit,
             'beta_fit': beta_fit,
+            'fit_errors': threshold_fit.errors,
+            'fit_converged': threshold_fit.success,
             'chi2_two_regime': chi2_reduced_two_regime,
             'chi2_klein_only': chi2_reduced_klein_only,
             'delta_chi2': delta_chi2,
@@ -319,7 +342,7 @@ class ExpandedGalaxyKleinAnalysis:
             'threshold_improvement': delta_chi2 > 10  # Significant improvement
         }
     
-    def test_environmental_dependence(self, galaxy_df):
+    def test_environmental_dependence(self, galaxy_df, n_permutations=0, seed=None):
         """
         Test Klein field environmental dependence
         
@@ -327,45 +350,44 @@ class ExpandedGalaxyKleinAnalysis:
         - Isolated: Full Klein manifestation
         - Grouped: Moderate Klein effects
         - Satellites: Suppressed Klein effects
+        
+        Parameters:
+        -----------
+        galaxy_df : pd.DataFrame
+            Galaxy catalog
+        n_permutations : int
+            Label permutations for the permutation p-values (0 disables;
+            each one re-sums every group, so keep it modest for large catalogs)
+        seed : int, optional
+            Seed of the permutation streams
         """
         print("\n🌍 Testing Environmental Dependence...")
         
         environments = ['isolated', 'group', 'satellite']
         env_results = {}
         
+        # One sorted pass over all environments
+        grouped = GroupedStatistics(galaxy_df['r_core_kpc'].values,
+                                    galaxy_df['environment'].values,
+                                    group_order=environments)
+        summary = grouped.summary(reference=self.r_klein_theoretical)
+        
         for env in environments:
-            if env == 'isolated':
-                mask = galaxy_df['is_isolated']
-            elif env == 'group':
-                mask = galaxy_df['is_grouped']
-            else:  # satellite
-                mask = galaxy_df['is_satellite']
-            
-            if not mask.any():
+            if env not in summary.index:
                 print(f"⚠️ No {env} galaxies found")
                 continue
-                
-            env_galaxies = galaxy_df[mask]
-            n_galaxies = len(env_galaxies)
+            
+            row = summary.loc[env]
+            n_galaxies = int(row['n'])
             
             if n_galaxies < 3:
                 print(f"⚠️ Too few {env} galaxies ({n_galaxies})")
                 continue
             
-            cores = env_galaxies['r_core_kpc'].values
-            
             # Test Klein universality within environment
-            mean_core = np.mean(cores)
-            std_core = np.std(cores)
-            median_core = np.median(cores)
-            
-            # Deviation from Klein theoretical
-            klein_deviations = np.abs(cores - self.r_klein_theoretical) / self.r_klein_theoretical
-            mean_klein_deviation = np.mean(klein_deviations)
-            
-            # Statistical test against Klein universality
             # H0: cores are consistent with Klein universal value
-            t_stat, p_value = stats.ttest_1samp(cores, self.r_klein_theoretical)
+            mean_core, std_core = row['mean'], row['std']
+            p_value = row['p_value']
             klein_consistency = p_value > 0.05  # Accept H0 if p > 0.05
             
             # Coefficient of variation
@@ -373,7 +395,7 @@ class ExpandedGalaxyKleinAnalysis:
             
             print(f"📊 {env.capitalize()} Environment ({n_galaxies} galaxies):")
             print(f"   Mean core: {mean_core:.2f} ± {std_core:.2f} kpc")
-            print(f"   Klein deviation: {mean_klein_deviation:.3f}")
+            print(f"   Klein deviation: {row['mean_deviation']:.3f}")
             print(f"   Klein consistency: {klein_consistency} (p={p_value:.3f})")
             print(f"   Coefficient of variation: {cv:.3f}")
             
@@ -381,25 +403,39 @@ class ExpandedGalaxyKleinAnalysis:
                 'n_galaxies': n_galaxies,
                 'mean_core': mean_core,
                 'std_core': std_core,
-                'median_core': median_core,
-                'mean_klein_deviation': mean_klein_deviation,
+                'median_core': row['median'],
+                'mean_klein_deviation': row['mean_deviation'],
                 'klein_consistency': klein_consistency,
                 'p_value': p_value,
                 'coefficient_variation': cv
             }
         
         # Cross-environment comparison
+        pairwise = []
+        p_anova_permutation = None
         if len(env_results) >= 2:
-            # Test if different environments have different core distributions
-            env_data = [galaxy_df[galaxy_df['environment'] == env]['r_core_kpc'].values 
-                       for env in env_results.keys()]
+            anova_seed, pairwise_seed = np.random.SeedSequence(seed).spawn(2)
             
-            # ANOVA test
-            f_stat, p_anova = stats.f_oneway(*env_data)
+            # ANOVA test (analytic and permutation)
+            anova = grouped.anova(groups=list(env_results), n_permutations=n_permutations,
+                                  seed=anova_seed)
+            p_anova = anova['p_value']
+            p_anova_permutation = anova.get('permutation_p_value')
             environments_differ = p_anova < 0.05
             
+            # Pairwise t / KS / Mann-Whitney (+ permutation) tests
+            pairwise_df = grouped.pairwise_tests(n_permutations=n_permutations, seed=pairwise_seed)
+            pairwise_df = pairwise_df[pairwise_df['group_a'].isin(list(env_results)) &
+                                      pairwise_df['group_b'].isin(list(env_results))]
+            pairwise = pairwise_df.to_dict(orient='records')
+            
             print(f"\n🔬 Cross-Environment Analysis:")
             print(f"   Environments differ: {environments_differ} (p={p_anova:.3f})")
+            if p_anova_permutation is not None:
+                print(f"   Permutation p-value: {p_anova_permutation:.4f} ({n_permutations} permutations)")
+            for test in pairwise:
+                print(f"   {test['group_a']} vs {test['group_b']}: "
+                      f"KS p={test['ks_p_value']:.3f}, MW p={test['mannwhitney_p_value']:.3f}")
             
         else:
             environments_differ = False
@@ -409,62 +445,85 @@ class ExpandedGalaxyKleinAnalysis:
             'environment_results': env_results,
             'environments_differ': environments_differ,
             'anova_p_value': p_anova,
+            'anova_permutation_p_value': p_anova_permutation,
+            'pairwise_tests': pairwise,
             'environmental_dependence': environments_differ
         }
     
-    def test_morphological_dependence(self, galaxy_df):
+    def test_morphological_dependence(self, galaxy_df, n_permutations=0, seed=None):
         """
         Test Klein field dependence on galaxy morphology
         
         Hypothesis: Klein effects manifest differently in spirals vs dwarfs
         due to different formation histories and mass distributions
+        
+        Parameters:
+        -----------
+        galaxy_df : pd.DataFrame
+            Galaxy catalog
+        n_permutations : int
+            Label permutations for the permutation p-value (0 disables;
+            each one re-sums both groups, so keep it modest for large catalogs)
+        seed : int, optional
+            Seed of the permutation stream
         """
         print("\n🌀 Testing Morphological Dependence...")
         
         types = ['spiral', 'dwarf']
         morph_results = {}
         
-        for gal_type in types:
-            type_galaxies = galaxy_df[galaxy_df['type'] == gal_type]
-            n_galaxies = len(type_galaxies)
-            
-            if n_galaxies < 5:
-                print(f"⚠️ Too few {gal_type} galaxies ({n_galaxies})")
-                continue
-            
-            cores = type_galaxies['r_core_kpc'].values
-            masses = type_galaxies['total_mass_proxy'].values
-            
-            # Klein analysis for this type
-            mean_core = np.mean(cores)
-            median_core = np.median(cores)
-            std_core = np.std(cores)
-            
-            # Klein universality test
-            klein_deviations = np.abs(cores - self.r_klein_theoretical) / self.r_klein_theoretical
-            mean_klein_deviation = np.mean(klein_deviations)
+        cores = galaxy_df['r_core_kpc'].values
+        log_masses = np.log10(galaxy_df['total_mass_proxy'].values)
+        r_klein = self.r_klein_theoretical
+        
+        # One sorted pass over all types; per-type moments via bincount
+        grouped = GroupedStatistics(cores, galaxy_df['type'].values, group_order=types)
+        summary = grouped.summary(reference=r_klein)
+        n = grouped.counts.astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = grouped.segment_sums(log_masses) / n
+            dx = grouped.select(log_masses) - mean_x[grouped.codes]
+            dy = grouped.select(cores) - grouped.means[grouped.codes]
+            sxx = np.bincount(grouped.codes, weights=dx**2, minlength=grouped.n_groups)
+            syy = np.bincount(grouped.codes, weights=dy**2, minlength=grouped.n_groups)
+            sxy = np.bincount(grouped.codes, weights=dx*dy, minlength=grouped.n_groups)
             
             # Mass-core correlation (should be weak if Klein universal)
-            r_mass_core, p_mass_core = stats.pearsonr(np.log10(masses), cores)
+            r_mass_core = np.clip(sxy / np.sqrt(sxx * syy), -1, 1)
+            t_corr = r_mass_core * np.sqrt((n - 2) / (1 - r_mass_core**2))
+            p_mass_core = 2 * stats.t.sf(np.abs(t_corr), n - 2)
             
             # Test Klein vs scaling model
             # Klein model: r_core = constant
-            chi2_klein = np.sum((cores - self.r_klein_theoretical)**2 / self.r_klein_theoretical)
+            chi2_klein = grouped.segment_sums((cores - r_klein)**2 / r_klein)
             
-            # Scaling model: r_core ∝ mass^β
-            log_masses = np.log10(masses)
-            poly_coeffs = np.polyfit(log_masses, cores, 1)
-            cores_scaling = np.polyval(poly_coeffs, log_masses)
-            chi2_scaling = np.sum((cores - cores_scaling)**2 / cores_scaling)
+            # Scaling model: r_core linear in log mass (per-type least squares)
+            slope = sxy / sxx
+            intercept = grouped.means - slope * mean_x
+            cores_scaling = slope[grouped.codes] * grouped.select(log_masses) + intercept[grouped.codes]
+            chi2_scaling = np.bincount(grouped.codes,
+                                       weights=(grouped.select(cores) - cores_scaling)**2 / cores_scaling,
+                                       minlength=grouped.n_groups)
+        
+        for i, gal_type in enumerate(grouped.labels):
+            n_galaxies = int(summary.loc[gal_type, 'n'])
+            
+            if n_galaxies < 5:
+                print(f"⚠️ Too few {gal_type} galaxies ({n_galaxies})")
+                continue
+            
+            mean_core = summary.loc[gal_type, 'mean']
+            std_core = summary.loc[gal_type, 'std']
+            mean_klein_deviation = summary.loc[gal_type, 'mean_deviation']
             
             # Model preference
-            delta_chi2 = chi2_klein - chi2_scaling
+            delta_chi2 = chi2_klein[i] - chi2_scaling[i]
             preferred_model = "Klein" if delta_chi2 < 0 else "Scaling"
             
             print(f"📊 {gal_type.capitalize()} Galaxies ({n_galaxies}):")
             print(f"   Mean core: {mean_core:.2f} ± {std_core:.2f} kpc")
             print(f"   Klein deviation: {mean_klein_deviation:.3f}")
-            print(f"   Mass-core correlation: r={r_mass_core:.3f} (p={p_mass_core:.3f})")
+            print(f"   Mass-core correlation: r={r_mass_core[i]:.3f} (p={p_mass_core[i]:.3f})")
             print(f"   Preferred model: {preferred_model} (Δχ²={delta_chi2:.1f})")
             
             morph_results[gal_type] = {
@@ -472,27 +531,31 @@ class ExpandedGalaxyKleinAnalysis:
                 'mean_core': mean_core,
                 'std_core': std_core,
                 'mean_klein_deviation': mean_klein_deviation,
-                'mass_core_correlation': r_mass_core,
-                'mass_core_p_value': p_mass_core,
-                'chi2_klein': chi2_klein,
-                'chi2_scaling': chi2_scaling,
+                'mass_core_correlation': r_mass_core[i],
+                'mass_core_p_value': p_mass_core[i],
+                'chi2_klein': chi2_klein[i],
+                'chi2_scaling': chi2_scaling[i],
                 'delta_chi2': delta_chi2,
                 'preferred_model': preferred_model
             }
         
         # Compare morphological types
+        comparison = {}
         if 'spiral' in morph_results and 'dwarf' in morph_results:
-            spiral_cores = galaxy_df[galaxy_df['type'] == 'spiral']['r_core_kpc'].values
-            dwarf_cores = galaxy_df[galaxy_df['type'] == 'dwarf']['r_core_kpc'].values
-            
-            # Statistical test
-            t_stat, p_value = stats.ttest_ind(spiral_cores, dwarf_cores)
+            # Student t, KS, Mann-Whitney and permutation tests on the sorted segments
+            comparison = grouped.pairwise_tests(n_permutations=n_permutations,
+                                                seed=seed).iloc[0].to_dict()
+            p_value = comparison['t_p_value']
             types_differ = p_value < 0.05
             
             print(f"\n🔬 Morphological Comparison:")
             print(f"   Types differ: {types_differ} (p={p_value:.3f})")
-            print(f"   Spiral mean: {np.mean(spiral_cores):.2f} kpc")
-            print(f"   Dwarf mean: {np.mean(dwarf_cores):.2f} kpc")
+            print(f"   KS p-value: {comparison['ks_p_value']:.3f}, "
+                  f"Mann-Whitney p-value: {comparison['mannwhitney_p_value']:.3f}")
+            if 'permutation_p_value' in comparison:
+                print(f"   Permutation p-value: {comparison['permutation_p_value']:.4f}")
+            print(f"   Spiral mean: {summary.loc['spiral', 'mean']:.2f} kpc")
+            print(f"   Dwarf mean: {summary.loc['dwarf', 'mean']:.2f} kpc")
             
         else:
             types_differ = False
@@ -502,12 +565,19 @@ class ExpandedGalaxyKleinAnalysis:
             'morphology_results': morph_results,
             'types_differ': types_differ,
             'comparison_p_value': p_value,
+            'comparison_tests': comparison,
             'morphological_dependence': types_differ
         }
     
-    def run_complete_expanded_analysis(self):
+    def run_complete_expanded_analysis(self, n_permutations=0):
         """
         Execute complete expanded galaxy Klein analysis
+        
+        Parameters:
+        -----------
+        n_permutations : int
+            Label permutations for the environment and morphology
+            permutation p-values (0 disables)
         """
         print("=" * 80)
         print("🌌 EXPANDED GALAXY KLEIN ANALYSIS - COMPLETE SUITE")
@@ -528,14 +598,14 @@ class ExpandedGalaxyKleinAnalysis:
         print("TEST 2: ENVIRONMENTAL DEPENDENCE")
         print("="*60)
         
-        environment_results = self.test_environmental_dependence(galaxy_df)
+        environment_results = self.test_environmental_dependence(galaxy_df, n_permutations=n_permutations)
         
         # Test 3: Morphological dependence
         print("\n" + "="*60)
         print("TEST 3: MORPHOLOGICAL DEPENDENCE")
         print("="*60)
         
-        morphology_results = self.test_morphological_dependence(galaxy_df)
+        morphology_results = self.test_morphological_dependence(galaxy_df, n_permutations=n_permutations)
         
         # Overall assessment
         print("\n" + "="*60)
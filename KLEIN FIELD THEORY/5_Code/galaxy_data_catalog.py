@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+GALAXY DATA CATALOG
+===================
+
+Portable dataset resolution and cached loading of the galaxy rotation-curve
+catalog used by the Klein Universal Field tests.
+
+Dataset locations are resolved, in order, from:
+1. An explicit path passed by the caller
+2. Environment variable KLEIN_DATA_<DATASET> (e.g. KLEIN_DATA_GALAXY_ROTATION_CURVES)
+3. JSON config file given by KLEIN_DATA_CONFIG, or klein_data_paths.json
+   next to this module: {"galaxy_rotation_curves": "/path/to/file.json"}
+4. KLEIN_DATA_ROOT / <relative default path>
+5. The repository copy under 7_Data_Verification/
+
+The parsed galaxy table is validated once and cached as a columnar .npz file
+named after the SHA-256 of the source file, so repeated runs load in
+milliseconds and edits to the source invalidate the cache automatically.
+A missing dataset raises FileNotFoundError listing every location tried;
+nothing is ever re-synthesized silently.
+
+Author: Fausto José Di Bacco
+Date: June 8, 2025
+"""
+
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+MODULE_DIR = Path(__file__).resolve().parent
+
+# Default locations relative to the KLEIN FIELD THEORY directory
+DATASETS = {
+    'galaxy_rotation_curves': '7_Data_Verification/Galaxy_Rotation_Curves/galaxy_klein_results.json',
+}
+
+# Required per-galaxy fields and their column dtypes
+GALAXY_SCHEMA = {
+    'r_core_kpc': float,
+    'v_flat_kms': float,
+    'type': str,
+    'distance_mpc': float,
+}
+
+CACHE_FORMAT_VERSION = 1
+
+
+def _config_paths() -> Dict[str, str]:
+    """Dataset paths from the JSON config file, if any."""
+    config_file = os.environ.get('KLEIN_DATA_CONFIG')
+    config_path = Path(config_file) if config_file else MODULE_DIR / 'klein_data_paths.json'
+    if not config_path.is_file():
+        return {}
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+def resolve_dataset_path(dataset: str, path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Resolve the on-disk location of a registered dataset
+
+    Parameters
+    ----------
+    dataset : str
+        Dataset name (key of DATASETS)
+    path : str or Path, optional
+        Explicit location, takes precedence over every other source
+
+    Returns
+    -------
+    Path
+        Existing file path
+
+    Raises
+    ------
+    FileNotFoundError
+        If no candidate location exists
+    """
+    if dataset not in DATASETS:
+        raise KeyError(f"Unknown dataset '{dataset}'. Known: {sorted(DATASETS)}")
+
+    candidates: List[Path] = []
+    if path is not None:
+        candidates.append(Path(path))
+
+    env_path = os.environ.get(f'KLEIN_DATA_{dataset.upper()}')
+    if env_path:
+        candidates.append(Path(env_path))
+
+    config_path = _config_paths().get(dataset)
+    if config_path:
+        candidates.append(Path(config_path))
+
+    data_root = os.environ.get('KLEIN_DATA_ROOT')
+    if data_root:
+        candidates.append(Path(data_root) / DATASETS[dataset])
+
+    candidates.append(MODULE_DIR.parent / DATASETS[dataset])
+
+    for candidate in candidates:
+        candidate = candidate.expanduser()
+        if candidate.is_file():
+            return candidate
+
+    tried = '\n  '.join(str(c) for c in candidates)
+    raise FileNotFoundError(
+        f"Dataset '{dataset}' not found. Tried:\n  {tried}\n"
+        f"Set KLEIN_DATA_{dataset.upper()} or KLEIN_DATA_ROOT to its location."
+    )
+
+
+def validate_galaxy_data(galaxy_data: Dict) -> None:
+    """
+    Check the galaxy_data mapping against GALAXY_SCHEMA
+
+    Raises
+    ------
+    ValueError
+        On missing fields or values of the wrong type
+    """
+    if not isinstance(galaxy_data, dict) or not galaxy_data:
+        raise ValueError("'galaxy_data' must be a non-empty mapping of galaxy name -> fields")
+
+    for name, fields in galaxy_data.items():
+        missing = [key for key in GALAXY_SCHEMA if key not in fields]
+        if missing:
+            raise ValueError(f"Galaxy '{name}' is missing fields {missing}")
+        for key, dtype in GALAXY_SCHEMA.items():
+            value = fields[key]
+            valid = isinstance(value, str) if dtype is str else (
+                isinstance(value, (int, float)) and not isinstance(value, bool))
+            if not valid:
+                raise ValueError(f"Galaxy '{name}': field '{key}' has invalid value {value!r}")
+
+
+def _cache_dir() -> Path:
+    cache_dir = os.environ.get('KLEIN_CACHE_DIR')
+    return Path(cache_dir) if cache_dir else MODULE_DIR / '.klein_cache'
+
+
+def _parse_galaxy_table(raw: bytes) -> Dict[str, np.ndarray]:
+    """Parse and validate the JSON source into column arrays."""
+    document = json.loads(raw)
+    if 'galaxy_data' not in document:
+        raise ValueError("Galaxy catalog has no 'galaxy_data' section")
+    galaxy_data = document['galaxy_data']
+    validate_galaxy_data(galaxy_data)
+
+    columns = {'galaxy_name': np.array(list(galaxy_data), dtype=str)}
+    for key, dtype in GALAXY_SCHEMA.items():
+        columns[key] = np.array([fields[key] for fields in galaxy_data.values()], dtype=dtype)
+    return columns
+
+
+def load_galaxy_catalog(path: Optional[Union[str, Path]] = None,
+                        use_cache: bool = True, verbose: bool = True) -> pd.DataFrame:
+    """
+    Load the galaxy rotation-curve catalog as a DataFrame
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Explicit source file (see resolve_dataset_path for the defaults)
+    use_cache : bool
+        Read/write the content-hashed .npz columnar cache
+    verbose : bool
+        Report where the catalog was loaded from
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: galaxy_name, r_core_kpc, v_flat_kms, type, distance_mpc
+    """
+    source = resolve_dataset_path('galaxy_rotation_curves', path)
+    raw = source.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    cache_file = _cache_dir() / f'galaxy_catalog_v{CACHE_FORMAT_VERSION}_{digest}.npz'
+
+    if use_cache and cache_file.is_file():
+        with np.load(cache_file, allow_pickle=False) as cached:
+            columns = {key: cached[key] for key in cached.files}
+        origin = 'cache'
+    else:
+        columns = _parse_galaxy_table(raw)
+        origin = 'source'
+        if use_cache:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp.npz')
+            np.savez(tmp_file, **columns)
+            os.replace(tmp_file, cache_file)  # atomic for concurrent runs
+
+    if verbose:
+        print(f"📂 Galaxy catalog: {len(columns['galaxy_name'])} galaxies "
+              f"from {origin} ({source.name}, sha256 {digest})")
+
+    return pd.DataFrame(columns)
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+GALAXY GROUPED STATISTICS
+=========================
+
+Grouped-statistics engine for the environmental and morphological Klein
+dependence tests. The catalog is factorized and sorted once by
+(group, value); every per-group summary, one-sample test, ANOVA and
+pairwise comparison (Student t, Kolmogorov-Smirnov, Mann-Whitney) is then
+derived from the sorted contiguous segments and their segment sums, without
+re-slicing the DataFrame.
+
+Permutation p-values for the ANOVA F statistic (and, for pairs, the
+equivalent two-sided mean difference) are computed in batches of label
+permutations with bincount group sums, so they stay fast on
+catalogs of 1e5-1e6 galaxies.
+
+Author: Fausto José Di Bacco
+Date: June 8, 2025
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from itertools import combinations
+from typing import Optional, Sequence
+
+# Size limits of scipy's default (method='auto') exact tests
+KS_EXACT_MAX_N = 10000      # ks_2samp: exact if max(n1, n2) <= this
+MANNWHITNEY_EXACT_MAX_N = 8  # mannwhitneyu: exact if min(n1, n2) <= this and no ties
+
+
+def _segment_sums(values: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Sums over contiguous segments (empty segments give 0)."""
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    return cumulative[starts + counts] - cumulative[starts]
+
+
+def _anova_f(means: np.ndarray, ss_groups: np.ndarray, counts: np.ndarray) -> float:
+    """
+    One-way ANOVA F from per-group means and within-group sums of squares.
+    """
+    n_total = counts.sum()
+    k = len(counts)
+    grand_mean = np.sum(counts * means) / n_total
+    ss_between = np.sum(counts * (means - grand_mean)**2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (ss_between / (k - 1)) / (np.sum(ss_groups) / (n_total - k))
+
+
+def permutation_anova_pvalue(values: np.ndarray, codes: np.ndarray, n_groups: int,
+                             n_permutations: int = 1000, seed=None,
+                             max_batch_elements: int = 2**23) -> float:
+    """
+    Permutation p-value of the one-way ANOVA F statistic
+
+    Group labels are permuted in batches of shape (batch, N) and the
+    per-group sums of a whole batch come from one offset bincount (row r
+    uses bins r·n_groups ... r·n_groups + n_groups - 1); only the group sums vary
+    between permutations, so F needs no further passes over the data. For
+    two groups this is the two-sided permutation test of the mean
+    difference.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Observations
+    codes : np.ndarray
+        Integer group labels in [0, n_groups)
+    n_groups : int
+        Number of groups
+    n_permutations : int
+        Number of label permutations
+    seed : int, SeedSequence or Generator, optional
+        Random seed
+    max_batch_elements : int
+        Upper bound on batch × N, bounding memory use
+
+    Returns
+    -------
+    float
+        (1 + #{F_perm ≥ F_obs}) / (1 + n_permutations)
+    """
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=float)
+    # Narrow label dtype: the shuffle is the dominant cost
+    codes = np.asarray(codes).astype(np.min_scalar_type(max(n_groups - 1, 0)))
+    n = len(values)
+    counts = np.bincount(codes, minlength=n_groups).astype(float)
+    total_sumsq = np.sum(values**2)  # permutation invariant
+
+    def f_from_sums(sums):
+        ss_between = np.sum(sums**2 / counts, axis=-1) - sums.sum(axis=-1)**2 / n
+        ss_within = total_sumsq - np.sum(sums**2 / counts, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (ss_between / (n_groups - 1)) / (ss_within / (n - n_groups))
+
+    f_observed = f_from_sums(np.bincount(codes, weights=values, minlength=n_groups))
+
+    batch = max(1, min(n_permutations, max_batch_elements // max(n, 1)))
+    exceed = 0
+    done = 0
+    while done < n_permutations:
+        b = min(batch, n_permutations - done)
+        permuted = rng.permuted(np.broadcast_to(codes, (b, n)), axis=1)
+        offsets = n_groups * np.arange(b)[:, None]
+        sums = np.bincount((permuted + offsets).ravel(), weights=np.tile(values, b),
+                           minlength=b * n_groups).reshape(b, n_groups)
+        exceed += np.sum(f_from_sums(sums) >= f_observed * (1 - 1e-12))
+        done += b
+
+    return (1 + exceed) / (1 + n_permutations)
+
+
+class GroupedStatistics:
+    """
+    Per-group summaries and pairwise tests from a single sorted pass
+
+    Parameters
+    ----------
+    values : array-like
+        Observed quantity (e.g. core radius)
+    groups : array-like
+        Group label of every observation
+    group_order : sequence, optional
+        Groups to keep, in output order (others are dropped)
+    """
+
+    def __init__(self, values, groups, group_order: Optional[Sequence] = None):
+        values = np.asarray(values, dtype=float)
+        codes, labels = pd.factorize(np.asarray(groups), sort=True)
+        labels = list(labels)
+
+        if group_order is not None:
+            remap = np.full(len(labels) + 1, -1)
+            kept = [g for g in group_order if g in labels]
+            for new_code, g in enumerate(kept):
+                remap[labels.index(g)] = new_code
+            codes = remap[codes]
+            labels = kept
+
+        keep = codes >= 0
+        self._keep = keep
+        self.values = values[keep]
+        self.codes = codes[keep]
+        self.labels = labels
+        self.n_groups = len(labels)
+
+        # Single sort by (group, value): contiguous sorted segments per group
+        self.order = np.lexsort((self.values, self.codes))
+        self.sorted_values = self.values[self.order]
+        self.counts = np.bincount(self.codes, minlength=self.n_groups)
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]]).astype(int)
+        self.sums = _segment_sums(self.sorted_values, self.starts, self.counts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.means = self.sums / self.counts
+        # Centered within-group sums of squares (no cancellation at large N)
+        centered = self.sorted_values - np.repeat(self.means, self.counts)
+        self.ss_groups = _segment_sums(centered**2, self.starts, self.counts)
+
+    def segment(self, group) -> np.ndarray:
+        """Sorted values of one group (a view, no copy)."""
+        i = self.labels.index(group)
+        return self.sorted_values[self.starts[i]:self.starts[i] + self.counts[i]]
+
+    def select(self, per_element) -> np.ndarray:
+        """
+        Per-observation quantity (input row order) restricted to the kept
+        observations, aligned with self.codes and self.values.
+        """
+        return np.asarray(per_element)[self._keep]
+
+    def segment_sums(self, per_element: np.ndarray) -> np.ndarray:
+        """Per-group sums of any per-observation quantity (input row order)."""
+        return np.bincount(self.codes, weights=self.select(per_element),
+                           minlength=self.n_groups)
+
+    def summary(self, reference: Optional[float] = None) -> pd.DataFrame:
+        """
+        Per-group n, mean, std (ddof=0), median and, if a reference value is
+        given, mean relative deviation plus a one-sample t-test against it.
+        """
+        n = self.counts.astype(float)
+        mean = self.means
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = self.ss_groups / n
+        lo = self.starts + (self.counts - 1) // 2
+        hi = self.starts + self.counts // 2
+        median = np.where(self.counts > 0,
+                          0.5 * (self.sorted_values[np.minimum(lo, len(self.sorted_values) - 1)] +
+                                 self.sorted_values[np.minimum(hi, len(self.sorted_values) - 1)]),
+                          np.nan)
+
+        table = pd.DataFrame({
+            'n': self.counts,
+            'mean': mean,
+            'std': np.sqrt(var),
+            'median': median,
+        }, index=pd.Index(self.labels, name='group'))
+
+        if reference is not None:
+            deviation = np.abs(self.sorted_values - reference) / reference
+            table['mean_deviation'] = _segment_sums(deviation, self.starts, self.counts) / n
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sem = np.sqrt(var * n / (n - 1)) / np.sqrt(n)
+                t_stat = (mean - reference) / sem
+            table['t_stat'] = t_stat
+            table['p_value'] = 2 * stats.t.sf(np.abs(t_stat), n - 1)
+
+        return table
+
+    def anova(self, groups: Optional[Sequence] = None, n_permutations: int = 0,
+              seed=None) -> dict:
+        """
+        One-way ANOVA across groups (default: all), with an optional
+        permutation p-value.
+        """
+        idx = np.arange(self.n_groups) if groups is None else \
+            np.array([self.labels.index(g) for g in groups])
+        counts = self.counts[idx].astype(float)
+        f_stat = float(_anova_f(self.means[idx], self.ss_groups[idx], counts))
+        p_value = float(stats.f.sf(f_stat, len(idx) - 1, counts.sum() - len(idx)))
+
+        result = {'f_stat': f_stat, 'p_value': p_value}
+        if n_permutations > 0:
+            values, codes = self._subset(idx)
+            result['permutation_p_value'] = permutation_anova_pvalue(
+                values, codes, len(idx), n_permutations, seed)
+        return result
+
+    def _subset(self, idx: np.ndarray):
+        """Sorted values of the selected groups with codes 0..len(idx)-1."""
+        values = np.concatenate([self.sorted_values[self.starts[i]:self.starts[i] + self.counts[i]]
+                                 for i in idx])
+        codes = np.repeat(np.arange(len(idx)), self.counts[idx])
+        return values, codes
+
+    def _ks_2samp(self, a: np.ndarray, b: np.ndarray):
+        """
+        Two-sample KS statistic from sorted samples.
+
+        The p-value follows scipy.stats.ks_2samp(method='auto'): exact up to
+        KS_EXACT_MAX_N observations per sample, asymptotic above. The exact
+        branch falls back to scipy itself on the two segments (it re-sorts
+        and recomputes D, O(n log n) per pair); only the asymptotic branch
+        works from the segments alone.
+        """
+        grid = np.concatenate([a, b])
+        cdf_a = np.searchsorted(a, grid, side='right') / len(a)
+        cdf_b = np.searchsorted(b, grid, side='right') / len(b)
+        d = np.max(np.abs(cdf_a - cdf_b))
+        if max(len(a), len(b)) <= KS_EXACT_MAX_N:
+            return d, float(stats.ks_2samp(a, b).pvalue)
+        en = len(a) * len(b) / (len(a) + len(b))
+        return d, float(stats.kstwo.sf(d, np.round(en)))
+
+    def _mannwhitney(self, a: np.ndarray, b: np.ndarray):
+        """
+        Mann-Whitney U from sorted samples.
+
+        The p-value follows scipy.stats.mannwhitneyu(method='auto'): exact for
+        untied samples with min(n1, n2) <= MANNWHITNEY_EXACT_MAX_N, otherwise
+        the tie-corrected normal approximation with continuity correction.
+        The exact branch falls back to scipy itself on the two segments
+        (cheap: one sample has at most MANNWHITNEY_EXACT_MAX_N values).
+        """
+        n1, n2 = len(a), len(b)
+        u1 = 0.5 * np.sum(np.searchsorted(b, a, side='left') + np.searchsorted(b, a, side='right'))
+
+        # Tie correction from the merged sorted sample (runs make this ~linear)
+        pooled = np.sort(np.concatenate([a, b]), kind='stable')
+        _, tie_counts = np.unique(pooled, return_counts=True)
+        if min(n1, n2) <= MANNWHITNEY_EXACT_MAX_N and np.all(tie_counts == 1):
+            return u1, float(stats.mannwhitneyu(a, b, method='exact').pvalue)
+        n = n1 + n2
+        tie_term = np.sum(tie_counts**3 - tie_counts) / (n * (n - 1))
+        sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+
+        u = max(u1, n1 * n2 - u1)
+        z = (u - n1 * n2 / 2 - 0.5) / sigma if sigma > 0 else 0.0
+        return u1, float(min(1.0, 2 * stats.norm.sf(z)))
+
+    def pairwise_tests(self, n_permutations: int = 0, seed=None) -> pd.DataFrame:
+        """
+        Student t, KS and Mann-Whitney tests for every pair of groups
+
+        All tests reuse the sorted group segments; permutation p-values (if
+        requested) use independent child streams of one SeedSequence.
+        """
+        pairs = list(combinations(range(self.n_groups), 2))
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        seeds = seed.spawn(len(pairs))
+        rows = []
+
+        for (i, j), pair_seed in zip(pairs, seeds):
+            a = self.sorted_values[self.starts[i]:self.starts[i] + self.counts[i]]
+            b = self.sorted_values[self.starts[j]:self.starts[j] + self.counts[j]]
+            n1, n2 = len(a), len(b)
+
+            # Student t (equal variances, as scipy.stats.ttest_ind)
+            pooled_var = (self.ss_groups[i] + self.ss_groups[j]) / (n1 + n2 - 2)
+            t_stat = (self.means[i] - self.means[j]) / np.sqrt(pooled_var * (1 / n1 + 1 / n2))
+            t_p = 2 * stats.t.sf(abs(t_stat), n1 + n2 - 2)
+
+            ks_stat, ks_p = self._ks_2samp(a, b)
+            mw_u, mw_p = self._mannwhitney(a, b)
+
+            row = {
+                'group_a': self.labels[i], 'group_b': self.labels[j],
+                'n_a': n1, 'n_b': n2,
+                't_stat': t_stat, 't_p_value': t_p,
+                'ks_stat': ks_stat, 'ks_p_value': ks_p,
+                'mannwhitney_u': mw_u, 'mannwhitney_p_value': mw_p,
+            }
+            if n_permutations > 0:
+                values, codes = self._subset(np.array([i, j]))
+                row['permutation_p_value'] = permutation_anova_pvalue(
+                    values, codes, 2, n_permutations, pair_seed)
+            rows.append(row)
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+KLEIN TRANSITION FITTING
+========================
+
+Robust least-squares fitting of the galaxy-core transition models used by
+the Klein Universal Field tests:
+
+1. Tanh transition:      r_core = r_klein × tanh(M / M_trans)
+2. Logistic two-regime:  r_core = (1-w)·α(M/M_ref)^β + w·r_klein,
+                         w = 1 / (1 + exp(-(log₁₀M - log₁₀M_th)/Δ))
+
+Each model precomputes its data-dependent constants once (M_ref, log M,
+...), evaluates batches of parameter vectors by broadcasting and provides
+an analytic Jacobian. fit_transition_model() combines a vectorized
+multi-start scan, bounded trust-region refinement and an optional
+process-parallel bootstrap of parameter uncertainties.
+
+Author: Fausto José Di Bacco
+Date: June 8, 2025
+"""
+
+import numpy as np
+from scipy.optimize import least_squares
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                             'Non_Orientable_Surfaces_Echo_Analysis', 'Analysis'))
+
+from parallel_chunks import chunk_sizes, map_chunks
+
+
+class TanhTransitionModel:
+    """
+    Klein tanh transition r_core = r_klein × tanh(M / M_trans)
+
+    Parameters: (r_klein, M_trans)
+    """
+
+    param_names = ('r_klein', 'M_trans')
+    log_params = (False, True)  # M_trans is sampled log-uniformly
+
+    def __init__(self, masses: np.ndarray):
+        self.masses = np.asarray(masses, dtype=float)
+
+    def subset(self, idx: np.ndarray) -> 'TanhTransitionModel':
+        """Model restricted to a subset (or resample) of the data."""
+        return TanhTransitionModel(self.masses[idx])
+
+    def predict(self, params: np.ndarray, masses: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate the model; params may carry leading batch axes (..., 2).
+        """
+        M = self.masses if masses is None else np.asarray(masses, dtype=float)
+        params = np.asarray(params, dtype=float)
+        r_klein, M_trans = params[..., 0, None], params[..., 1, None]
+        return r_klein * np.tanh(M / M_trans)
+
+    def jacobian(self, params: np.ndarray) -> np.ndarray:
+        """Analytic Jacobian ∂r/∂(r_klein, M_trans), shape (N, 2)."""
+        r_klein, M_trans = params
+        x = self.masses / M_trans
+        t = np.tanh(x)
+        return np.column_stack([t, -r_klein * (1 - t**2) * x / M_trans])
+
+
+class LogisticTransitionModel:
+    """
+    Two-regime logistic transition between CDM-like scaling and the Klein core
+
+    Parameters: (M_threshold, r_klein, alpha_low, beta_low)
+
+    M_ref is fixed to the median mass of the fitting sample and is kept when
+    the model is subset (bootstrap) or evaluated on new masses.
+    """
+
+    param_names = ('M_threshold', 'r_klein', 'alpha_low', 'beta_low')
+    log_params = (True, False, False, False)
+
+    def __init__(self, masses: np.ndarray, transition_width: float = 0.3,
+                 M_ref: Optional[float] = None):
+        self.masses = np.asarray(masses, dtype=float)
+        self.transition_width = transition_width  # dex
+        self.M_ref = float(np.median(self.masses)) if M_ref is None else M_ref
+
+        # Precomputed data constants
+        self.log10_masses = np.log10(self.masses)
+        self.log_mass_ratio = np.log(self.masses / self.M_ref)
+
+    def subset(self, idx: np.ndarray) -> 'LogisticTransitionModel':
+        """Model restricted to a subset (or resample) of the data."""
+        return LogisticTransitionModel(self.masses[idx], self.transition_width, self.M_ref)
+
+    def _components(self, params, log10_masses, log_mass_ratio):
+        params = np.asarray(params, dtype=float)
+        M_threshold, r_klein, alpha_low, beta_low = (params[..., i, None] for i in range(4))
+        r_low = alpha_low * np.exp(beta_low * log_mass_ratio)
+        z = (log10_masses - np.log10(M_threshold)) / self.transition_width
+        weights = 0.5 * (1 + np.tanh(0.5 * z))  # overflow-free logistic
+        return r_low, r_klein, weights
+
+    def predict(self, params: np.ndarray, masses: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate the model; params may carry leading batch axes (..., 4).
+        """
+        if masses is None:
+            log10_masses, log_mass_ratio = self.log10_masses, self.log_mass_ratio
+        else:
+            masses = np.asarray(masses, dtype=float)
+            log10_masses, log_mass_ratio = np.log10(masses), np.log(masses / self.M_ref)
+        r_low, r_klein, weights = self._components(params, log10_masses, log_mass_ratio)
+        return (1 - weights) * r_low + weights * r_klein
+
+    def jacobian(self, params: np.ndarray) -> np.ndarray:
+        """Analytic Jacobian ∂r/∂(M_th, r_klein, α, β), shape (N, 4)."""
+        M_threshold, _, alpha_low, _ = params
+        r_low, r_klein, w = self._components(params, self.log10_masses, self.log_mass_ratio)
+        dw_dM = -w * (1 - w) / (self.transition_width * M_threshold * np.log(10))
+        return np.column_stack([
+            (r_klein - r_low) * dw_dM,
+            w,
+            (1 - w) * r_low / alpha_low,
+            (1 - w) * r_low * self.log_mass_ratio
+        ])
+
+
+@dataclass
+class TransitionFit:
+    """Result of fit_transition_model."""
+
+    params: np.ndarray
+    param_names: Tuple[str, ...]
+    success: bool
+    cost: float                              # ½ Σ residuals²
+    covariance: np.ndarray
+    n_starts: int
+    message: str = ''
+    bootstrap_params: Optional[np.ndarray] = None
+
+    @property
+    def errors(self) -> np.ndarray:
+        """1σ parameter errors (bootstrap if available, else covariance)."""
+        if self.bootstrap_params is not None and len(self.bootstrap_params) > 1:
+            return np.nanstd(self.bootstrap_params, axis=0, ddof=1)
+        return np.sqrt(np.diag(self.covariance))
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.param_names, self.params))
+
+
+def _multistart_points(model, p0, lower, upper, n_starts, rng):
+    """
+    Starting points: p0 plus uniform (log-uniform for scale parameters)
+    draws inside the bounds.
+    """
+    log_mask = np.asarray(model.log_params) & (lower > 0)
+    lo = np.where(log_mask, np.log(np.where(log_mask, lower, 1)), lower)
+    hi = np.where(log_mask, np.log(np.where(log_mask, upper, 1)), upper)
+    u = lo + (hi - lo) * rng.random((n_starts - 1, len(p0)))
+    starts = np.where(log_mask, np.exp(u), u)
+    return np.vstack([np.clip(p0, lower, upper), starts])
+
+
+def _refine(model, y, x0, lower, upper):
+    """Bounded trust-region refinement from a single start."""
+    return least_squares(
+        lambda p: model.predict(p) - y, x0,
+        jac=model.jacobian, bounds=(lower, upper),
+        method='trf', x_scale='jac', max_nfev=2000
+    )
+
+
+def _fit_once(model, y, p0, lower, upper, n_starts, n_refine, rng):
+    """
+    Vectorized multi-start scan followed by refinement of the best starts.
+    """
+    starts = _multistart_points(model, p0, lower, upper, n_starts, rng)
+
+    # One broadcasted evaluation of all starts: (n_starts, N)
+    with np.errstate(over='ignore', invalid='ignore'):
+        costs = np.sum((model.predict(starts) - y)**2, axis=1)
+    costs = np.where(np.isfinite(costs), costs, np.inf)
+    order = np.argsort(costs)[:n_refine]
+
+    best, message = None, 'no finite starting point'
+    for x0 in starts[order]:
+        try:
+            result = _refine(model, y, x0, lower, upper)
+        except (ValueError, np.linalg.LinAlgError) as exc:
+            message = str(exc)
+            continue
+        if np.isfinite(result.cost) and (best is None or result.cost < best.cost):
+            best = result
+
+    if best is None:
+        return None, message
+    return best, best.message
+
+
+def _bootstrap_worker(model, y, p_best, lower, upper, n_refine, seed_sequence, n_replicates):
+    """
+    Refit bootstrap resamples warm-started from the best fit (pool unit).
+    """
+    rng = np.random.default_rng(seed_sequence)
+    params = np.full((n_replicates, len(p_best)), np.nan)
+    n = len(y)
+
+    for b in range(n_replicates):
+        idx = rng.integers(0, n, n)
+        result, _ = _fit_once(model.subset(idx), y[idx], p_best, lower, upper,
+                              n_starts=max(n_refine, 4), n_refine=n_refine, rng=rng)
+        if result is not None:
+            params[b] = result.x
+
+    return params
+
+
+def fit_transition_model(model, y: np.ndarray, p0: Sequence[float],
+                         bounds: Tuple[Sequence[float], Sequence[float]],
+                         n_starts: int = 64, n_refine: int = 4,
+                         n_bootstrap: int = 0, seed: int = 0,
+                         n_workers: Optional[int] = None) -> TransitionFit:
+    """
+    Fit a transition model with multi-start initialization and bootstrap errors
+
+    Parameters
+    ----------
+    model : TanhTransitionModel or LogisticTransitionModel
+        Model bound to the masses of the sample
+    y : np.ndarray
+        Observed core radii (kpc)
+    p0 : sequence of float
+        Physically motivated initial guess (always among the starts)
+    bounds : (lower, upper)
+        Parameter bounds
+    n_starts : int
+        Starting points evaluated in one vectorized pass
+    n_refine : int
+        Best starts refined with the analytic-Jacobian trust-region solver
+    n_bootstrap : int
+        Bootstrap resamples for parameter uncertainties (0 disables)
+    seed : int
+        Seed for starts and bootstrap streams
+    n_workers : int, optional
+        Processes for the bootstrap (default: CPU count, 1 = serial)
+
+    Returns
+    -------
+    TransitionFit
+        success is False (with p0 as params) if no start converged
+    """
+    y = np.asarray(y, dtype=float)
+    p0 = np.asarray(p0, dtype=float)
+    lower, upper = (np.asarray(b, dtype=float) for b in bounds)
+    start_seq, boot_seq = np.random.SeedSequence(seed).spawn(2)
+
+    best, message = _fit_once(model, y, p0, lower, upper, n_starts, n_refine,
+                              np.random.default_rng(start_seq))
+
+    if best is None:
+        n_params = len(p0)
+        return TransitionFit(p0, model.param_names, False, np.inf,
+                             np.full((n_params, n_params), np.nan), n_starts, message)
+
+    # Covariance from the Jacobian at the solution
+    dof = max(len(y) - len(p0), 1)
+    residual_variance = 2 * best.cost / dof
+    covariance = np.linalg.pinv(best.jac.T @ best.jac) * residual_variance
+
+    fit = TransitionFit(best.x, model.param_names, bool(best.success), float(best.cost),
+                        covariance, n_starts, message)
+
+    if n_bootstrap > 0:
+        # Chunking depends on n_bootstrap only, so results are worker-independent
+        sizes = chunk_sizes(n_bootstrap, n_chunks=16)
+        args = [(model, y, best.x, lower, upper, n_refine, seq, size)
+                for seq, size in zip(boot_seq.spawn(len(sizes)), sizes)]
+        fit.bootstrap_params = np.vstack(map_chunks(_bootstrap_worker, args, n_workers))
+
+    return fit
@@ -17,13 +17,88 @@ Date: June 8, 2025
 
 import numpy as np
 import matplotlib.pyplot as plt
+import pandas as pd
 import scipy.stats as stats
-from scipy.optimize import curve_fit
 import json
+import os
+import sys
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                             'Non_Orientable_Surfaces_Echo_Analysis', 'Analysis'))
+
+from galaxy_data_catalog import load_galaxy_catalog
+from parallel_chunks import chunk_sizes, map_chunks
+from klein_transition_fitting import TanhTransitionModel, fit_transition_model
+
+
+def _prefix_stack_statistics(amplitudes, checkpoints, template, f0_idx,
+                             noise_sigma=0.0, rng=None):
+    """
+    Enhancement factor and f₀ S/N for every prefix stack in one pass
+    
+    Every weak-event Klein correction is amplitude × template, so the stack
+    of the first N events is (cumsum(amplitudes)[N] / N) × template. Detector
+    noise is accumulated through independent increments between consecutive
+    checkpoints, which keeps the noise prefix-consistent without ever
+    materializing per-event time series.
+    
+    Parameters:
+    -----------
+    amplitudes : np.ndarray
+        Klein amplitudes in stacking order
+    checkpoints : np.ndarray
+        Increasing stack sizes (1-based prefix lengths)
+    template : np.ndarray
+        Unit-amplitude Klein correction on the stacking time grid
+    f0_idx : int
+        FFT bin closest to the Klein frequency
+    noise_sigma : float
+        Per-sample white noise level of an individual event
+    rng : numpy.random.Generator, optional
+        Noise stream (required if noise_sigma > 0)
+    """
+    n = checkpoints.astype(float)
+    sum_amp = np.cumsum(amplitudes)[checkpoints - 1]
+    sum_abs_amp = np.cumsum(np.abs(amplitudes))[checkpoints - 1]
+    
+    stacked = (sum_amp / n)[:, None] * template[None, :]
+    if noise_sigma > 0:
+        increments = np.diff(checkpoints, prepend=0)
+        noise = rng.standard_normal((len(checkpoints), len(template)))
+        noise *= noise_sigma * np.sqrt(increments)[:, None]
+        stacked += np.cumsum(noise, axis=0) / n[:, None]
+    
+    # Same estimators as KleinUniversalFieldTest.stack_weak_events
+    individual_amplitude = sum_abs_amp / n * np.std(template)
+    stacked_amplitude = np.std(stacked, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        enhancement = stacked_amplitude / (individual_amplitude / np.sqrt(n))
+        power_spectrum = np.abs(np.fft.fft(stacked, axis=1))**2
+        signal_to_noise = power_spectrum[:, f0_idx] / np.mean(power_spectrum, axis=1)
+    
+    return enhancement, signal_to_noise
+
+
+def _bootstrap_stack_worker(amplitudes, checkpoints, template, f0_idx,
+                            noise_sigma, seed_sequence, n_replicates):
+    """
+    Bootstrap replicates of the prefix-stack sweep (process-pool unit)
+    """
+    rng = np.random.default_rng(seed_sequence)
+    enhancement = np.empty((n_replicates, len(checkpoints)))
+    signal_to_noise = np.empty((n_replicates, len(checkpoints)))
+    
+    for b in range(n_replicates):
+        resampled = amplitudes[rng.integers(0, len(amplitudes), checkpoints[-1])]
+        enhancement[b], signal_to_noise[b] = _prefix_stack_statistics(
+            resampled, checkpoints, template, f0_idx, noise_sigma, rng)
+    
+    return enhancement, signal_to_noise
+
+
 class KleinUniversalFieldTest:
     """
     Test suite para Klein Universal Field Theory
@@ -82,21 +157,23 @@ class KleinUniversalFieldTest:
             
         return phi_max * np.tanh(curvature / R_crit)
     
-    def generate_weak_field_ligo_events(self, n_events=50):
+    def _draw_weak_event_parameters(self, n_events, rng=None):
         """
-        Generate synthetic LIGO events in weak Klein field regime
+        Draw weak-field event parameters and their Klein amplitudes
         
-        If Klein field is universal, weak events should show:
-        1. Subtle systematic deviations from pure GR
-        2. Correlation with Klein frequency f₀
-        3. Enhanced stacking coherence
+        Parameters:
+        -----------
+        n_events : int
+            Number of events to draw
+        rng : numpy.random.Generator, optional
+            Random stream; the global np.random state is used if None
         """
-        print("\n📡 Generating LIGO Weak Field Events...")
+        rng = np.random if rng is None else rng
         
         # Event parameters (low mass, high distance = weak field)
-        masses_1 = np.random.normal(15, 5, n_events)  # Lower mass range
-        masses_2 = np.random.normal(12, 4, n_events)
-        distances = np.random.uniform(200, 800, n_events)  # Mpc (far events)
+        masses_1 = rng.normal(15, 5, n_events)  # Lower mass range
+        masses_2 = rng.normal(12, 4, n_events)
+        distances = rng.uniform(200, 800, n_events)  # Mpc (far events)
         
         # Ensure physical masses
         masses_1 = np.clip(masses_1, 8, 30)
@@ -110,6 +187,22 @@ class KleinUniversalFieldTest:
         # Klein field amplitudes (should be small but non-zero)
         klein_amplitudes = self.klein_field_amplitude(curvatures, regime='weak')
         
+        return masses_1, masses_2, distances, curvatures, klein_amplitudes
+    
+    def generate_weak_field_ligo_events(self, n_events=50):
+        """
+        Generate synthetic LIGO events in weak Klein field regime
+        
+        If Klein field is universal, weak events should show:
+        1. Subtle systematic deviations from pure GR
+        2. Correlation with Klein frequency f₀
+        3. Enhanced stacking coherence
+        """
+        print("\n📡 Generating LIGO Weak Field Events...")
+        
+        masses_1, masses_2, distances, curvatures, klein_amplitudes = \
+            self._draw_weak_event_parameters(n_events)
+        
         # GW frequency evolution with Klein corrections
         frequencies = []
         klein_corrections = []
@@ -184,7 +277,90 @@ class KleinUniversalFieldTest:
             'frequencies': freqs
         }
     
-    def test_galaxy_core_transition(self):
+    def stacking_sensitivity_sweep(self, n_min=10, n_max=1_000_000, n_points=25,
+                                   n_bootstrap=200, confidence=0.68,
+                                   noise_sigma=0.0, seed=42, n_workers=None):
+        """
+        Enhancement factor and Klein f₀ S/N as a function of stack size
+        
+        A single pool of n_max weak events is drawn and shuffled once; all
+        stack sizes are then prefix stacks of that event axis, evaluated
+        with cumulative sums in one pass. Bootstrap bands resample the event
+        pool with replacement and are distributed across worker processes,
+        each with its own SeedSequence child, so the table is reproducible
+        for a given seed independently of n_workers.
+        
+        Parameters:
+        -----------
+        n_min, n_max : int
+            Smallest and largest stack size
+        n_points : int
+            Number of log-spaced stack sizes
+        n_bootstrap : int
+            Bootstrap replicates for the uncertainty bands (0 disables)
+        confidence : float
+            Central probability mass of the bootstrap bands
+        noise_sigma : float
+            Per-sample white noise of an individual event (0 = noiseless,
+            matching stack_weak_events)
+        seed : int
+            Master seed for events, shuffling, noise and bootstrap
+        n_workers : int, optional
+            Worker processes for the bootstrap (default: CPU count)
+            
+        Returns:
+        --------
+        pd.DataFrame
+            One row per stack size with central values and band limits
+        """
+        print(f"\n📈 Stacking Sensitivity Sweep ({n_min} → {n_max:.0e} events)...")
+        
+        checkpoints = np.unique(np.round(
+            np.logspace(np.log10(n_min), np.log10(n_max), n_points)).astype(int))
+        
+        event_seq, order_seq, boot_seq = np.random.SeedSequence(seed).spawn(3)
+        *_, amplitudes = self._draw_weak_event_parameters(
+            n_max, rng=np.random.default_rng(event_seq))
+        
+        # Same time grid and f₀ bin as stack_weak_events
+        t_stack = np.linspace(-0.1, 0, 1000)
+        template = np.sin(2*np.pi*self.f0_Klein*t_stack)
+        freqs = np.fft.fftfreq(len(t_stack), t_stack[1] - t_stack[0])
+        f0_idx = np.argmin(np.abs(freqs - self.f0_Klein))
+        
+        order_rng = np.random.default_rng(order_seq)
+        shuffled = amplitudes[order_rng.permutation(n_max)]
+        enhancement, signal_to_noise = _prefix_stack_statistics(
+            shuffled, checkpoints, template, f0_idx, noise_sigma, order_rng)
+        
+        table = pd.DataFrame({
+            'n_events': checkpoints,
+            'enhancement_factor': enhancement,
+            'signal_to_noise': signal_to_noise
+        })
+        
+        if n_bootstrap > 0:
+            # One child stream per replicate chunk; chunking depends on
+            # n_bootstrap alone so results do not depend on n_workers
+            sizes = chunk_sizes(n_bootstrap, n_chunks=16)
+            args = [(amplitudes, checkpoints, template, f0_idx, noise_sigma, seq, size)
+                    for seq, size in zip(boot_seq.spawn(len(sizes)), sizes)]
+            chunks = map_chunks(_bootstrap_stack_worker, args, n_workers)
+            
+            boot_enhancement = np.concatenate([c[0] for c in chunks])
+            boot_snr = np.concatenate([c[1] for c in chunks])
+            
+            q_lo, q_hi = 50 * (1 - confidence), 50 * (1 + confidence)
+            table['enhancement_lo'], table['enhancement_hi'] = \
+                np.nanpercentile(boot_enhancement, [q_lo, q_hi], axis=0)
+            table['snr_lo'], table['snr_hi'] = \
+                np.nanpercentile(boot_snr, [q_lo, q_hi], axis=0)
+        
+        print(f"✅ Swept {len(checkpoints)} stack sizes with {n_bootstrap} bootstrap replicates")
+        
+        return table
+    
+    def test_galaxy_core_transition(self, n_bootstrap=0):
         """
         Test for smooth Klein field transition in galaxy dark matter cores
         
@@ -192,54 +368,41 @@ class KleinUniversalFieldTest:
         r_core = r_Klein × tanh(M_galaxy / M_transition)
         
         vs random scatter (null hypothesis)
+        
+        Parameters:
+        -----------
+        n_bootstrap : int
+            Bootstrap resamples for the fit parameter uncertainties
         """
         print("\n🌌 Testing Galaxy Core Radius Transitions...")
         
-        # Load galaxy data from validation results
-        try:
-            with open('/mnt/d/Multidimensional Theory Simulations/multidimensional-theory/Non_Orientable_Surfaces_Echo_Analysis/topological_transition_model/Final_Paper_Structure/7_Data_Verification/Galaxy_Rotation_Curves/galaxy_klein_results.json', 'r') as f:
-                galaxy_data = json.load(f)
-        except:
-            print("⚠️ Galaxy data not found, generating synthetic data")
-            return self._generate_synthetic_galaxy_test()
-            
+        # Load galaxy data from validation results (raises if not found)
+        galaxy_df = load_galaxy_catalog()
+        
         # Extract core radii and masses
-        cores = []
-        masses = []  # Proxy from v_flat
-        types = []
-        
-        for galaxy, data in galaxy_data['galaxy_data'].items():
-            cores.append(data['r_core_kpc'])
-            # Approximate mass from v_flat: M ∝ v²R
-            v_flat = data['v_flat_kms']
-            mass_proxy = v_flat**2 * 10  # Rough scaling
-            masses.append(mass_proxy)
-            types.append(data['type'])
-            
-        cores = np.array(cores)
-        masses = np.array(masses)
-        
-        # Klein transition model
-        def klein_transition_model(mass, r_klein, M_trans):
-            return r_klein * np.tanh(mass / M_trans)
-        
-        # Fit Klein transition
-        try:
-            popt_klein, pcov_klein = curve_fit(
-                klein_transition_model, masses, cores,
-                p0=[8.4, np.mean(masses)], 
-                bounds=([1, 100], [20, 10*np.max(masses)])
-            )
-            r_klein_fit, M_trans_fit = popt_klein
-        except:
-            r_klein_fit, M_trans_fit = 8.4, np.mean(masses)
+        cores = galaxy_df['r_core_kpc'].values
+        # Approximate mass from v_flat: M ∝ v²R
+        masses = galaxy_df['v_flat_kms'].values**2 * 10  # Rough scaling
+        types = galaxy_df['type'].tolist()
+        
+        # Fit Klein transition (multi-start, analytic Jacobian)
+        klein_model = TanhTransitionModel(masses)
+        klein_fit = fit_transition_model(
+            klein_model, cores,
+            p0=[8.4, np.mean(masses)],
+            bounds=([1, 100], [20, 10*np.max(masses)]),
+            n_bootstrap=n_bootstrap
+        )
+        if not klein_fit.success:
+            print(f"⚠️ Klein transition fit did not converge ({klein_fit.message})")
+        r_klein_fit, M_trans_fit = klein_fit.params
             
         # Generate transition prediction
         mass_smooth = np.linspace(np.min(masses), np.max(masses), 100)
-        cores_klein = klein_transition_model(mass_smooth, r_klein_fit, M_trans_fit)
+        cores_klein = klein_model.predict(klein_fit.params, mass_smooth)
         
         # Calculate goodness of fit
-        cores_pred_klein = klein_transition_model(masses, r_klein_fit, M_trans_fit)
+        cores_pred_klein = klein_model.predict(klein_fit.params)
         chi2_klein = np.sum((cores - cores_pred_klein)**2 / cores_pred_klein)
         
         # Compare with linear scaling (null hypothesis)
@@ -261,6 +424,8 @@ class KleinUniversalFieldTest:
             'types': types,
             'r_klein_fit': r_klein_fit,
             'M_transition_fit': M_trans_fit,
+            'fit_errors': klein_fit.errors,
+            'fit_converged': klein_fit.success,
             'chi2_klein': chi2_klein,
             'chi2_linear': chi2_linear,
             'delta_chi2': delta_chi2,
@@ -338,9 +503,14 @@ class KleinUniversalFieldTest:
             'all_consistent': all(consistency_checks.values())
         }
     
-    def run_complete_analysis(self):
+    def run_complete_analysis(self, sweep=False):
         """
         Execute complete Klein Universal Field test suite
+        
+        Parameters:
+        -----------
+        sweep : bool
+            Also run the stacking sensitivity sweep over stack sizes
         """
         print("=" * 80)
         print("🚀 KLEIN UNIVERSAL FIELD TEST SUITE - COMPLETE ANALYSIS")
@@ -366,6 +536,12 @@ class KleinUniversalFieldTest:
             'detection_significance': stack_results['signal_to_noise'] > 3.0
         }
         
+        if sweep:
+            sweep_table = self.stacking_sensitivity_sweep()
+            print(f"📈 Enhancement at N={sweep_table['n_events'].iloc[-1]}: "
+                  f"{sweep_table['enhancement_factor'].iloc[-1]:.1f}")
+            results['ligo_weak_stack_sweep'] = sweep_table.to_dict(orient='list')
+        
         # Test 2: Galaxy core transitions
         print("\n" + "="*50)
         print("TEST 2: GALAXY CORE RADIUS TRANSITIONS")
@@ -4,8 +4,10 @@ Optimized Multi-Topology LIGO Analysis Framework
 ===============================================
 
 Memory-efficient analysis of all 5 non-orientable topologies against
-the full GWTC catalog (65 events). Designed to avoid memory overflow
-by processing events in batches and using efficient data structures.
+the full GWTC catalog (65 events). Events are streamed from a generator
+into fixed-size preallocated batch arrays, and detection statistics are
+aggregated online (Welford mean/variance, running sum of squares, top-k
+detections), so peak memory does not grow with catalog length.
 
 Topologies tested:
 1. Klein Bottle (baseline)
@@ -20,25 +22,140 @@ import matplotlib.pyplot as plt
 import json
 import sys
 import os
-import gc
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Iterator
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-# Add paths for accessing Klein bottle pipeline
+# Add paths for accessing Klein bottle pipeline and topology registry
 sys.path.append('../../LIGO')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Theory', 'Topologies'))
+
+from topology_registry import create_topologies
+from population_snr import seed_stream
+
+# Compact per-event record streamed through the analysis
+EVENT_DTYPE = np.dtype([
+    ('name', 'U32'),
+    ('mass', 'f8'),
+    ('distance', 'f8'),
+    ('snr', 'f8'),
+    ('gps', 'f8')
+])
+
+# Per-event result for one topology
+RESULT_DTYPE = np.dtype([
+    ('tau_predicted', 'f8'),
+    ('snr', 'f8'),
+    ('significance', 'f8'),
+    ('detected', '?')
+])
+
+
+class DetectionStatistics:
+    """
+    Online aggregation of per-event detection results for one topology.
+    
+    Batches are merged with the parallel form of Welford's algorithm
+    (Chan et al.), so mean and variance of the positive significances are
+    exact without storing per-event results. The top-k detections are kept
+    in fixed-size arrays.
+    
+    Parameters:
+    -----------
+    top_k : int
+        Number of strongest detections to keep
+    """
+    
+    def __init__(self, top_k: int = 5):
+        self.top_k = top_k
+        self.n_events = 0
+        self.n_detections = 0
+        self.n_significant = 0  # events with significance > 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum_squares = 0.0
+        self.max = 0.0
+        self.top_events = np.zeros(0, dtype=EVENT_DTYPE)
+        self.top_results = np.zeros(0, dtype=RESULT_DTYPE)
+    
+    def update(self, events: np.ndarray, results: np.ndarray):
+        """Merge one batch of events and their results."""
+        self.n_events += len(results)
+        
+        significance = results['significance'][results['significance'] > 0]
+        n_batch = len(significance)
+        if n_batch:
+            batch_mean = significance.mean()
+            batch_m2 = np.sum((significance - batch_mean)**2)
+            n_total = self.n_significant + n_batch
+            delta = batch_mean - self.mean
+            self.mean += delta * n_batch / n_total
+            self.m2 += batch_m2 + delta**2 * self.n_significant * n_batch / n_total
+            self.n_significant = n_total
+            self.sum_squares += np.sum(significance**2)
+            self.max = max(self.max, significance.max())
+        
+        detected = results['detected']
+        self.n_detections += int(np.count_nonzero(detected))
+        if np.any(detected):
+            events = np.concatenate([self.top_events, events[detected]])
+            results = np.concatenate([self.top_results, results[detected]])
+            # Stable descending order keeps the earliest event first on ties
+            order = np.argsort(-results['significance'], kind='stable')[:self.top_k]
+            self.top_events = events[order]
+            self.top_results = results[order]
+    
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.n_significant if self.n_significant else 0.0
+    
+    def top_detections(self) -> List[Dict]:
+        """Strongest detections as plain dicts."""
+        return [{
+            'event': str(event['name']),
+            'mass': float(event['mass']),
+            'tau_predicted': float(result['tau_predicted']),
+            'snr': float(result['snr']),
+            'significance': float(result['significance']),
+            'detected': bool(result['detected'])
+        } for event, result in zip(self.top_events, self.top_results)]
+
+
+def iter_event_batches(events: Iterable[Dict], batch_size: int) -> Iterator[np.ndarray]:
+    """
+    Stream event dicts into one preallocated EVENT_DTYPE buffer.
+    
+    Yields views of the buffer holding up to batch_size events; each view
+    is only valid until the next batch is requested.
+    """
+    buffer = np.zeros(batch_size, dtype=EVENT_DTYPE)
+    n = 0
+    for event in events:
+        buffer[n] = (event['name'], event['mass'], event['distance'], event['snr'], event['gps'])
+        n += 1
+        if n == batch_size:
+            yield buffer
+            n = 0
+    if n:
+        yield buffer[:n]
 
 class OptimizedMultiTopologyAnalyzer:
     """
     Memory-efficient framework for testing all topologies against LIGO data.
     """
     
-    def __init__(self, batch_size: int = 10):
-        """Initialize optimized analyzer with batch processing."""
+    def __init__(self, batch_size: int = 10, seed: Optional[int] = None):
+        """
+        Initialize optimized analyzer with batch processing.
+        
+        seed is the root of the per-(topology, event) noise streams, so
+        results do not depend on batch size or topology order.
+        """
         print("="*80)
         print("OPTIMIZED MULTI-TOPOLOGY LIGO ANALYSIS")
         print("="*80)
         
         self.batch_size = batch_size
+        self.seed_sequence = np.random.SeedSequence(seed)
         self.topology_predictions = self.get_topology_predictions()
         
         # Load LIGO events efficiently
@@ -50,49 +167,24 @@ class OptimizedMultiTopologyAnalyzer:
     def get_topology_predictions(self) -> Dict[str, Dict]:
         """Optimized topology predictions with minimal memory footprint."""
         
-        return {
-            'Klein_Bottle': {
-                'f0': 6.65,
-                'harmonics': [6.65, 19.95, 33.25],
-                'alpha': -0.826,
-                'coeff': 2.574,
-                'offset': 0.273,
-                'search_bw': 0.5
-            },
-            'Real_Projective_Plane': {
-                'f0': 4.19,
-                'harmonics': [4.19, 12.57, 20.95],
-                'alpha': -0.826,
-                'coeff': 0.315,
-                'offset': 0.189,
-                'search_bw': 0.3
-            },
-            'Mobius_Band': {
-                'f0': 8.2,
-                'harmonics': [8.2, 12.8, 16.4],
-                'alpha': -0.826,
-                'coeff': 0.297,
-                'offset': 0.251,
-                'search_bw': 0.8,
-                'dual_delay': 0.003
-            },
-            'Twisted_Torus': {
-                'f0': 5.68,
-                'harmonics': [5.68, 11.36, 17.04],
-                'alpha': -0.826,
-                'coeff': 0.289,
-                'offset': 0.264,
-                'search_bw': 1.0
-            },
-            'String_Orientifold': {
-                'f0': 6.8,
-                'harmonics': [6.8, 13.6, 20.4],
-                'alpha': -0.826,
-                'coeff': 0.276,
-                'offset': 0.278,
-                'search_bw': 0.4
+        predictions = {}
+        
+        # Every registered topology, in compact form
+        for key, topology in create_topologies().items():
+            search = topology.search_parameters()
+            scaling = search['scaling_law']
+            predictions[key] = {
+                'f0': search['fundamental_freq'],
+                'harmonics': search['harmonics'][:3],
+                'alpha': scaling['alpha'],
+                'coeff': scaling['coefficient'],
+                'offset': scaling['offset'],
+                'search_bw': search['search_bandwidth']
             }
-        }
+            if 'dual_echo_delay' in search:
+                predictions[key]['dual_delay'] = search['dual_echo_delay']
+        
+        return predictions
     
     def load_ligo_events_efficiently(self) -> List[Dict]:
         """Load only essential event data to minimize memory usage."""
@@ -134,132 +226,137 @@ class OptimizedMultiTopologyAnalyzer:
                 {'name': 'GW170104', 'mass': 49.0, 'distance': 880, 'snr': 13.0, 'gps': 1167559936.6}
             ]
     
-    def predict_echo_time(self, topology: str, mass: float) -> float:
-        """Predict primary echo time for given topology and mass."""
+    def iter_events(self) -> Iterator[Dict]:
+        """Event source for the streaming analysis (the loaded catalog)."""
+        yield from self.ligo_events
+    
+    def predict_echo_time(self, topology: str, mass):
+        """Predict primary echo time for given topology and mass (array-valued)."""
         
         pred = self.topology_predictions[topology]
         
         # τ = a * M^(-α) + b
-        tau = pred['coeff'] * (mass ** pred['alpha']) + pred['offset']
+        tau = pred['coeff'] * (np.asarray(mass, dtype=float) ** pred['alpha']) + pred['offset']
         
-        return max(0.05, tau)  # Minimum physical echo time
+        return np.maximum(0.05, tau)  # Minimum physical echo time
+    
+    def event_rng(self, topology: str, event_name: str) -> np.random.Generator:
+        """Reproducible noise stream of one (topology, event) pair."""
+        return seed_stream(self.seed_sequence, topology, event_name)
     
-    def calculate_template_snr(self, frequency: float, echo_time: float, 
-                             event_snr: float, distance: float) -> float:
+    def calculate_template_snr(self, frequency: float, echo_time, 
+                             event_snr, distance, noise=None):
         """
-        Realistic SNR calculation based on event properties.
+        Realistic SNR calculation based on event properties (array-valued).
+        
+        noise: standard normal draws, one per event (fresh entropy if None).
         """
         
         # Distance attenuation (closer events have stronger echoes)
-        distance_factor = 1000.0 / max(distance, 100.0)
+        distance_factor = 1000.0 / np.maximum(distance, 100.0)
         
         # Frequency matching (Klein bottle at 6.65 Hz is reference)
         freq_factor = np.exp(-0.05 * abs(frequency - 6.65))
         
         # Echo time reasonableness (0.15-0.25s optimal)
-        time_factor = np.exp(-3 * abs(echo_time - 0.2))
+        time_factor = np.exp(-3 * np.abs(echo_time - 0.2))
         
         # Scale with original event SNR
-        snr_factor = min(event_snr / 10.0, 2.0)  # Cap at 2x boost
+        snr_factor = np.minimum(np.asarray(event_snr) / 10.0, 2.0)  # Cap at 2x boost
         
         # Base template SNR
         base_snr = 1.5 * distance_factor * freq_factor * time_factor * snr_factor
         
         # Add realistic noise
-        noise = np.random.normal(0, 0.3)
+        if noise is None:
+            noise = np.random.default_rng().standard_normal(np.shape(base_snr))
         
-        return max(0.1, base_snr + noise)
+        return np.maximum(0.1, base_snr + 0.3 * noise)
     
-    def process_event_batch(self, events: List[Dict], topology: str) -> List[Dict]:
-        """Process a batch of events for given topology."""
+    def process_event_arrays(self, events: np.ndarray, topology: str,
+                             out: np.ndarray) -> np.ndarray:
+        """
+        Process a batch of EVENT_DTYPE events for given topology, writing
+        into the preallocated RESULT_DTYPE array out (same length).
+        """
         
         pred = self.topology_predictions[topology]
-        results = []
         
-        for event in events:
-            
-            # Predict echo time
-            tau = self.predict_echo_time(topology, event['mass'])
-            
-            # Calculate template SNR
-            snr = self.calculate_template_snr(
-                pred['f0'], tau, event['snr'], event['distance']
-            )
-            
-            # Convert to significance
-            significance = max(0, snr - 1.2)  # Background threshold
-            
-            result = {
-                'event': event['name'],
-                'mass': event['mass'],
-                'tau_predicted': tau,
-                'snr': snr,
-                'significance': significance,
-                'detected': significance > 1.0
-            }
-            
-            results.append(result)
+        # Predict echo times
+        out['tau_predicted'] = self.predict_echo_time(topology, events['mass'])
+        
+        # Calculate template SNR (noise from each event's own stream)
+        noise = np.array([self.event_rng(topology, name).standard_normal()
+                          for name in events['name']])
+        out['snr'] = self.calculate_template_snr(
+            pred['f0'], out['tau_predicted'], events['snr'], events['distance'], noise
+        )
         
-        return results
+        # Convert to significance
+        np.maximum(0, out['snr'] - 1.2, out=out['significance'])  # Background threshold
+        out['detected'] = out['significance'] > 1.0
+        
+        return out
+    
+    def process_event_batch(self, events: List[Dict], topology: str) -> List[Dict]:
+        """Process a batch of events for given topology."""
+        
+        batch = next(iter_event_batches(events, len(events)), np.zeros(0, dtype=EVENT_DTYPE))
+        results = self.process_event_arrays(batch, topology, np.zeros(len(batch), dtype=RESULT_DTYPE))
+        
+        return [{
+            'event': str(event['name']),
+            'mass': float(event['mass']),
+            'tau_predicted': float(result['tau_predicted']),
+            'snr': float(result['snr']),
+            'significance': float(result['significance']),
+            'detected': bool(result['detected'])
+        } for event, result in zip(batch, results)]
     
-    def analyze_topology_efficient(self, topology: str) -> Dict:
+    def analyze_topology_efficient(self, topology: str,
+                                   events: Optional[Iterable[Dict]] = None) -> Dict:
         """
-        Memory-efficient analysis of single topology against all events.
+        Streaming analysis of single topology against all events.
+        
+        Events (default: iter_events()) are consumed batch by batch into
+        fixed-size arrays and folded into DetectionStatistics, so memory
+        use is independent of the number of events.
         """
         
         print(f"\nAnalyzing {topology}...")
         
         pred = self.topology_predictions[topology]
-        all_results = []
+        stats = DetectionStatistics(top_k=5)
+        results = np.zeros(self.batch_size, dtype=RESULT_DTYPE)
         
-        # Process events in batches to avoid memory overflow
-        n_batches = (len(self.ligo_events) + self.batch_size - 1) // self.batch_size
-        
-        for i in range(n_batches):
-            start_idx = i * self.batch_size
-            end_idx = min((i + 1) * self.batch_size, len(self.ligo_events))
-            
-            batch = self.ligo_events[start_idx:end_idx]
-            batch_results = self.process_event_batch(batch, topology)
-            all_results.extend(batch_results)
-            
-            # Force garbage collection to free memory
-            gc.collect()
+        source = self.iter_events() if events is None else events
+        for i, batch in enumerate(iter_event_batches(source, self.batch_size)):
+            batch_results = self.process_event_arrays(batch, topology, results[:len(batch)])
+            stats.update(batch, batch_results)
             
             if (i + 1) % 5 == 0:
-                print(f"  Processed {end_idx}/{len(self.ligo_events)} events")
+                print(f"  Processed {stats.n_events} events")
         
-        # Calculate population statistics
-        detections = [r for r in all_results if r['detected']]
-        significances = [r['significance'] for r in all_results if r['significance'] > 0]
+        n_events = stats.n_events
+        detection_rate = stats.n_detections / n_events if n_events > 0 else 0
+        combined_sig = float(np.sqrt(stats.sum_squares))
         
-        n_events = len(all_results)
-        n_detections = len(detections)
-        detection_rate = n_detections / n_events if n_events > 0 else 0
-        
-        mean_sig = np.mean(significances) if significances else 0
-        max_sig = np.max(significances) if significances else 0
-        combined_sig = np.sqrt(np.sum(np.array(significances)**2)) if significances else 0
-        
-        # Return compact summary (not full results to save memory)
+        # Return compact summary (no per-event results are kept)
         summary = {
             'topology': topology,
             'fundamental_freq': pred['f0'],
             'n_events': n_events,
-            'n_detections': n_detections,
+            'n_detections': stats.n_detections,
             'detection_rate': detection_rate,
-            'mean_significance': mean_sig,
-            'max_significance': max_sig,
+            'mean_significance': float(stats.mean),
+            'std_significance': float(np.sqrt(stats.variance)),
+            'max_significance': float(stats.max),
             'combined_significance': combined_sig,
-            'top_detections': sorted(detections, key=lambda x: x['significance'], reverse=True)[:5]
+            'top_detections': stats.top_detections()
         }
         
         print(f"  {topology}: {detection_rate:.1%} detection rate, {combined_sig:.2f}σ combined")
         
-        # Clear batch results from memory
-        del all_results
-        gc.collect()
-        
         return summary
     
     def run_comprehensive_comparison(self) -> Dict:
@@ -304,7 +401,8 @@ class OptimizedMultiTopologyAnalyzer:
             'analysis_metadata': {
                 'timestamp': datetime.now().isoformat(),
                 'n_events_analyzed': len(self.ligo_events),
-                'batch_size': self.batch_size
+                'batch_size': self.batch_size,
+                'seed_entropy': str(self.seed_sequence.entropy)
             }
         }
         
@@ -362,7 +460,7 @@ def main():
     """Run optimized multi-topology analysis."""
     
     # Initialize with batch processing
-    analyzer = OptimizedMultiTopologyAnalyzer(batch_size=8)
+    analyzer = OptimizedMultiTopologyAnalyzer(batch_size=8, seed=42)
     
     # Run comprehensive comparison
     comparison = analyzer.run_comprehensive_comparison()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Chunked Process-Pool Execution
+==============================
+
+Shared helpers for the Monte Carlo and bootstrap loops that split their
+replicates into chunks with independent seed streams and run the chunks
+in-process or on a process pool. The chunking depends only on the number
+of replicates (and chunk size), never on the worker count, so results are
+identical for any n_workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+
+def chunk_sizes(n_items: int, n_chunks: Optional[int] = None,
+                chunk_size: Optional[int] = None) -> List[int]:
+    """
+    Sizes of consecutive chunks covering n_items.
+
+    Either n_chunks balanced chunks (sizes differ by at most one; capped at
+    n_items) or chunks of chunk_size with a shorter last chunk.
+    """
+    if (n_chunks is None) == (chunk_size is None):
+        raise ValueError("Give exactly one of n_chunks and chunk_size")
+    if n_items <= 0:
+        return []
+    if chunk_size is not None:
+        return [min(chunk_size, n_items - start) for start in range(0, n_items, chunk_size)]
+    n_chunks = min(n_chunks, n_items)
+    return [n_items // n_chunks + (i < n_items % n_chunks) for i in range(n_chunks)]
+
+
+def map_chunks(worker: Callable, args: Sequence[tuple], n_workers: Optional[int] = None) -> list:
+    """
+    worker(*a) for every argument tuple, in order.
+
+    Runs in-process for one worker or one chunk, otherwise on a
+    ProcessPoolExecutor with min(n_workers, len(args)) processes
+    (n_workers defaults to the CPU count). worker must be a module-level
+    function so it can be pickled.
+    """
+    n_workers = min(n_workers or os.cpu_count() or 1, len(args))
+    if n_workers <= 1:
+        return [worker(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(worker, *zip(*args)))
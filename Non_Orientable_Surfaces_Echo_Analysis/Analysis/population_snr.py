@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Population SNR Engine
+=====================
+
+Broadcast evaluation of the echo search over a whole event population:
+the echo law τ = a·M^α + b (with each topology's secondary echoes), the
+harmonic search-band overlaps and the expected template SNR are computed
+for every (topology × event × echo × harmonic) combination as one array,
+instead of event by event.
+
+Arrays are laid out as (topology, event, echo, harmonic). Topologies with
+fewer echo types or harmonics are padded and masked. A synthetic catalog
+of 5×10⁵ events runs in well under a second.
+"""
+
+import numpy as np
+import sys
+import os
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Theory', 'Topologies'))
+
+from topology_registry import TOPOLOGY_REGISTRY
+
+
+def seed_stream(seed_sequence: np.random.SeedSequence, *labels) -> np.random.Generator:
+    """
+    Generator for the sub-stream of seed_sequence named by labels.
+
+    Labels (e.g. topology and event names) map to spawn keys through CRC32,
+    so a (topology, event) pair always gets the same stream regardless of
+    call order, batching or the process it runs in.
+    """
+    spawn_key = tuple(seed_sequence.spawn_key) + tuple(zlib.crc32(str(label).encode())
+                                                        for label in labels)
+    return np.random.default_rng(np.random.SeedSequence(seed_sequence.entropy, spawn_key=spawn_key))
+
+
+def synthetic_catalog(n_events: int, seed=None, mass_range=(5.0, 150.0),
+                      distance_range=(100.0, 5000.0)) -> Dict[str, np.ndarray]:
+    """
+    Synthetic event population: log-uniform remnant masses (M☉) and
+    distances (Mpc) uniform in volume.
+    """
+    rng = np.random.default_rng(seed)
+    log_m = rng.uniform(np.log(mass_range[0]), np.log(mass_range[1]), n_events)
+    d_lo, d_hi = distance_range
+    distances = (rng.uniform(d_lo**3, d_hi**3, n_events))**(1/3)
+    return {
+        'name': np.array([f'SYN{i:07d}' for i in range(n_events)]),
+        'mass': np.exp(log_m),
+        'distance': distances
+    }
+
+
+class PopulationSNREngine:
+    """
+    Vectorized echo-time and template-SNR model for all topologies.
+
+    The SNR model is that of MultiTopologyLIGOAnalyzer: for harmonic f and
+    echo delay τ,
+        SNR = amplitude · exp(-freq_decay |f - f_ref|) · exp(-time_decay |τ - τ_opt|)
+    weighted by the fraction of the harmonic's search band not overlapping
+    a forbidden-frequency band. Harmonics are stacked in quadrature; with
+    n_harmonics=1 only the fundamental is searched (the original model).
+
+    Parameters:
+    -----------
+    predictions : dict
+        Topology name → search parameters (fundamental_freq, harmonics,
+        search_bandwidth, forbidden_freqs, scaling_law)
+    n_harmonics : int
+        Harmonics searched per topology (fundamental first)
+    amplitude, reference_freq, freq_decay, optimal_delay, time_decay : float
+        SNR model parameters
+    """
+
+    def __init__(self, predictions: Dict[str, Dict], n_harmonics: int = 1,
+                 amplitude: float = 2.5, reference_freq: float = 6.65, freq_decay: float = 0.1,
+                 optimal_delay: float = 0.15, time_decay: float = 2.0):
+        self.topologies = list(predictions)
+        self.amplitude = amplitude
+        self.reference_freq = reference_freq
+        self.freq_decay = freq_decay
+        self.optimal_delay = optimal_delay
+        self.time_decay = time_decay
+
+        n_topo = len(self.topologies)
+        self.alpha = np.zeros(n_topo)
+        self.coeff = np.zeros(n_topo)
+        self.offset = np.full(n_topo, 0.15)  # Default primary echo without a scaling law
+        self.echo_names: List[List[str]] = []
+        echo_scale, echo_shift = [], []
+
+        harmonics = np.full((n_topo, n_harmonics), np.nan)
+        self.bandwidth = np.zeros(n_topo)
+        self.harmonic_overlap = np.zeros((n_topo, n_harmonics))
+
+        for t, topology in enumerate(self.topologies):
+            pred = predictions[topology]
+            scaling = pred.get('scaling_law', {})
+
+            names, scale, shift = ['primary'], [1.0], [0.0]
+            if scaling:
+                self.alpha[t] = scaling.get('alpha', -0.826)
+                self.coeff[t] = scaling.get('coefficient', 1.0)
+                self.offset[t] = scaling.get('offset', 0.0)
+
+                # Secondary echoes are affine in τ_primary: read them off at τ = 0, 1
+                if topology in TOPOLOGY_REGISTRY:
+                    extra = TOPOLOGY_REGISTRY[topology]().secondary_echoes(np.array([0.0, 1.0]), pred)
+                    for echo, tau in extra.items():
+                        if echo == 'primary':
+                            continue
+                        tau = np.broadcast_to(np.asarray(tau, dtype=float), (2,))
+                        names.append(echo)
+                        scale.append(tau[1] - tau[0])
+                        shift.append(tau[0])
+            self.echo_names.append(names)
+            echo_scale.append(scale)
+            echo_shift.append(shift)
+
+            freqs = list(pred.get('harmonics', [])) or [pred['fundamental_freq']]
+            freqs = [pred['fundamental_freq']] + [f for f in freqs if f != pred['fundamental_freq']]
+            n = min(n_harmonics, len(freqs))
+            harmonics[t, :n] = freqs[:n]
+            self.bandwidth[t] = pred.get('search_bandwidth', 0.5)
+            self.harmonic_overlap[t, :n] = self._band_overlap(
+                harmonics[t, :n], self.bandwidth[t],
+                np.asarray(pred.get('forbidden_freqs', pred.get('forbidden_frequencies', [])), dtype=float))
+
+        n_echo = max(len(names) for names in self.echo_names)
+        self.echo_scale = np.zeros((n_topo, n_echo))
+        self.echo_shift = np.zeros((n_topo, n_echo))
+        self.echo_valid = np.zeros((n_topo, n_echo), dtype=bool)
+        for t, (scale, shift) in enumerate(zip(echo_scale, echo_shift)):
+            self.echo_scale[t, :len(scale)] = scale
+            self.echo_shift[t, :len(shift)] = shift
+            self.echo_valid[t, :len(scale)] = True
+
+        self.harmonics = harmonics
+        self.fundamental_freq = harmonics[:, 0]
+        # Frequency part of the SNR per (topology, harmonic); 0 for padding
+        self.harmonic_weight = np.nan_to_num(
+            np.exp(-self.freq_decay * np.abs(harmonics - reference_freq)) * self.harmonic_overlap)
+
+    @staticmethod
+    def _band_overlap(freqs: np.ndarray, bandwidth: float, forbidden: np.ndarray) -> np.ndarray:
+        """Fraction of each band [f ± B/2] outside the forbidden bands [f_x ± B/2]."""
+        if forbidden.size == 0 or bandwidth <= 0:
+            return np.ones_like(freqs)
+        lo = freqs[:, None] - bandwidth / 2
+        hi = freqs[:, None] + bandwidth / 2
+        overlap = np.clip(np.minimum(hi, forbidden[None, :] + bandwidth / 2) -
+                          np.maximum(lo, forbidden[None, :] - bandwidth / 2), 0, None)
+        return np.clip(1 - overlap.sum(axis=1) / bandwidth, 0, 1)
+
+    def _index(self, topologies: Optional[Sequence[str]]) -> np.ndarray:
+        if topologies is None:
+            return np.arange(len(self.topologies))
+        return np.array([self.topologies.index(t) for t in topologies])
+
+    def echo_times(self, masses, topologies: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Echo delays (s), shape (topology, event, echo); NaN where a topology
+        has fewer echo types.
+        """
+        idx = self._index(topologies)
+        masses = np.asarray(masses, dtype=float)
+        tau_primary = (self.coeff[idx, None] * masses[None, :] ** self.alpha[idx, None] +
+                       self.offset[idx, None])
+        tau = (self.echo_scale[idx, None, :] * tau_primary[:, :, None] +
+               self.echo_shift[idx, None, :])
+        return np.where(self.echo_valid[idx, None, :], tau, np.nan)
+
+    def expected_snr(self, masses, topologies: Optional[Sequence[str]] = None,
+                     per_harmonic: bool = False) -> np.ndarray:
+        """
+        Noise-free template SNR.
+
+        Returns shape (topology, event, echo, harmonic) if per_harmonic,
+        else the quadrature sum over harmonics, shape (topology, event, echo).
+        Padded echoes give NaN.
+        """
+        idx = self._index(topologies)
+        tau = self.echo_times(masses, topologies)
+        time_factor = np.exp(-self.time_decay * np.abs(tau - self.optimal_delay))
+        if per_harmonic:
+            return (self.amplitude * time_factor[..., None] *
+                    self.harmonic_weight[idx, None, None, :])
+        harmonic_norm = np.sqrt(np.sum(self.harmonic_weight[idx]**2, axis=1))
+        return self.amplitude * time_factor * harmonic_norm[:, None, None]
+
+    def evaluate(self, masses, topologies: Optional[Sequence[str]] = None,
+                 noise_sigma: float = 0.5, threshold: float = 1.5, rng=None,
+                 event_keys: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Noisy template SNRs and detections for a population.
+
+        rng selects the noise source:
+        - SeedSequence: one stream per (topology, event) if event_keys
+          (e.g. event names) are given, else one stream per topology with
+          draws in event order; either way independent of topology order
+        - Generator: drawn per topology in (event, echo) order
+        - None: the global NumPy stream (legacy behaviour)
+
+        Returns:
+        --------
+        dict with 'echo_times' and 'snr', 'significance' of shape
+        (topology, event, echo), and 'best_snr', 'best_significance',
+        'detected' of shape (topology, event)
+        """
+        idx = self._index(topologies)
+        masses = np.asarray(masses, dtype=float)
+        names = [self.topologies[i] for i in idx]
+
+        tau = self.echo_times(masses, names)
+        expected = self.expected_snr(masses, names)
+        snr = np.full(expected.shape, np.nan)
+        for j, t in enumerate(idx):
+            k = int(self.echo_valid[t].sum())
+            if isinstance(rng, np.random.SeedSequence):
+                if event_keys is not None:
+                    noise = np.array([seed_stream(rng, names[j], key).normal(0, noise_sigma, k)
+                                      for key in event_keys]).reshape(len(masses), k)
+                else:
+                    noise = seed_stream(rng, names[j]).normal(0, noise_sigma, (len(masses), k))
+            else:
+                normal = np.random.normal if rng is None else rng.normal
+                noise = normal(0, noise_sigma, size=(len(masses), k))
+            snr[j, :, :k] = np.maximum(0.1, expected[j, :, :k] + noise)
+
+        significance = np.maximum(0, snr - threshold)  # Background threshold
+        # Best echo per event: the first echo with the highest SNR
+        best = np.argmax(np.nan_to_num(snr, nan=-np.inf), axis=2)[..., None]
+        best_snr = np.take_along_axis(snr, best, axis=2)[..., 0]
+        best_significance = np.take_along_axis(significance, best, axis=2)[..., 0]
+
+        return {
+            'echo_times': tau,
+            'snr': snr,
+            'significance': significance,
+            'best_snr': best_snr,
+            'best_significance': best_significance,
+            'detected': best_significance > 1.0
+        }
+
+    @staticmethod
+    def population_stats(best_significance: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-topology detection statistics from best significances (topology, event)."""
+        detected = best_significance > 1.0
+        n_events = best_significance.shape[1]
+        n_detections = detected.sum(axis=1)
+        detected_sig = np.where(detected, best_significance, 0.0)
+        with np.errstate(invalid='ignore'):
+            mean_significance = np.where(n_detections > 0,
+                                         detected_sig.sum(axis=1) / np.maximum(n_detections, 1), 0.0)
+        return {
+            'n_events_tested': n_events,
+            'n_detections': n_detections,
+            'detection_rate': n_detections / n_events if n_events else np.zeros(len(n_detections)),
+            'mean_significance': mean_significance,
+            'max_significance': detected_sig.max(axis=1) if n_events else np.zeros(len(n_detections)),
+            'total_significance': np.sqrt(np.sum(detected_sig**2, axis=1))
+        }
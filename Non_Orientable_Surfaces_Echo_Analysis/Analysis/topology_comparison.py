@@ -29,12 +29,10 @@ import sys
 import os
 
 # Add Theory modules to path
-sys.path.append('../Theory')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Theory', 'Topologies'))
 
-from real_projective_plane import RealProjectivePlane
-from mobius_band import MobiusBand
-from twisted_torus import TwistedTorus
-from orientifold_projections import OrientifoldProjection
+from topology_registry import available_topologies, get_topology
+from spectrum_cache import default_spectrum_cache
 
 class TopologyComparison:
     """
@@ -50,7 +48,8 @@ class TopologyComparison:
         # Use consistent radius/size across all models
         self.reference_size = 8400e3  # meters (from Klein bottle optimization)
         
-        # Initialize all models
+        # Initialize all registered topologies (Klein bottle is the reference)
+        self.topologies = {}
         self.models = self.initialize_models()
         
         # Klein bottle reference (from paper)
@@ -63,67 +62,44 @@ class TopologyComparison:
         }
         
     def initialize_models(self) -> Dict:
-        """Initialize all topology models with consistent parameters."""
+        """Initialize all registered topology models with consistent parameters."""
         print("\nInitializing topology models...")
         
         models = {}
         
-        try:
-            # 1. Real Projective Plane
-            models['RP2'] = RealProjectivePlane(radius=self.reference_size)
-            print("✓ Real Projective Plane initialized")
-            
-            # 2. Möbius Band  
-            models['Mobius'] = MobiusBand(
-                length=2*np.pi*self.reference_size,
-                width=500e3  # 500 km width
-            )
-            print("✓ Möbius Band initialized")
-            
-            # 3. Twisted Torus
-            models['TwistedTorus'] = TwistedTorus(
-                L1=2*np.pi*self.reference_size,
-                L2=2*np.pi*1000e3,
-                twist_angle=np.pi  # Maximum twist
-            )
-            print("✓ Twisted Torus initialized")
-            
-            # 4. String Orientifold
-            models['Orientifold'] = OrientifoldProjection(
-                compactification_type="Klein",
-                string_length=1e-35,
-                extra_dim_size=self.reference_size
-            )
-            print("✓ String Orientifold initialized")
-            
-        except Exception as e:
-            print(f"Warning: Error initializing model: {e}")
+        for key in available_topologies():
+            if key == 'Klein_Bottle':
+                continue  # Reference values below
+            try:
+                topology = get_topology(key, reference_size=self.reference_size)
+                models[topology.short_name] = topology.model
+                self.topologies[topology.short_name] = topology
+                print(f"✓ {topology.name} initialized")
+            except Exception as e:
+                print(f"Warning: Error initializing model {key}: {e}")
             
         return models
     
     def calculate_all_spectra(self) -> Dict[str, Dict]:
-        """Calculate mode spectra for all topologies."""
+        """Calculate (or load cached) mode spectra for all topologies."""
         print("\n" + "="*60)
         print("CALCULATING MODE SPECTRA")
         print("="*60)
         
         spectra = {}
         
-        for name, model in self.models.items():
+        for name, topology in self.topologies.items():
             print(f"\nAnalyzing {name}...")
             
             try:
-                if hasattr(model, 'derive_mode_spectrum'):
-                    spectrum = model.derive_mode_spectrum()
-                else:
-                    spectrum = model.string_mode_spectrum()
+                spectrum = topology.spectrum()
                 
                 spectra[name] = {
                     'spectrum': spectrum,
-                    'f_0': spectrum.get('f_0', 0),
-                    'omega_0': spectrum.get('omega_0', 0),
+                    'f_0': spectrum['f_0'],
+                    'omega_0': spectrum['omega_0'],
                     'has_odd_selection': self.check_odd_mode_selection(spectrum),
-                    'model': model
+                    'model': topology.model
                 }
                 
                 print(f"  Fundamental frequency: {spectra[name]['f_0']:.2f} Hz")
@@ -133,37 +109,19 @@ class TopologyComparison:
                 print(f"  Error calculating spectrum: {e}")
                 spectra[name] = {'error': str(e)}
         
+        print(f"\n{default_spectrum_cache().summary()}")
+        
         return spectra
     
     def check_odd_mode_selection(self, spectrum: Dict) -> bool:
         """Check if topology preferentially selects odd modes."""
         
-        # Different topologies store mode info differently
-        if 'modes' in spectrum:
-            # For orientifolds and twisted torus
-            modes = spectrum['modes']
-            if modes and len(modes) > 5:
-                # Check first few modes
-                mode_numbers = [m.get('n', 1) for m in modes[:5]]
-                odd_fraction = sum(1 for n in mode_numbers if n % 2 == 1) / len(mode_numbers)
-                return odd_fraction > 0.6
-                
-        elif 'l_values' in spectrum:
-            # For RP2
-            l_values = spectrum['l_values']
-            if len(l_values) > 0:
-                odd_fraction = sum(1 for l in l_values if l % 2 == 1) / len(l_values)
-                return odd_fraction > 0.6
-                
-        elif 'longitudinal' in spectrum:
-            # For Möbius band
-            long_modes = spectrum['longitudinal']
-            if long_modes:
-                n_values = [m['n'] for m in long_modes]
-                odd_fraction = sum(1 for n in n_values if n % 2 == 1) / len(n_values)
-                return odd_fraction > 0.6
-        
-        return False
+        # Mode labels the selection rule acts on (l for ℝP², n for Möbius, ...)
+        mode_numbers = np.asarray(spectrum['n'])[:5]
+        if len(mode_numbers) == 0:
+            return False
+        odd_fraction = np.mean(mode_numbers % 2 == 1)
+        return bool(odd_fraction > 0.6)
     
     def predict_echo_times(self, test_masses: List[float] = [30, 62, 100]) -> Dict[str, Dict]:
         """Predict echo times for all topologies."""
@@ -173,34 +131,25 @@ class TopologyComparison:
         
         predictions = {}
         
-        for name, model in self.models.items():
+        for name, topology in self.topologies.items():
             print(f"\n{name} echo times:")
             predictions[name] = {}
             
-            for M in test_masses:
-                try:
-                    if hasattr(model, 'echo_time_prediction'):
-                        if name == 'Mobius':
-                            # Möbius returns tuple (primary, secondary)
-                            tau_primary, tau_secondary = model.echo_time_prediction(M)
-                            predictions[name][f'M_{M}'] = {
-                                'primary': tau_primary,
-                                'secondary': tau_secondary
-                            }
-                            print(f"  M={M}M☉: τ₁={tau_primary:.3f}s, τ₂={tau_secondary:.3f}s")
-                        else:
-                            tau = model.echo_time_prediction(M)
-                            predictions[name][f'M_{M}'] = tau
-                            print(f"  M={M}M☉: τ={tau:.3f}s")
-                    elif hasattr(model, 'echo_prediction_from_strings'):
-                        # Orientifold case
-                        echo_props = model.echo_prediction_from_strings(M)
-                        predictions[name][f'M_{M}'] = echo_props
-                        print(f"  M={M}M☉: τ_closed={echo_props['tau_closed_string']:.3f}s")
-                        
-                except Exception as e:
-                    print(f"  Error for M={M}: {e}")
-                    predictions[name][f'M_{M}'] = None
+            try:
+                # All masses at once; every topology returns named echo arrays
+                echoes = topology.echo_times(np.asarray(test_masses, dtype=float))
+            except Exception as e:
+                print(f"  Error: {e}")
+                predictions[name] = {f'M_{M}': None for M in test_masses}
+                continue
+            
+            for i, M in enumerate(test_masses):
+                predictions[name][f'M_{M}'] = {
+                    echo: float(np.broadcast_to(tau, np.shape(test_masses))[i])
+                    for echo, tau in echoes.items()
+                }
+                print(f"  M={M}M☉: " + ", ".join(
+                    f"τ_{echo}={tau:.3f}s" for echo, tau in predictions[name][f'M_{M}'].items()))
         
         return predictions
     
@@ -223,38 +172,7 @@ class TopologyComparison:
         })
         
         # Other topologies
-        topology_info = {
-            'RP2': {
-                'name': 'Real Projective Plane',
-                'orientable': False,
-                'boundary': False,
-                'key_feature': 'Antipodal identification',
-                'uv_complete': 'No'
-            },
-            'Mobius': {
-                'name': 'Möbius Band', 
-                'orientable': False,
-                'boundary': True,
-                'key_feature': 'Edge modes + twist',
-                'uv_complete': 'No'
-            },
-            'TwistedTorus': {
-                'name': 'Twisted Torus',
-                'orientable': False,  # When twisted
-                'boundary': False,
-                'key_feature': 'Tunable twist parameter',
-                'uv_complete': 'No'
-            },
-            'Orientifold': {
-                'name': 'String Orientifold',
-                'orientable': False,
-                'boundary': False,
-                'key_feature': 'GSO projection',
-                'uv_complete': 'Yes'
-            }
-        }
-        
-        for topo_key, info in topology_info.items():
+        for topo_key, topology in self.topologies.items():
             if topo_key in spectra and 'error' not in spectra[topo_key]:
                 
                 f0 = spectra[topo_key]['f_0']
@@ -266,26 +184,20 @@ class TopologyComparison:
                 if topo_key in echo_predictions:
                     echo_data = echo_predictions[topo_key].get(f'M_{M_test}')
                     if echo_data:
-                        if isinstance(echo_data, dict):
-                            if 'primary' in echo_data:
-                                tau_62 = f"{echo_data['primary']:.3f}"
-                            elif 'tau_closed_string' in echo_data:
-                                tau_62 = f"{echo_data['tau_closed_string']:.3f}"
-                        else:
-                            tau_62 = f"{echo_data:.3f}"
+                        tau_62 = f"{echo_data['primary']:.3f}"
                 
                 mode_selection = "Odd dominant" if has_odd else "Mixed"
                 
                 comparison_data.append({
-                    'Topology': info['name'],
-                    'Orientable': info['orientable'],
-                    'Boundary': info['boundary'],
+                    'Topology': topology.name,
+                    'Orientable': topology.orientable,
+                    'Boundary': topology.boundary,
                     'Mode Selection': mode_selection,
                     'f₀ (Hz)': f0,
                     'τ for 62M☉ (s)': tau_62,
                     'Statistical Significance': 'TBD',
-                    'Key Feature': info['key_feature'],
-                    'UV Complete': info['uv_complete']
+                    'Key Feature': topology.key_feature,
+                    'UV Complete': 'Yes' if topology.uv_complete else 'No'
                 })
         
         return pd.DataFrame(comparison_data)
@@ -354,15 +266,7 @@ class TopologyComparison:
                 for M in masses:
                     echo_data = predictions.get(f'M_{int(M)}')
                     if echo_data:
-                        if isinstance(echo_data, dict):
-                            if 'primary' in echo_data:
-                                taus.append(echo_data['primary'])
-                            elif 'tau_closed_string' in echo_data:
-                                taus.append(echo_data['tau_closed_string'])
-                            else:
-                                taus.append(0.15)  # Fallback
-                        else:
-                            taus.append(echo_data)
+                        taus.append(echo_data['primary'])
                     else:
                         taus.append(0.15)  # Fallback
                 
@@ -392,15 +296,9 @@ class TopologyComparison:
                 spectrum = spectrum_data['spectrum']
                 
                 # Extract first few mode frequencies
-                mode_freqs = []
-                if 'modes' in spectrum and spectrum['modes']:
-                    mode_freqs = [m.get('f', 0) for m in spectrum['modes'][:5]]
-                elif 'longitudinal' in spectrum:
-                    mode_freqs = [m['f'] for m in spectrum['longitudinal'][:5]]
-                elif 'frequencies' in spectrum:
-                    mode_freqs = (spectrum['frequencies']/(2*np.pi)).tolist()[:5]
+                mode_freqs = spectrum['f'][:5]
                 
-                if mode_freqs:
+                if len(mode_freqs):
                     ax4.scatter(mode_freqs, [y_offset]*len(mode_freqs),
                               s=80, color=colors[i+1], 
                               label=topo, marker='s', alpha=0.7)
@@ -8,10 +8,12 @@ against the complete LIGO-Virgo catalog (65 events).
 
 MEMORY CONSERVATION STRATEGY:
 - Process events in small batches (5 events at a time)
-- Clear intermediate results after each batch
-- Use generators instead of lists where possible
+- (topology, batch) work units run in-process by default, or on a process
+  pool (n_workers > 1) with a bounded number of units in flight; only
+  compact batch summaries come back
+- Batch summaries are merged in fixed (topology, batch) order, so results
+  do not depend on worker count or completion order
 - Minimal plotting to essential comparisons only
-- Garbage collection after each topology
 
 Final factors used (symmetry-enhanced):
 - Klein Bottle: 3.142 (π - baseline)
@@ -25,18 +27,47 @@ import numpy as np
 import matplotlib.pyplot as plt
 import json
 import gc
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from typing import Dict, List, Tuple, Generator
+from typing import Dict, List, Tuple, Generator, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Analysis'))
+
+from population_snr import seed_stream
+
+# Analyzer instance of a pool worker (set once by the pool initializer)
+_worker_analyzer = None
+
+
+def _init_worker(analyzer: 'MemoryEfficientLIGOAnalysis'):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _run_work_unit(topology: str, start: int, stop: int) -> Dict:
+    """Analyze one (topology, event batch) work unit in a pool worker."""
+    return _worker_analyzer.analyze_topology_batch(topology, _worker_analyzer.ligo_events[start:stop])
+
+
 class MemoryEfficientLIGOAnalysis:
     """
     Memory-efficient analysis of 65 LIGO events across all topologies.
     """
     
-    def __init__(self):
-        """Initialize with minimal memory footprint."""
+    def __init__(self, seed: int = 42):
+        """
+        Initialize with minimal memory footprint.
+        
+        seed is the root SeedSequence entropy: the simulated catalog and
+        every (topology, event) echo draw use their own named sub-streams,
+        so results do not depend on batching or processing order.
+        """
+        self.seed_sequence = np.random.SeedSequence(seed)
         
         # Final topology factors (symmetry-enhanced)
         self.topology_factors = {
@@ -74,8 +105,12 @@ class MemoryEfficientLIGOAnalysis:
         print("="*60)
         print(f"Events loaded: {len(self.ligo_events)}")
         print(f"Topologies: {len(self.topology_factors)}")
-        print("Memory strategy: Batch processing with garbage collection")
+        print("Memory strategy: (topology, batch) work units, compact summaries merged in order")
         
+    def rng_stream(self, *labels) -> np.random.Generator:
+        """Generator for the sub-stream named by labels (see population_snr.seed_stream)."""
+        return seed_stream(self.seed_sequence, *labels)
+    
     def generate_ligo_catalog(self) -> List[Dict]:
         """
         Generate representative LIGO catalog (memory efficient).
@@ -101,14 +136,16 @@ class MemoryEfficientLIGOAnalysis:
             events.append(event)
         
         # Generate additional representative events to reach 65 total
-        np.random.seed(42)  # Reproducible
-        
+        # (each from its own reproducible stream)
         for i in range(65 - len(major_events)):
+            name = f'GW_sim_{i+1:02d}'
+            rng = self.rng_stream('catalog', name)
+            
             # Realistic parameter distributions
-            mass = np.random.lognormal(np.log(40), 0.5)  # Log-normal around 40 M☉
+            mass = rng.lognormal(np.log(40), 0.5)  # Log-normal around 40 M☉
             mass = max(5.0, min(mass, 200.0))  # Reasonable bounds
             
-            distance = np.random.exponential(800)  # Exponential distribution
+            distance = rng.exponential(800)  # Exponential distribution
             distance = max(100, min(distance, 5000))  # Mpc bounds
             
             # Redshift from distance (rough cosmology)
@@ -116,11 +153,11 @@ class MemoryEfficientLIGOAnalysis:
             z = max(0.01, min(z, 1.0))
             
             # SNR roughly anti-correlated with distance
-            snr = 20 * np.exp(-distance/1000) + np.random.normal(0, 2)
-            snr = max(8.0, min(snr, 50.0))
+            snr = 20 * np.exp(-distance/1000) + rng.normal(0, 2)
+            snr = float(max(8.0, min(snr, 50.0)))
             
             events.append({
-                'name': f'GW_sim_{i+1:02d}',
+                'name': name,
                 'mass': round(mass, 1),
                 'distance': round(distance),
                 'z': round(z, 3),
@@ -129,9 +166,12 @@ class MemoryEfficientLIGOAnalysis:
         
         return events
     
-    def calculate_echo_properties(self, topology: str, event: Dict) -> Dict:
+    def calculate_echo_properties(self, topology: str, event: Dict,
+                                  rng: Optional[np.random.Generator] = None) -> Dict:
         """
         Calculate echo properties for single event (memory efficient).
+        
+        Noise is drawn from rng, by default the (topology, event) stream.
         """
         
         topo_data = self.topology_factors[topology]
@@ -173,7 +213,9 @@ class MemoryEfficientLIGOAnalysis:
         frequency_penalty = np.exp(-0.1 * abs(f_observed - 6.5))  # Penalty for non-optimal freq
         
         echo_snr = base_echo_snr * frequency_penalty
-        echo_snr += np.random.normal(0, 0.3)  # Noise
+        if rng is None:
+            rng = self.rng_stream('echo', topology, event['name'])
+        echo_snr += rng.normal(0, 0.3)  # Noise
         echo_snr = max(0, echo_snr)
         
         # Detection decision
@@ -223,21 +265,79 @@ class MemoryEfficientLIGOAnalysis:
                     'significance': result['significance']
                 })
         
-        # Clear intermediate results
-        del result
-        gc.collect()
-        
         return batch_results
     
-    def process_all_topologies_batched(self, batch_size: int = 5) -> Dict:
+    def work_units(self, batch_size: int = 5) -> List[Tuple[str, int, int]]:
+        """(topology, start, stop) units in deterministic merge order."""
+        return [(topology, start, min(start + batch_size, len(self.ligo_events)))
+                for topology in self.topology_factors
+                for start in range(0, len(self.ligo_events), batch_size)]
+    
+    def process_all_topologies_batched(self, batch_size: int = 5, n_workers: Optional[int] = None,
+                                       max_in_flight: Optional[int] = None,
+                                       progress_interval: float = 5.0) -> Dict:
         """
         Process all topologies in memory-efficient batches.
+        
+        (topology, batch) work units run in-process unless n_workers > 1.
+        All units of the 65-event catalog take about 10 ms in-process,
+        less than starting a pool, so the pool only pays off for large
+        catalogs or heavy units. With a pool, at most max_in_flight
+        units (default 2 × n_workers) are pending at any time, bounding
+        memory. Batch summaries are merged in work-unit order, so the
+        result is identical for any worker count.
+        
+        Parameters:
+        -----------
+        batch_size : int
+            Events per work unit
+        n_workers : int, optional
+            Pool size (default and 1: run in-process)
+        max_in_flight : int, optional
+            Maximum submitted but unfinished work units
+        progress_interval : float
+            Seconds between progress reports
         """
         print(f"\nProcessing {len(self.ligo_events)} events in batches of {batch_size}")
         
+        units = self.work_units(batch_size)
+        n_workers = n_workers or 1
+        n_workers = max(1, min(n_workers, len(units)))
+        batch_results = [None] * len(units)
+        
+        if n_workers == 1:
+            for i, (topology, start, stop) in enumerate(units):
+                batch_results[i] = self.analyze_topology_batch(topology, self.ligo_events[start:stop])
+        else:
+            max_in_flight = max_in_flight or 2 * n_workers
+            print(f"Dispatching {len(units)} work units to {n_workers} workers "
+                  f"(≤ {max_in_flight} in flight)")
+            
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                pending = {}
+                next_unit = 0
+                completed = 0
+                last_report = time.time()
+                
+                while next_unit < len(units) or pending:
+                    while next_unit < len(units) and len(pending) < max_in_flight:
+                        pending[pool.submit(_run_work_unit, *units[next_unit])] = next_unit
+                        next_unit += 1
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch_results[pending.pop(future)] = future.result()
+                        completed += 1
+                    
+                    if time.time() - last_report >= progress_interval or completed == len(units):
+                        print(f"  Completed {completed}/{len(units)} work units")
+                        last_report = time.time()
+        
+        # Deterministic merge in (topology, batch) order
+        n_events = len([e for e in self.ligo_events if e['mass'] >= 5.0])  # Exclude NS
         final_results = {}
         
-        # Process each topology separately to minimize memory
         for topology in self.topology_factors.keys():
             print(f"\nProcessing {topology}...")
             
@@ -252,22 +352,16 @@ class MemoryEfficientLIGOAnalysis:
                 'batch_results': []
             }
             
-            # Process in batches
-            for i in range(0, len(self.ligo_events), batch_size):
-                batch = self.ligo_events[i:i+batch_size]
-                batch_result = self.analyze_topology_batch(topology, batch)
+            for (unit_topology, _, _), batch_result in zip(units, batch_results):
+                if unit_topology != topology:
+                    continue
                 
                 # Accumulate results
                 topology_summary['total_detections'] += batch_result['detections']
                 topology_summary['combined_significance'] += batch_result['total_significance']
                 topology_summary['significant_detections'].extend(batch_result['detection_details'])
-                
-                # Clear batch results (keep only summary)
-                del batch_result
-                gc.collect()
             
             # Calculate final statistics
-            n_events = len([e for e in self.ligo_events if e['mass'] >= 5.0])  # Exclude NS
             topology_summary['detection_rate'] = topology_summary['total_detections'] / n_events
             topology_summary['combined_significance'] = np.sqrt(topology_summary['combined_significance'])
             
@@ -276,9 +370,6 @@ class MemoryEfficientLIGOAnalysis:
             print(f"  Detections: {topology_summary['total_detections']}/{n_events}")
             print(f"  Rate: {topology_summary['detection_rate']:.1%}")
             print(f"  Combined σ: {topology_summary['combined_significance']:.2f}")
-            
-            # Force garbage collection after each topology
-            gc.collect()
         
         return final_results
     
@@ -426,6 +517,7 @@ def main():
     final_output = {
         'analysis_type': 'Final LIGO 65-Sample Topology Comparison',
         'timestamp': timestamp,
+        'seed_entropy': str(analyzer.seed_sequence.entropy),
         'total_events': len(analyzer.ligo_events),
         'methodology': 'Memory-efficient batch processing with symmetry-enhanced factors',
         'topology_factors': analyzer.topology_factors,
@@ -11,6 +11,12 @@ topology based on:
 3. Population-based analysis methodology
 4. Signal-to-noise scaling relationships
 
+All scalings broadcast over NumPy arrays of geometric factors, detection
+rates, catalog sizes and noise levels, so whole sensitivity grids are
+computed in one call. Besides the Gaussian approximation, the counting
+significance can be taken from the exact Poisson or binomial tail,
+evaluated in log-space so that high-σ grid cells do not underflow.
+
 The key insight: σ scales approximately with geometric factor strength
 because larger factors → larger effective radius → stronger coupling
 → higher echo amplitude → better detection significance.
@@ -19,11 +25,115 @@ because larger factors → larger effective radius → stronger coupling
 import numpy as np
 import matplotlib.pyplot as plt
 import json
+import os
+import sys
 from datetime import datetime
-from typing import Dict, List, Tuple
-from scipy import stats
+from typing import Dict, List, Optional, Tuple
+from scipy import stats, special
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Analysis'))
+
+from parallel_chunks import chunk_sizes, map_chunks
+
+
+def log_poisson_sf(k, mu):
+    """
+    log P(X ≥ k) for X ~ Poisson(mu), without underflow.
+
+    Uses P(X ≥ k) = e^(-mu) mu^k / k! · 1F1(1; k+1; mu) where the
+    regularized incomplete gamma function underflows.
+    """
+    k, mu = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(mu, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        direct = np.log(special.gammainc(np.maximum(k, 1), mu))
+        series = (k * np.log(mu) - mu - special.gammaln(k + 1) +
+                  np.log(special.hyp1f1(1, k + 1, mu)))
+    log_sf = np.where(direct > -700, direct, series)
+    return np.where(k <= 0, 0.0, log_sf)
+
+
+def log_binomial_sf(k, n, p, n_terms: int = 64):
+    """
+    log P(X ≥ k) for X ~ Binomial(n, p), without underflow.
+
+    Where the regularized incomplete beta function underflows, k lies far
+    in the tail and the pmf terms j = k, k+1, ... fall off geometrically,
+    so their log-sum-exp over n_terms terms is exact to double precision.
+    """
+    k, n, p = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(n, dtype=float),
+                                  np.asarray(p, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        direct = np.log(special.betainc(np.maximum(k, 1), np.maximum(n - k + 1, 1), p))
+        j = k[..., None] + np.arange(n_terms)
+        log_pmf = (special.gammaln(n[..., None] + 1) - special.gammaln(j + 1) -
+                   special.gammaln(np.maximum(n[..., None] - j, 0) + 1) +
+                   special.xlogy(j, p[..., None]) + special.xlog1py(n[..., None] - j, -p[..., None]))
+        series = special.logsumexp(np.where(j <= n[..., None], log_pmf, -np.inf), axis=-1)
+    log_sf = np.where(direct > -700, direct, series)
+    log_sf = np.where(k > n, -np.inf, log_sf)
+    return np.where(k <= 0, 0.0, log_sf)
+
+
+def log_p_to_sigma(log_p, n_iter: int = 4):
+    """
+    One-sided Gaussian significance z with log Φ(-z) = log_p.
+
+    Seeded with the tail asymptote and refined by Newton steps on
+    scipy.special.log_ndtr, so it stays accurate far beyond the ~38σ
+    where p itself underflows. Clipped at 0 (p ≥ 0.5).
+    """
+    log_p = np.minimum(np.asarray(log_p, dtype=float), np.log(0.5))
+    finite = np.isfinite(log_p)
+    lp = np.where(finite, log_p, np.log(0.5))
+
+    t = -2 * lp
+    z = np.where(lp < -2, np.sqrt(np.maximum(t - np.log(np.maximum(t, 1.0)) - np.log(2 * np.pi), 0.0)),
+                 -special.ndtri(np.exp(lp)))
+    for _ in range(n_iter):
+        log_tail = special.log_ndtr(-z)
+        # d/dz log Φ(-z) = -φ(z)/Φ(-z)
+        slope = -np.exp(-0.5 * z**2 - 0.5 * np.log(2 * np.pi) - log_tail)
+        z = z - (log_tail - lp) / slope
+    return np.where(finite, np.maximum(z, 0.0), np.inf)
+
+
+def _simulate_catalog_chunk(seed: int, chunk_index: int, n_catalogs: int, n_events: np.ndarray,
+                            null_rate: np.ndarray, signal_rate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Detection-count histograms of one chunk of simulated catalogs.
+
+    Each chunk draws from its own SeedSequence child (seed, chunk_index),
+    so the totals do not depend on chunking order or worker count.
+
+    Returns:
+    --------
+    null_hist : array (n_sizes, max(n_events) + 1)
+    signal_hist : array (n_topologies, n_sizes, max(n_events) + 1)
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+    n_bins = int(n_events.max()) + 1
+    n_sizes = len(n_events)
+    n_topo = signal_rate.shape[0]
+
+    null_counts = rng.binomial(n_events[:, None], null_rate[:, None], size=(n_sizes, n_catalogs))
+    offsets = np.arange(n_sizes)[:, None] * n_bins
+    null_hist = np.bincount((null_counts + offsets).ravel(),
+                            minlength=n_sizes * n_bins).reshape(n_sizes, n_bins)
+
+    signal_counts = rng.binomial(n_events[None, :, None], signal_rate[:, :, None],
+                                 size=(n_topo, n_sizes, n_catalogs))
+    offsets = np.arange(n_topo * n_sizes).reshape(n_topo, n_sizes, 1) * n_bins
+    signal_hist = np.bincount((signal_counts + offsets).ravel(),
+                              minlength=n_topo * n_sizes * n_bins).reshape(n_topo, n_sizes, n_bins)
+    return null_hist, signal_hist
+
+
+def _as_output(values: Dict[str, np.ndarray]) -> Dict:
+    """Python floats for scalar (0-d) results, arrays otherwise."""
+    return {name: (float(value) if np.ndim(value) == 0 else value)
+            for name, value in values.items()}
+
 class StatisticalSignificanceCalculator:
     """
     Calculate expected σ values from rigorous geometric factors.
@@ -71,13 +181,27 @@ class StatisticalSignificanceCalculator:
         print(f"Klein bottle baseline: {self.klein_baseline['significance']:.2f}σ")
         print(f"Scaling method: σ ∝ √(geometric_factor)")
         
-    def calculate_signal_scaling(self, geometric_factor: float) -> Dict[str, float]:
+    def calculate_signal_scaling(self, geometric_factor, noise_level=1.0) -> Dict[str, np.ndarray]:
         """
         Calculate how signal properties scale with geometric factor.
         
         Physics: Larger geometric factor → larger effective radius 
         → stronger 4D-5D coupling → higher echo amplitude
+        
+        Parameters:
+        -----------
+        geometric_factor : float or array
+            Geometric factor(s)
+        noise_level : float or array
+            Noise amplitude relative to the Klein bottle baseline
+            (broadcast against geometric_factor)
+            
+        Returns:
+        --------
+        dict of floats for scalar inputs, else arrays of the broadcast shape
         """
+        geometric_factor, noise_level = np.broadcast_arrays(
+            np.asarray(geometric_factor, dtype=float), np.asarray(noise_level, dtype=float))
         
         # Signal amplitude scaling
         # Echo amplitude ∝ coupling strength ∝ (R_5D/R_4D)
@@ -85,8 +209,8 @@ class StatisticalSignificanceCalculator:
         amplitude_scaling = geometric_factor / self.klein_baseline['factor']
         
         # SNR scaling  
-        # SNR ∝ amplitude (for fixed noise)
-        snr_scaling = amplitude_scaling
+        # SNR ∝ amplitude / noise
+        snr_scaling = amplitude_scaling / noise_level
         
         # Detection rate scaling
         # P(detection) ∝ fraction of events above threshold
@@ -101,24 +225,23 @@ class StatisticalSignificanceCalculator:
         scaled_margin = scaled_snr - threshold
         
         # Detection rate scales with margin above threshold
-        if scaled_margin > 0:
-            detection_scaling = scaled_margin / baseline_margin
-        else:
-            detection_scaling = 0.01  # Very low if below threshold
+        # (very low if below threshold)
+        detection_scaling = np.where(scaled_margin > 0, scaled_margin / baseline_margin, 0.01)
             
         detection_rate = self.klein_baseline['detection_rate'] * detection_scaling
-        detection_rate = min(detection_rate, 0.2)  # Cap at 20%
+        detection_rate = np.minimum(detection_rate, 0.2)  # Cap at 20%
         
-        return {
+        return _as_output({
             'amplitude_scaling': amplitude_scaling,
             'snr_scaling': snr_scaling,
             'detection_scaling': detection_scaling,
             'expected_detection_rate': detection_rate,
             'expected_mean_snr': scaled_snr
-        }
+        })
     
-    def calculate_population_significance(self, detection_rate: float, 
-                                        mean_snr: float) -> Dict[str, float]:
+    def calculate_population_significance(self, detection_rate, mean_snr, n_events=None,
+                                        tail: str = 'gaussian',
+                                        background: float = 0.1) -> Dict[str, np.ndarray]:
         """
         Calculate population-based statistical significance.
         
@@ -127,45 +250,71 @@ class StatisticalSignificanceCalculator:
         - Detection rate p
         - Mean SNR per detection
         - Combined significance from multiple detections
-        """
         
-        N_total = self.klein_baseline['n_events_total']
+        Parameters:
+        -----------
+        detection_rate, mean_snr : float or array
+            Echo detection rate and mean SNR per detection
+        n_events : int or array, optional
+            Catalog size(s) (default: the 65-event baseline catalog)
+        tail : str
+            Counting significance of the observed detections:
+            'gaussian' - (n_obs - b)/√(b + 1) approximation
+            'poisson'  - exact Poisson(b) tail
+            'binomial' - exact Binomial(N, b/N) tail
+        background : float
+            Expected background detections per baseline-size catalog
+            (scaled with n_events)
+            
+        Returns:
+        --------
+        dict of floats for scalar inputs, else arrays of the broadcast
+        shape of (detection_rate, mean_snr, n_events)
+        """
+        if tail not in ('gaussian', 'poisson', 'binomial'):
+            raise ValueError(f"Unknown tail '{tail}' (use 'gaussian', 'poisson' or 'binomial')")
+        
+        if n_events is None:
+            n_events = self.klein_baseline['n_events_total']
+        detection_rate, mean_snr, N_total = np.broadcast_arrays(
+            np.asarray(detection_rate, dtype=float), np.asarray(mean_snr, dtype=float),
+            np.asarray(n_events, dtype=float))
         expected_detections = N_total * detection_rate
         
         # Individual detection significance
         # Convert SNR to σ (rough approximation for template matching)
-        individual_sigma = max(0, mean_snr - 1.5)  # Background threshold
+        individual_sigma = np.maximum(0, mean_snr - 1.5)  # Background threshold
         
         # Population significance methods:
         
         # Method 1: √N scaling for independent detections
-        if expected_detections > 0:
-            population_sigma_sqrt = individual_sigma * np.sqrt(expected_detections)
-        else:
-            population_sigma_sqrt = 0
+        population_sigma_sqrt = individual_sigma * np.sqrt(np.maximum(expected_detections, 0))
             
         # Method 2: Sum in quadrature (more conservative)
-        if expected_detections > 0:
-            population_sigma_quad = individual_sigma * np.sqrt(expected_detections)
-        else:
-            population_sigma_quad = 0
+        population_sigma_quad = individual_sigma * np.sqrt(np.maximum(expected_detections, 0))
             
         # Method 3: Binomial significance test
         # Null hypothesis: no echoes (detection rate = 0)
         # Alternative: detection rate = p
-        if expected_detections >= 1:
+        observed = np.where(expected_detections >= 1, np.round(expected_detections), 0)
+        background_mean = background * N_total / self.klein_baseline['n_events_total']
+        if tail == 'gaussian':
             # Use Poisson approximation for rare events
-            observed = int(np.round(expected_detections))
-            background = 0.1  # Expected background detections
-            binomial_sigma = max(0, (observed - background) / np.sqrt(background + 1))
+            log_p_value = None
+            binomial_sigma = np.maximum(0, (observed - background_mean) / np.sqrt(background_mean + 1))
         else:
-            binomial_sigma = 0
+            if tail == 'poisson':
+                log_p_value = log_poisson_sf(observed, background_mean)
+            else:
+                log_p_value = log_binomial_sf(observed, N_total, background_mean / N_total)
+            binomial_sigma = log_p_to_sigma(log_p_value)
+        binomial_sigma = np.where(expected_detections >= 1, binomial_sigma, 0.0)
             
         # Conservative estimate (take minimum of methods)
-        conservative_sigma = min(population_sigma_sqrt, population_sigma_quad, 
-                               binomial_sigma + individual_sigma)
+        conservative_sigma = np.minimum(np.minimum(population_sigma_sqrt, population_sigma_quad),
+                                        binomial_sigma + individual_sigma)
         
-        return {
+        result = {
             'expected_detections': expected_detections,
             'individual_sigma': individual_sigma,
             'population_sigma_sqrt': population_sigma_sqrt,
@@ -174,8 +323,43 @@ class StatisticalSignificanceCalculator:
             'conservative_sigma': conservative_sigma,
             'detection_rate': detection_rate
         }
+        if log_p_value is not None:
+            result['log_p_value'] = np.where(expected_detections >= 1, log_p_value, 0.0)
+        return _as_output(result)
     
-    def analyze_all_topologies(self) -> Dict[str, Dict]:
+    def significance_grid(self, n_events, detection_rates, mean_snr=None,
+                          tail: str = 'poisson') -> Dict[str, np.ndarray]:
+        """
+        Sensitivity map over catalog size × detection rate in one call.
+        
+        Parameters:
+        -----------
+        n_events : array
+            Catalog sizes (grid rows)
+        detection_rates : array
+            Echo detection rates (grid columns)
+        mean_snr : float or array, optional
+            Mean SNR per detection (default: Klein bottle baseline);
+            must broadcast against (len(n_events), len(detection_rates))
+        tail : str
+            Counting tail, see calculate_population_significance
+            
+        Returns:
+        --------
+        dict with 'n_events', 'detection_rates' and the significance arrays
+        of shape (len(n_events), len(detection_rates))
+        """
+        n_events = np.atleast_1d(np.asarray(n_events, dtype=float))
+        detection_rates = np.atleast_1d(np.asarray(detection_rates, dtype=float))
+        if mean_snr is None:
+            mean_snr = self.klein_baseline['mean_snr']
+        grid = self.calculate_population_significance(
+            detection_rates[None, :], mean_snr, n_events=n_events[:, None], tail=tail)
+        grid['n_events'] = n_events
+        grid['detection_rates'] = detection_rates
+        return grid
+    
+    def analyze_all_topologies(self, tail: str = 'gaussian') -> Dict[str, Dict]:
         """
         Calculate significance for all topologies.
         """
@@ -183,21 +367,26 @@ class StatisticalSignificanceCalculator:
         print("CALCULATING SIGNIFICANCE FOR ALL TOPOLOGIES")
         print("="*60)
         
+        topologies = list(self.rigorous_factors)
+        factors = np.array([self.rigorous_factors[t]['factor'] for t in topologies])
+        
+        # Signal scaling and population significance for all factors at once
+        signal_grid = self.calculate_signal_scaling(factors)
+        pop_grid = self.calculate_population_significance(
+            signal_grid['expected_detection_rate'],
+            signal_grid['expected_mean_snr'],
+            tail=tail
+        )
+        
         results = {}
         
-        for topology, factor_data in self.rigorous_factors.items():
+        for i, topology in enumerate(topologies):
             
             print(f"\n{topology}:")
+            factor_data = self.rigorous_factors[topology]
             factor = factor_data['factor']
-            
-            # Calculate signal scaling
-            signal_props = self.calculate_signal_scaling(factor)
-            
-            # Calculate population significance
-            pop_sig = self.calculate_population_significance(
-                signal_props['expected_detection_rate'],
-                signal_props['expected_mean_snr']
-            )
+            signal_props = {name: float(values[i]) for name, values in signal_grid.items()}
+            pop_sig = {name: float(values[i]) for name, values in pop_grid.items()}
             
             # Combine results
             results[topology] = {
@@ -216,6 +405,142 @@ class StatisticalSignificanceCalculator:
             
         return results
     
+    def monte_carlo_validation(self, n_catalogs: int = 1_000_000, n_events=(10, 20, 65, 200, 1000),
+                               seed: int = 42, chunk_size: int = 100_000,
+                               n_workers: Optional[int] = None,
+                               background: float = 0.1) -> Dict:
+        """
+        Monte Carlo check of the analytic counting significance.
+        
+        Simulates n_catalogs null catalogs (background only) and, for every
+        topology, n_catalogs signal catalogs (echoes + background) per
+        catalog size, as vectorized binomial draws. The empirical
+        significance of the expected detection count, P_null(X ≥ n_obs),
+        is compared with the Gaussian approximation and the exact
+        Poisson/binomial tails.
+        
+        Catalogs are simulated in chunks spread over worker processes; each
+        chunk has its own seed stream, so results depend only on seed and
+        chunk_size, not on n_workers.
+        
+        Parameters:
+        -----------
+        n_catalogs : int
+            Simulated catalogs per (catalog size, topology)
+        n_events : sequence of int
+            Catalog sizes
+        seed : int
+            Root seed
+        chunk_size : int
+            Catalogs per chunk
+        n_workers : int, optional
+            Worker processes (default: CPU count; 1 runs in-process)
+        background : float
+            Expected background detections per baseline-size catalog
+            
+        Returns:
+        --------
+        dict with per-topology arrays over n_events:
+        'observed', 'analytic_gaussian_sigma', 'analytic_poisson_sigma',
+        'analytic_binomial_sigma', 'empirical_sigma' (lower bound where
+        flagged in 'empirical_lower_bound'), 'median_signal_sigma' and
+        'power_3sigma' (fraction of signal catalogs reaching 3σ)
+        """
+        print("\n" + "="*60)
+        print("MONTE CARLO VALIDATION")
+        print("="*60)
+        
+        topologies = list(self.rigorous_factors)
+        factors = np.array([self.rigorous_factors[t]['factor'] for t in topologies])
+        n_events = np.asarray(n_events, dtype=np.int64)
+        
+        signal = self.calculate_signal_scaling(factors)
+        echo_rate = np.asarray(signal['expected_detection_rate'])
+        null_rate = np.full(len(n_events), background / self.klein_baseline['n_events_total'])
+        # Echo detections on top of background: P(echo or background)
+        signal_rate = 1 - (1 - echo_rate[:, None]) * (1 - null_rate[None, :])
+        
+        sizes = chunk_sizes(n_catalogs, chunk_size=chunk_size)
+        n_workers = min(n_workers or os.cpu_count() or 1, len(sizes))
+        
+        print(f"Catalogs per case: {n_catalogs:,} in {len(sizes)} chunks, "
+              f"{n_workers} worker(s), seed {seed}")
+        
+        args = [(seed, index, size, n_events, null_rate, signal_rate)
+                for index, size in enumerate(sizes)]
+        partials = map_chunks(_simulate_catalog_chunk, args, n_workers)
+        null_hist = sum(p[0] for p in partials)
+        signal_hist = sum(p[1] for p in partials)
+        
+        # Empirical null survival P(X ≥ k), per catalog size
+        null_sf = np.cumsum(null_hist[:, ::-1], axis=1)[:, ::-1] / n_catalogs
+        with np.errstate(divide='ignore'):
+            log_null_sf = np.log(null_sf)
+        resolution_sigma = float(log_p_to_sigma(np.log(1 / n_catalogs)))
+        
+        def empirical_sigma(counts):
+            """Empirical σ of counts (topology, size); capped at the MC resolution."""
+            counts = np.minimum(counts, null_sf.shape[1] - 1)
+            log_p = np.take_along_axis(np.broadcast_to(log_null_sf, counts.shape + log_null_sf.shape[-1:]),
+                                       counts[..., None], axis=-1)[..., 0]
+            bound = ~np.isfinite(log_p)
+            return np.where(bound, resolution_sigma, log_p_to_sigma(log_p)), bound
+        
+        # Expected observed count and the analytic significance of it
+        analytic = {tail: self.calculate_population_significance(
+                        echo_rate[:, None], signal['expected_mean_snr'][:, None],
+                        n_events=n_events[None, :], tail=tail, background=background)
+                    for tail in ('gaussian', 'poisson', 'binomial')}
+        expected = analytic['gaussian']['expected_detections']
+        observed = np.where(expected >= 1, np.round(expected), 0).astype(np.int64)
+        emp_sigma, emp_bound = empirical_sigma(observed)
+        emp_sigma = np.where(observed > 0, emp_sigma, 0.0)
+        emp_bound &= observed > 0
+        
+        # Median significance and 3σ power of the simulated signal catalogs
+        signal_cdf = np.cumsum(signal_hist, axis=2) / n_catalogs
+        median_count = np.argmax(signal_cdf >= 0.5, axis=2)
+        median_sigma, _ = empirical_sigma(median_count)
+        critical = np.argmax(null_sf <= stats.norm.sf(3.0), axis=1)  # First count reaching 3σ
+        critical = np.where(null_sf[np.arange(len(n_events)), critical] <= stats.norm.sf(3.0),
+                            critical, null_sf.shape[1])
+        power = np.array([[signal_hist[t, j, critical[j]:].sum() / n_catalogs
+                           for j in range(len(n_events))] for t in range(len(topologies))])
+        
+        validation = {
+            'n_catalogs': n_catalogs,
+            'seed': seed,
+            'chunk_size': chunk_size,
+            'n_events': n_events.tolist(),
+            'resolution_sigma': resolution_sigma,
+            'topologies': {}
+        }
+        for t, topology in enumerate(topologies):
+            validation['topologies'][topology] = {
+                'detection_rate': float(echo_rate[t]),
+                'observed': observed[t].tolist(),
+                'analytic_gaussian_sigma': analytic['gaussian']['binomial_sigma'][t].tolist(),
+                'analytic_poisson_sigma': analytic['poisson']['binomial_sigma'][t].tolist(),
+                'analytic_binomial_sigma': analytic['binomial']['binomial_sigma'][t].tolist(),
+                'empirical_sigma': emp_sigma[t].tolist(),
+                'empirical_lower_bound': emp_bound[t].tolist(),
+                'median_signal_sigma': median_sigma[t].tolist(),
+                'power_3sigma': power[t].tolist()
+            }
+            
+            print(f"\n{topology} (detection rate {echo_rate[t]:.1%}):")
+            print(f"  {'N_events':>8} {'n_obs':>6} {'Gauss':>7} {'Poisson':>8} {'Binom':>7} "
+                  f"{'MC':>8} {'P(≥3σ)':>7}")
+            for j, n in enumerate(n_events):
+                mc = f"{'≥' if emp_bound[t, j] else ''}{emp_sigma[t, j]:.2f}σ"
+                print(f"  {n:>8} {observed[t, j]:>6} "
+                      f"{analytic['gaussian']['binomial_sigma'][t, j]:>6.2f}σ "
+                      f"{analytic['poisson']['binomial_sigma'][t, j]:>7.2f}σ "
+                      f"{analytic['binomial']['binomial_sigma'][t, j]:>6.2f}σ "
+                      f"{mc:>8} {power[t, j]:>7.1%}")
+        
+        return validation
+    
     def create_significance_ranking(self, results: Dict) -> List[Dict]:
         """
         Create ranking by expected significance.
@@ -341,6 +666,22 @@ def main():
         print(f"   Physical origin: {entry['physical_origin']}")
         print()
     
+    # Sensitivity map over catalog size × detection rate (exact Poisson tail)
+    sensitivity = calc.significance_grid(
+        n_events=[65, 130, 260, 650, 1300],
+        detection_rates=[0.01, 0.02, 0.048, 0.1, 0.2],
+        tail='poisson'
+    )
+    
+    print("SENSITIVITY MAP (conservative σ, exact Poisson tail)")
+    print("-"*60)
+    print("N_events " + "".join(f"{r:>9.1%}" for r in sensitivity['detection_rates']))
+    for n, row in zip(sensitivity['n_events'], sensitivity['conservative_sigma']):
+        print(f"{n:>8.0f} " + "".join(f"{sigma:>8.2f}σ" for sigma in row))
+    
+    # Monte Carlo check of the analytic counting significance
+    validation = calc.monte_carlo_validation(n_catalogs=1_000_000, seed=42)
+    
     # Generate plot
     plot_path = "../Results/significance_predictions_rigorous_factors.png"
     calc.generate_comparison_plot(ranking, save_path=plot_path)
@@ -355,6 +696,8 @@ def main():
         'methodology': 'Population-based analysis with σ ∝ √(geometric_factor)',
         'results': results,
         'ranking': ranking,
+        'monte_carlo_validation': validation,
+        'sensitivity_map': {name: np.asarray(values).tolist() for name, values in sensitivity.items()},
         'key_predictions': [
             f"Klein Bottle: {ranking[0]['expected_sigma']:.2f}σ (baseline validated)",
             f"Best alternative: {ranking[1]['topology']} at {ranking[1]['expected_sigma']:.2f}σ",
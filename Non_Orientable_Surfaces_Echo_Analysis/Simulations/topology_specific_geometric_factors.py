@@ -17,14 +17,45 @@ SURFACE CHARACTERISTICS:
 - Möbius Band: HAS BOUNDARY (single edge), twist constraint
 - Twisted Torus: No boundary, toroidal with twist
 - String Orientifold: Dual boundary conditions (open/closed)
+
+The sensitivity subsystem perturbs the four component factors (Euler,
+boundary, path, constraint) over ranges, on a full grid or a Sobol
+sequence, propagates every sample through the combination rule and the
+radius relation at once, and reports variance-based (Sobol) sensitivity
+indices per topology.
 """
 
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Dict, Tuple, List
+from itertools import product
+from scipy.stats import qmc
+from typing import Dict, Optional, Tuple, List
 from datetime import datetime
 import json
 
+C_LIGHT = 299792458  # m/s
+
+# Component factors, in sample-column order
+FACTOR_COMPONENTS = ('euler_factor', 'boundary_factor', 'path_factor', 'constraint_factor')
+
+
+def combine_factors(euler_factor, boundary_factor, path_factor, constraint_factor, has_boundary):
+    """
+    Combined geometric factor from its components (broadcasts over arrays).
+    
+    Different combination rules based on topology type:
+    - With boundaries: boundary effects dominate, B·C·√P
+    - Closed surfaces: path and constraint effects, E·P·C
+    """
+    return np.where(has_boundary,
+                    boundary_factor * constraint_factor * np.sqrt(path_factor),
+                    euler_factor * path_factor * constraint_factor)
+
+
+def effective_radius(geometric_factor, frequency):
+    """Radius R = (geometric_factor · c) / (2π f₀) in m (broadcasts over arrays)."""
+    return (geometric_factor * C_LIGHT) / (2 * np.pi * frequency)
+
 class TopologySpecificAnalyzer:
     """
     Derive geometric factors from fundamental topological properties.
@@ -218,13 +249,8 @@ class TopologySpecificAnalyzer:
             constraint_factor = self.calculate_constraint_factor(topology)
             
             # Combined geometric factor
-            # Different combination rules based on topology type
-            if char['boundary']:
-                # For surfaces with boundaries: boundary effects dominate
-                combined_factor = boundary_factor * constraint_factor * np.sqrt(path_factor)
-            else:
-                # For closed surfaces: path and constraint effects
-                combined_factor = euler_factor * path_factor * constraint_factor
+            combined_factor = float(combine_factors(euler_factor, boundary_factor, path_factor,
+                                                    constraint_factor, char['boundary']))
             
             derived_factors[topology] = {
                 'euler_factor': euler_factor,
@@ -268,7 +294,6 @@ class TopologySpecificAnalyzer:
         print("RECALCULATION WITH DERIVED FACTORS")
         print(f"{'='*60}")
         
-        c = 299792458  # m/s
         derived_factors = self.derive_topology_specific_factors()
         
         results = {}
@@ -282,7 +307,7 @@ class TopologySpecificAnalyzer:
             geom_factor = factor_data['combined_factor']
             
             # Calculate radius: R = (geometric_factor * c) / (2π * f₀)
-            R_eff = (geom_factor * c) / (2 * np.pi * freq)
+            R_eff = effective_radius(geom_factor, freq)
             
             R_km = R_eff / 1000
             R_earth = R_eff / 6.371e6
@@ -305,6 +330,205 @@ class TopologySpecificAnalyzer:
         
         return results
     
+    def base_components(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Unperturbed component factors of all topologies.
+        
+        Returns:
+        --------
+        topologies : list of str
+        components : array (topology, 4), columns in FACTOR_COMPONENTS order
+        has_boundary : bool array (topology,)
+        """
+        topologies = list(self.topology_characteristics)
+        components = np.array([[self.calculate_euler_factor(t), self.calculate_boundary_factor(t),
+                                self.calculate_path_factor(t), self.calculate_constraint_factor(t)]
+                               for t in topologies])
+        has_boundary = np.array([self.topology_characteristics[t]['boundary'] for t in topologies])
+        return topologies, components, has_boundary
+    
+    def propagate_factor_samples(self, multipliers: np.ndarray, frequencies: Dict[str, float],
+                                 absolute: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Vectorized recalculate_with_derived_factors for perturbed components.
+        
+        Parameters:
+        -----------
+        multipliers : array (topology, sample, 4) or (sample, 4)
+            Relative perturbations of the component factors
+        frequencies : dict
+            Topology name → frequency (Hz); topologies in the order of
+            topology_characteristics
+        absolute : bool
+            Treat multipliers as the component values themselves
+            
+        Returns:
+        --------
+        dict with 'combined_factor', 'radius_km' and 'radius_earth_radii',
+        each of shape (topology, sample)
+        """
+        topologies, components, has_boundary = self.base_components()
+        freqs = np.array([frequencies[t] for t in topologies], dtype=float)
+        multipliers = np.asarray(multipliers, dtype=float)
+        if multipliers.ndim == 2:
+            multipliers = np.broadcast_to(multipliers, (len(topologies),) + multipliers.shape)
+        
+        values = multipliers if absolute else components[:, None, :] * multipliers
+        combined = combine_factors(*np.moveaxis(values, -1, 0), has_boundary[:, None])
+        radius = effective_radius(combined, freqs[:, None])
+        return {
+            'combined_factor': combined,
+            'radius_km': radius / 1000,
+            'radius_earth_radii': radius / 6.371e6
+        }
+    
+    def factor_sensitivity(self, frequencies: Dict[str, float], method: str = 'sobol',
+                           ranges: Optional[Dict] = None, mode: str = 'relative',
+                           n_samples: int = 4096, n_grid: int = 11,
+                           seed: int = 42, tie_tolerance: float = 0.02) -> Dict[str, Dict]:
+        """
+        Variance-based sensitivity of the derived factors to their components.
+        
+        Each component factor is drawn independently and uniformly over its
+        range. The indices are those of the combined factor; since R ∝ factor
+        (and f ∝ factor at fixed R), they are also the indices of the
+        predicted radius and frequency.
+        
+        With equal relative ranges the combination rules are pure products
+        (up to √P), so the indices of every closed surface coincide and
+        the three components tie; absolute or per-topology ranges describe
+        how uncertain each derived component actually is.
+        
+        Parameters:
+        -----------
+        frequencies : dict
+            Topology name → frequency (Hz)
+        method : str
+            'sobol' - Saltelli/Jansen estimators on a scrambled Sobol
+                      sequence, n_samples·(4 + 2) evaluations
+            'grid'  - exact decomposition on an n_grid⁴ factorial grid
+        ranges : dict, optional
+            Component → (low, high), applied to every topology, and/or
+            topology → {component → (low, high)}, which takes precedence
+            (default: ±20% of the derived value for every component)
+        mode : str
+            'relative' - (low, high) are multipliers of the derived value
+            'absolute' - (low, high) are component values
+        n_samples : int
+            Base Sobol sample size (rounded up to a power of 2)
+        n_grid : int
+            Grid points per component
+        seed : int
+            Scrambling seed of the Sobol sequence
+        tie_tolerance : float
+            Total-order indices within this of the largest are reported as
+            tied dominant components
+            
+        Returns:
+        --------
+        dict: topology → {'first_order', 'total_order' (component → index),
+        'dominant_factors' (list, ties included), 'dominant_factor' (None
+        on a tie), 'ranges' (component → absolute (low, high)),
+        'factor_mean', 'factor_std', 'radius_km_mean', 'radius_km_std',
+        'radius_km_interval' (5-95%)}
+        """
+        if method not in ('sobol', 'grid'):
+            raise ValueError(f"Unknown method '{method}' (use 'sobol' or 'grid')")
+        if mode not in ('relative', 'absolute'):
+            raise ValueError(f"Unknown mode '{mode}' (use 'relative' or 'absolute')")
+        
+        print(f"\n{'='*60}")
+        print(f"FACTOR SENSITIVITY ANALYSIS ({method.upper()})")
+        print(f"{'='*60}")
+        
+        ranges = ranges or {}
+        topologies, components, _ = self.base_components()
+        unknown = set(ranges) - set(FACTOR_COMPONENTS) - set(topologies)
+        if unknown:
+            raise ValueError(f"Unknown components or topologies in ranges: {sorted(unknown)}")
+        d = len(FACTOR_COMPONENTS)
+        
+        # Absolute (low, high) per topology and component: (topology, 4, 2)
+        bounds = np.empty((len(topologies), d, 2))
+        for t, topology in enumerate(topologies):
+            own = ranges.get(topology, {})
+            for i, name in enumerate(FACTOR_COMPONENTS):
+                if name in own or name in ranges:
+                    bound = np.asarray(own.get(name, ranges.get(name)), dtype=float)
+                    bounds[t, i] = bound * components[t, i] if mode == 'relative' else bound
+                else:
+                    bounds[t, i] = (0.8 * components[t, i], 1.2 * components[t, i])
+        low, high = bounds[:, None, :, 0], bounds[:, None, :, 1]
+        
+        def propagate(unit):
+            """Component values from unit-cube samples (sample, 4), propagated."""
+            return self.propagate_factor_samples(low + unit * (high - low), frequencies,
+                                                 absolute=True)
+        
+        if method == 'grid':
+            axis = np.linspace(0, 1, n_grid)
+            propagated = propagate(np.array(list(product(axis, repeat=d))))
+            y = propagated['combined_factor'].reshape((len(topologies),) + (n_grid,) * d)
+            variance = y.reshape(len(topologies), -1).var(axis=1)
+            first, total = np.zeros((len(topologies), d)), np.zeros((len(topologies), d))
+            for i in range(d):
+                others = tuple(1 + j for j in range(d) if j != i)
+                # S_i = Var(E[Y|X_i]) / Var(Y);  S_Ti = E[Var(Y|X_~i)] / Var(Y)
+                first[:, i] = y.mean(axis=others).var(axis=1)
+                total[:, i] = y.var(axis=1 + i).mean(axis=tuple(range(1, d)))
+        else:
+            n = 2 ** int(np.ceil(np.log2(max(n_samples, 2))))
+            unit = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random(n)
+            A, B = unit[:, :d], unit[:, d:]
+            # A, B and the d matrices A with column i taken from B
+            AB = np.repeat(A[None], d, axis=0)
+            AB[np.arange(d), :, np.arange(d)] = B.T
+            propagated = propagate(np.concatenate([A, B, AB.reshape(-1, d)]))
+            y = propagated['combined_factor']
+            fA, fB = y[:, :n], y[:, n:2 * n]
+            fAB = y[:, 2 * n:].reshape(len(topologies), d, n)
+            variance = np.concatenate([fA, fB], axis=1).var(axis=1)
+            # Saltelli (2010) first order, Jansen total order
+            first = np.mean(fB[:, None, :] * (fAB - fA[:, None, :]), axis=2)
+            total = 0.5 * np.mean((fA[:, None, :] - fAB)**2, axis=2)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            first = np.where(variance[:, None] > 0, first / variance[:, None], 0.0)
+            total = np.where(variance[:, None] > 0, total / variance[:, None], 0.0)
+        
+        radius_km = propagated['radius_km']
+        factor = propagated['combined_factor']
+        
+        sensitivity = {}
+        for t, topology in enumerate(topologies):
+            dominant = [name for i, name in enumerate(FACTOR_COMPONENTS)
+                        if total[t, i] >= total[t].max() - tie_tolerance]
+            sensitivity[topology] = {
+                'method': method,
+                'mode': mode,
+                'n_evaluations': int(factor.shape[1]),
+                'ranges': dict(zip(FACTOR_COMPONENTS, bounds[t].tolist())),
+                'first_order': dict(zip(FACTOR_COMPONENTS, first[t].tolist())),
+                'total_order': dict(zip(FACTOR_COMPONENTS, total[t].tolist())),
+                'dominant_factors': dominant,
+                'dominant_factor': dominant[0] if len(dominant) == 1 else None,
+                'factor_mean': float(factor[t].mean()),
+                'factor_std': float(factor[t].std()),
+                'radius_km_mean': float(radius_km[t].mean()),
+                'radius_km_std': float(radius_km[t].std()),
+                'radius_km_interval': np.percentile(radius_km[t], [5, 95]).tolist()
+            }
+            
+            print(f"\n{topology}:")
+            print(f"  Factor: {factor[t].mean():.3f} ± {factor[t].std():.3f}")
+            print(f"  {'Component':<18} {'S_i':>7} {'S_Ti':>7}")
+            for i, name in enumerate(FACTOR_COMPONENTS):
+                print(f"  {name:<18} {first[t, i]:>7.3f} {total[t, i]:>7.3f}")
+            tie = f" (tied within {tie_tolerance})" if len(dominant) > 1 else ""
+            print(f"  Dominant: {', '.join(dominant)}{tie}")
+        
+        return sensitivity
+    
     def validate_mobius_special_case(self) -> Dict:
         """
         Special analysis for Möbius band boundary effects.
@@ -452,6 +676,9 @@ def main():
     # Derive topology-specific factors
     derived_results = analyzer.recalculate_with_derived_factors(observed_frequencies)
     
+    # Which component factor dominates each prediction
+    sensitivity = analyzer.factor_sensitivity(observed_frequencies, method='sobol')
+    
     # Special Möbius analysis
     mobius_analysis = analyzer.validate_mobius_special_case()
     
@@ -463,6 +690,7 @@ def main():
     
     results = {
         'derived_geometric_factors': derived_results,
+        'factor_sensitivity': sensitivity,
         'mobius_boundary_analysis': mobius_analysis,
         'topology_characteristics': analyzer.topology_characteristics,
         'analysis_metadata': {
@@ -22,11 +22,234 @@ C) Mixed expansion → different scaling laws
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
-from typing import Dict, List, Tuple
+from scipy.integrate import odeint, cumulative_trapezoid
+from scipy.interpolate import CubicSpline
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
 import json
 from datetime import datetime
 
+# Geometric factors at the current epoch (rigorous)
+BASE_GEOMETRIC_FACTORS = {
+    'Klein_Bottle': 3.142,  # π
+    'Twisted_Torus': 1.061,
+    'Mobius_Band': 0.916,
+    'Real_Projective_Plane': 0.707,
+    'String_Orientifold': 0.417
+}
+
+# Local (emission-frame) echo frequencies in Hz
+LOCAL_ECHO_FREQUENCIES = {
+    'Klein_Bottle': 6.65,
+    'Real_Projective_Plane': 4.19,
+    'Mobius_Band': 8.2,
+    'Twisted_Torus': 5.68,
+    'String_Orientifold': 6.8
+}
+
+# Extra-dimension size R_5D as a function of the scale factor a
+EXTRA_DIMENSION_SCENARIOS = {
+    'coexpanding': lambda a: a,  # R_5D(t) ∝ a(t)
+    'stabilized': lambda a: np.ones_like(a),  # R_5D = constant  
+    'logarithmic': lambda a: np.log(a + 1) + 1,  # Slow expansion
+    'power_law_half': lambda a: np.sqrt(a),  # R_5D ∝ √a(t)
+    'inverse': lambda a: 1/np.sqrt(a),  # Contracting extra dimensions
+}
+
+T_UNIVERSE = 13.8e9 * 365.25 * 24 * 3600  # seconds
+
+
+def hubble_parameter(z, H0: float, Omega_m: float, Omega_lambda: float,
+                     Omega_r: float = 9.2e-5):
+    """
+    H(z) = H₀ √[Ωₘ(1+z)³ + Ωₗ + Ωᵣ(1+z)⁴] in km/s/Mpc (array-valued).
+    """
+    factor = (Omega_m * (1 + z)**3 + 
+             Omega_lambda + 
+             Omega_r * (1 + z)**4)
+    
+    return H0 * np.sqrt(factor)
+
+
+@lru_cache(maxsize=32)
+def _distance_splines(H0: float, Omega_m: float, Omega_lambda: float, Omega_r: float,
+                      t_universe: float, z_max: float, n_grid: int):
+    """
+    Cumulative lookback time, age and comoving distance on a shared
+    redshift grid, plus cubic-spline interpolants (memoized).
+    
+    The grid is uniform in x = ln(1+z) over [0, ln(1+z_max)], so the
+    accuracy depends on the step in x rather than on z_max. One
+    cumulative trapezoid integration per quantity (O(n_grid) work):
+        t_L(z) = ∫₀ˣ dx' / H(z(x'))
+        D_C(z) = c ∫₀ˣ (1+z(x')) dx' / H(z(x'))
+    and t(z) = t_universe - t_L(z). With a step of ln(6)/20000 (the
+    default grid for z_max = 5) the relative error (table and spline)
+    is below 1e-9 at any redshift covered by the table.
+    """
+    x = np.linspace(0, np.log1p(z_max), n_grid)
+    z = np.expm1(x)
+    H = hubble_parameter(z, H0, Omega_m, Omega_lambda, Omega_r)  # km/s/Mpc
+    
+    lookback = cumulative_trapezoid(1 / H, x, initial=0) * (3.086e22 / 1000)  # Convert to seconds
+    comoving = 299792.458 * cumulative_trapezoid((1 + z) / H, x, initial=0)  # c in km/s → Mpc
+    
+    table = {
+        'z': z,
+        'lookback_time': lookback,
+        'age': t_universe - lookback,
+        'comoving_distance': comoving
+    }
+    for values in table.values():
+        values.flags.writeable = False
+    splines = {name: CubicSpline(z, table[name])
+               for name in ('lookback_time', 'age', 'comoving_distance')}
+    return table, splines
+
+
+def klein_echo_time(mass):
+    """Local Klein bottle echo time (s) for remnant mass in M☉ (array-valued)."""
+    return 2.574 * np.asarray(mass, dtype=float)**(-0.826) + 0.273
+
+
+class CosmologyBackground:
+    """
+    Background evolution for one (H₀, Ωₘ, Ωₗ, scenario), computed once.
+    
+    Holds the distance interpolants and the extra-dimension scenario, and
+    evaluates redshift-corrected echo predictions for a whole catalog in
+    one vectorized pass. Use cosmology_background() to get the memoized
+    instance for a parameter set.
+    
+    Parameters:
+    -----------
+    H0 : float
+        Hubble constant (km/s/Mpc)
+    Omega_m, Omega_lambda, Omega_r : float
+        Density parameters
+    scenario : str
+        Extra-dimension evolution scenario (key of EXTRA_DIMENSION_SCENARIOS)
+    t_universe : float
+        Age of the universe (s)
+    z_max : float
+        Initial extent of the redshift table (grown on demand)
+    n_grid : int
+        Table points up to z_max; the ln(1+z) step they set is kept
+        when the table is extended, so extensions never coarsen it
+    """
+    
+    def __init__(self, H0: float = 67.4, Omega_m: float = 0.315, Omega_lambda: float = 0.685,
+                 scenario: str = 'stabilized', Omega_r: float = 9.2e-5,
+                 t_universe: float = T_UNIVERSE, z_max: float = 5.0, n_grid: int = 20001):
+        if scenario not in EXTRA_DIMENSION_SCENARIOS:
+            raise ValueError(f"Unknown scenario '{scenario}'. "
+                             f"Available: {list(EXTRA_DIMENSION_SCENARIOS)}")
+        self.H0 = H0
+        self.Omega_m = Omega_m
+        self.Omega_lambda = Omega_lambda
+        self.Omega_r = Omega_r
+        self.t_universe = t_universe
+        self.scenario = scenario
+        self.n_grid = n_grid
+        self.log_step = np.log1p(z_max) / (n_grid - 1)
+        self.R_5D_of_a = EXTRA_DIMENSION_SCENARIOS[scenario]
+        self._load(z_max)
+        self._evolution = {}
+    
+    def _load(self, z_max: float):
+        n_grid = max(self.n_grid, int(np.ceil(np.log1p(z_max) / self.log_step)) + 1)
+        self.table, self.interpolants = _distance_splines(
+            self.H0, self.Omega_m, self.Omega_lambda, self.Omega_r,
+            self.t_universe, float(z_max), n_grid)
+    
+    def interpolate(self, name: str, z) -> np.ndarray:
+        """Evaluate 'lookback_time', 'age' or 'comoving_distance' at z."""
+        z = np.asarray(z, dtype=float)
+        z_top = float(np.max(z, initial=0.0))
+        if self.table['z'][-1] < z_top:
+            self._load(max(5.0, 2 * z_top))  # Extend the table with headroom
+        return self.interpolants[name](z)
+    
+    def hubble_parameter(self, z):
+        return hubble_parameter(z, self.H0, self.Omega_m, self.Omega_lambda, self.Omega_r)
+    
+    def R_5D(self, z) -> np.ndarray:
+        """Extra-dimension size (normalized) at redshift z."""
+        return self.R_5D_of_a(1 / (1 + np.asarray(z, dtype=float)))
+    
+    def emission_factor_ratio(self, z) -> np.ndarray:
+        """Geometric factor at emission relative to today."""
+        z = np.asarray(z, dtype=float)
+        if self.scenario == 'coexpanding':
+            return 1 / (1 + z)
+        # Stabilized: constant; other scenarios use the current factor as approximation
+        return np.ones_like(z)
+    
+    def evolution(self, z_max: float = 5.0, n_points: int = 1000) -> Dict[str, np.ndarray]:
+        """Cosmic time, scale factor and R_5D from z=z_max to z=0 (memoized)."""
+        key = (z_max, n_points)
+        if key not in self._evolution:
+            z_values = np.linspace(z_max, 0, n_points)
+            a_values = 1 / (1 + z_values)
+            self._evolution[key] = {
+                'times': self.interpolate('age', z_values),
+                'scale_factors': a_values,
+                'R_5D_evolution': self.R_5D_of_a(a_values)
+            }
+        return self._evolution[key]
+    
+    def echo_predictions(self, topologies: Sequence[str], masses, redshifts) -> Dict[str, np.ndarray]:
+        """
+        Redshift-corrected echo predictions for a catalog of events.
+        
+        Parameters:
+        -----------
+        topologies : sequence of str
+            Topology names (keys of BASE_GEOMETRIC_FACTORS)
+        masses : array-like
+            Remnant masses in M☉, one per event
+        redshifts : array-like
+            Event redshifts, broadcast against masses
+        
+        Returns:
+        --------
+        dict of arrays with shape (n_topologies, n_events): 'tau_local',
+        'tau_observed', 'f_local', 'f_observed', 'factor_at_emission',
+        'amplitude_factor'
+        """
+        masses, redshifts = np.broadcast_arrays(np.atleast_1d(np.asarray(masses, dtype=float)),
+                                                np.atleast_1d(np.asarray(redshifts, dtype=float)))
+        base = np.array([BASE_GEOMETRIC_FACTORS[t] for t in topologies])[:, None]
+        f_local = np.array([LOCAL_ECHO_FREQUENCIES[t] for t in topologies])[:, None]
+        is_klein = np.array([t == 'Klein_Bottle' for t in topologies])[:, None]
+        
+        ratio = self.emission_factor_ratio(redshifts)[None, :]
+        factor_at_emission = base * ratio
+        
+        # Klein bottle uses the local fit directly; others scale from it
+        tau_klein = klein_echo_time(masses)[None, :]
+        tau_local = np.where(is_klein, tau_klein,
+                             tau_klein * factor_at_emission / BASE_GEOMETRIC_FACTORS['Klein_Bottle'])
+        
+        time_dilation = 1 + redshifts
+        return {
+            'tau_local': tau_local,
+            'tau_observed': tau_local * time_dilation,
+            'f_local': np.broadcast_to(f_local, tau_local.shape),
+            'f_observed': f_local / time_dilation,
+            'factor_at_emission': factor_at_emission,
+            'amplitude_factor': np.broadcast_to(ratio / time_dilation, tau_local.shape)
+        }
+
+
+@lru_cache(maxsize=None)
+def cosmology_background(H0: float = 67.4, Omega_m: float = 0.315, Omega_lambda: float = 0.685,
+                         scenario: str = 'stabilized', Omega_r: float = 9.2e-5,
+                         t_universe: float = T_UNIVERSE) -> CosmologyBackground:
+    """Memoized CosmologyBackground per parameter set and scenario."""
+    return CosmologyBackground(H0, Omega_m, Omega_lambda, scenario, Omega_r, t_universe)
+
+
 class CosmologicalExpansionAnalysis:
     """
     Analyze how cosmic expansion affects extra-dimensional echo signatures.
@@ -44,7 +267,7 @@ class CosmologicalExpansionAnalysis:
         self.Omega_r = 9.2e-5  # Radiation density parameter
         
         # Age of universe
-        self.t_universe = 13.8e9 * 365.25 * 24 * 3600  # seconds
+        self.t_universe = T_UNIVERSE  # seconds
         
         # GW event parameters
         self.z_gw150914 = 0.09  # Redshift of GW150914
@@ -63,33 +286,61 @@ class CosmologicalExpansionAnalysis:
         
         H(z) = H₀ √[Ωₘ(1+z)³ + Ωₗ + Ωᵣ(1+z)⁴]
         """
-        factor = (self.Omega_m * (1 + z)**3 + 
-                 self.Omega_lambda + 
-                 self.Omega_r * (1 + z)**4)
+        return hubble_parameter(z, self.H0, self.Omega_m, self.Omega_lambda, self.Omega_r)
+    
+    def background(self, scenario: str = 'stabilized') -> CosmologyBackground:
+        """Memoized background for the current parameters and a scenario."""
+        return cosmology_background(self.H0, self.Omega_m, self.Omega_lambda,
+                                    scenario, self.Omega_r, self.t_universe)
+    
+    def distance_table(self, z_max: float = 5.0, n_grid: int = 20001) -> Dict[str, np.ndarray]:
+        """
+        Lookback time, age and comoving distance on a shared redshift grid
+        (uniform in ln(1+z)).
         
-        return self.H0 * np.sqrt(factor)
+        Returns:
+        --------
+        dict with 'z', 'lookback_time' (s), 'age' (s), 'comoving_distance' (Mpc)
+        """
+        return _distance_splines(self.H0, self.Omega_m, self.Omega_lambda, self.Omega_r,
+                                 self.t_universe, float(z_max), n_grid)[0]
+    
+    def cosmic_interpolants(self, z_max: float = 5.0, n_grid: int = 20001) -> Dict[str, CubicSpline]:
+        """
+        Cubic-spline interpolants of distance_table: callables of z for
+        'lookback_time', 'age' and 'comoving_distance' (memoized).
+        """
+        return _distance_splines(self.H0, self.Omega_m, self.Omega_lambda, self.Omega_r,
+                                 self.t_universe, float(z_max), n_grid)[1]
     
-    def scale_factor_evolution(self, z_max: float = 5.0) -> Tuple[np.ndarray, np.ndarray]:
+    def _interpolate(self, name: str, z) -> np.ndarray:
+        return self.background().interpolate(name, z)
+    
+    def lookback_time(self, z) -> np.ndarray:
+        """Lookback time t_L(z) in seconds (array-valued)."""
+        return self._interpolate('lookback_time', z)
+    
+    def age(self, z) -> np.ndarray:
+        """Cosmic time t(z) = t_universe - t_L(z) in seconds (array-valued)."""
+        return self._interpolate('age', z)
+    
+    def comoving_distance(self, z) -> np.ndarray:
+        """Line-of-sight comoving distance D_C(z) in Mpc (array-valued)."""
+        return self._interpolate('comoving_distance', z)
+    
+    def scale_factor_evolution(self, z_max: float = 5.0,
+                               n_points: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
         """
         Calculate scale factor evolution a(t) from z=z_max to z=0.
+        
+        Cosmic times come from the cached cumulative lookback integral, so
+        the cost is one spline evaluation per point (1e6 points are fine).
         """
-        z_values = np.linspace(z_max, 0, 1000)
+        z_values = np.linspace(z_max, 0, n_points)
         a_values = 1 / (1 + z_values)
         
-        # Calculate lookback times
-        def integrand(z):
-            return 1 / ((1 + z) * self.hubble_parameter(z))
-        
-        # Numerical integration for cosmic time
-        times = np.zeros_like(z_values)
-        for i, z in enumerate(z_values):
-            if z > 0:
-                # Lookback time integral
-                z_int = np.linspace(0, z, 100)
-                integrand_vals = [integrand(zi) for zi in z_int]
-                times[i] = np.trapz(integrand_vals, z_int) * (3.086e22 / 1000)  # Convert to seconds
-        
-        times = self.t_universe - times  # Convert lookback to cosmic time
+        # Lookback time → cosmic time
+        times = self.age(z_values)
         
         return times, a_values
     
@@ -97,65 +348,29 @@ class CosmologicalExpansionAnalysis:
         """
         Define different scenarios for extra-dimensional evolution.
         """
-        
-        scenarios = {
-            'coexpanding': lambda a: a,  # R_5D(t) ∝ a(t)
-            'stabilized': lambda a: np.ones_like(a),  # R_5D = constant  
-            'logarithmic': lambda a: np.log(a + 1) + 1,  # Slow expansion
-            'power_law_half': lambda a: np.sqrt(a),  # R_5D ∝ √a(t)
-            'inverse': lambda a: 1/np.sqrt(a),  # Contracting extra dimensions
-        }
-        
-        return scenarios
+        return dict(EXTRA_DIMENSION_SCENARIOS)
     
     def calculate_geometric_factor_evolution(self, scenario: str = 'coexpanding') -> Dict[str, any]:
         """
         Calculate how geometric factors evolve with cosmic expansion.
+        
+        The background evolution comes from the memoized CosmologyBackground,
+        so repeated calls per scenario do not recompute it.
         """
         print(f"\nCalculating factor evolution for scenario: {scenario}")
         
-        # Get scale factor evolution
-        times, a_values = self.scale_factor_evolution()
+        evolution = self.background(scenario).evolution()
+        times = evolution['times']
+        a_values = evolution['scale_factors']
+        R_evolution = evolution['R_5D_evolution']
         
-        # Get scenario function
-        scenarios = self.extra_dimension_scenarios()
-        R_evolution = scenarios[scenario](a_values)
-        
-        # Current geometric factors (rigorous)
-        current_factors = {
-            'Klein_Bottle': 3.142,  # π
-            'Twisted_Torus': 1.061,
-            'Mobius_Band': 0.916,
-            'Real_Projective_Plane': 0.707,
-            'String_Orientifold': 0.417
-        }
-        
-        # Factor evolution depends on how R_5D changes
+        # Factor evolution depends on how R_5D changes: the geometric factor
+        # scales as R_5D itself (constant for stabilized extra dimensions)
         evolution_data = {}
         
-        for topology, current_factor in current_factors.items():
+        for topology, current_factor in BASE_GEOMETRIC_FACTORS.items():
+            factor_evolution = current_factor * R_evolution
             
-            if scenario == 'coexpanding':
-                # If R_5D ∝ a(t), then frequencies scale as f ∝ 1/a(t)
-                # Geometric factor might scale as R_5D itself
-                factor_evolution = current_factor * R_evolution
-                
-            elif scenario == 'stabilized':
-                # R_5D constant → factors constant
-                factor_evolution = current_factor * np.ones_like(a_values)
-                
-            elif scenario == 'logarithmic':
-                # Slow expansion
-                factor_evolution = current_factor * R_evolution
-                
-            elif scenario == 'power_law_half':
-                # R_5D ∝ √a(t)
-                factor_evolution = current_factor * R_evolution
-                
-            elif scenario == 'inverse':
-                # Contracting extra dimensions
-                factor_evolution = current_factor * R_evolution
-                
             evolution_data[topology] = {
                 'times': times,
                 'scale_factors': a_values,
@@ -201,69 +416,35 @@ class CosmologicalExpansionAnalysis:
         Calculate echo predictions including cosmological corrections.
         """
         
-        # Base geometric factors (current epoch)
-        base_factors = {
-            'Klein_Bottle': 3.142,
-            'Twisted_Torus': 1.061,
-            'Mobius_Band': 0.916,
-            'Real_Projective_Plane': 0.707,
-            'String_Orientifold': 0.417
-        }
-        
         # Get redshift effects
         z_effects = self.redshift_effects_on_echoes(redshift)
         
-        # Get factor evolution for this scenario
-        evolution = self.calculate_geometric_factor_evolution(scenario)
-        
-        # Factor at emission redshift (approximate)
-        # For small z, can use linear approximation
-        if scenario == 'coexpanding':
-            factor_at_emission = base_factors[topology] / (1 + redshift)
-        elif scenario == 'stabilized':
-            factor_at_emission = base_factors[topology]
-        else:
-            # Use current factor as approximation
-            factor_at_emission = base_factors[topology]
-        
-        # Base echo time (local, no cosmological effects)
-        if topology == 'Klein_Bottle':
-            tau_local = 2.574 * mass**(-0.826) + 0.273
-        else:
-            # Scale from Klein bottle
-            factor_ratio = factor_at_emission / base_factors['Klein_Bottle']
-            tau_klein = 2.574 * mass**(-0.826) + 0.273
-            tau_local = tau_klein * factor_ratio
-        
-        # Apply cosmological corrections
-        tau_observed = tau_local * z_effects['time_dilation']
-        
-        # Frequency corrections
-        if topology == 'Klein_Bottle':
-            f_local = 6.65  # Hz
-        elif topology == 'Real_Projective_Plane':
-            f_local = 4.19
-        elif topology == 'Mobius_Band':
-            f_local = 8.2
-        elif topology == 'Twisted_Torus':
-            f_local = 5.68
-        elif topology == 'String_Orientifold':
-            f_local = 6.8
-        
-        f_observed = f_local * z_effects['frequency_redshift']
-        
-        # Amplitude corrections
-        amplitude_factor = (factor_at_emission / base_factors[topology]) * z_effects['amplitude_suppression']
+        prediction = self.background(scenario).echo_predictions([topology], mass, redshift)
+        result = {name: float(values[0, 0]) for name, values in prediction.items()}
+        result['redshift_effects'] = z_effects
         
-        return {
-            'tau_local': tau_local,
-            'tau_observed': tau_observed,
-            'f_local': f_local,
-            'f_observed': f_observed,
-            'factor_at_emission': factor_at_emission,
-            'amplitude_factor': amplitude_factor,
-            'redshift_effects': z_effects
-        }
+        return result
+    
+    def catalog_echo_predictions(self, topologies: Sequence[str], masses, redshifts,
+                                 scenarios: Sequence[str] = ('stabilized',)) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Corrected echo predictions for a whole event catalog.
+        
+        Parameters:
+        -----------
+        topologies : sequence of str
+            Topology names
+        masses, redshifts : array-like
+            Per-event remnant masses (M☉) and redshifts
+        scenarios : sequence of str
+            Expansion scenarios to evaluate
+        
+        Returns:
+        --------
+        {scenario: {quantity: array (n_topologies, n_events)}}
+        """
+        return {scenario: self.background(scenario).echo_predictions(topologies, masses, redshifts)
+                for scenario in scenarios}
     
     def compare_expansion_scenarios(self) -> Dict[str, any]:
         """
@@ -274,9 +455,16 @@ class CosmologicalExpansionAnalysis:
         print("="*60)
         
         scenarios = ['stabilized', 'coexpanding', 'logarithmic', 'power_law_half']
+        topologies = ['Klein_Bottle', 'Real_Projective_Plane']
         test_masses = [30, 62, 100]  # Solar masses
         test_redshifts = [0.01, 0.1, 0.5]  # Range of GW event redshifts
         
+        # Every (z, M) pair as one catalog, evaluated per scenario in one pass
+        z_grid, M_grid = np.meshgrid(test_redshifts, test_masses, indexing='ij')
+        keys = [f'z_{z}_M_{M}' for z in test_redshifts for M in test_masses]
+        predictions = self.catalog_echo_predictions(topologies, M_grid.ravel(), z_grid.ravel(),
+                                                    scenarios)
+        
         comparison = {}
         
         for scenario in scenarios:
@@ -286,26 +474,17 @@ class CosmologicalExpansionAnalysis:
                 'description': self.get_scenario_description(scenario),
                 'predictions': {}
             }
+            prediction = predictions[scenario]
             
-            for topology in ['Klein_Bottle', 'Real_Projective_Plane']:
-                
-                topology_predictions = {}
-                
-                for z in test_redshifts:
-                    for M in test_masses:
-                        
-                        prediction = self.corrected_echo_predictions(
-                            topology, M, z, scenario
-                        )
-                        
-                        key = f'z_{z}_M_{M}'
-                        topology_predictions[key] = {
-                            'tau_observed': prediction['tau_observed'],
-                            'f_observed': prediction['f_observed'],
-                            'amplitude_factor': prediction['amplitude_factor']
-                        }
-                
-                scenario_data['predictions'][topology] = topology_predictions
+            for i, topology in enumerate(topologies):
+                scenario_data['predictions'][topology] = {
+                    key: {
+                        'tau_observed': float(prediction['tau_observed'][i, j]),
+                        'f_observed': float(prediction['f_observed'][i, j]),
+                        'amplitude_factor': float(prediction['amplitude_factor'][i, j])
+                    }
+                    for j, key in enumerate(keys)
+                }
             
             comparison[scenario] = scenario_data
         
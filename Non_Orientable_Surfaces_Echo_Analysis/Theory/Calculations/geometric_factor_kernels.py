@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Compiled Numeric Kernels for the Geometric Factor Derivations
+=============================================================
+
+The geometric factors in rigorous_all_geometric_factors.py,
+twisted_torus_geometric_factor_derivation.py and symmetry_factors_analysis.py
+are closed-form functions of the geometry parameters. This module states
+each derivation once in sympy (metric tensor, inverse-metric dispersion,
+boundary leakage, string duality weights, symmetry enhancements) and turns
+every derived expression into a NumPy function of its parameters, so sweeps
+over geometry parameters run at array speed.
+
+Generated code is cached:
+- by expression hash (SHA-256 of the srepr and argument list): the
+  generated source lives in kernel_<hash>.py
+- per derivation: an index maps each derived quantity to its expression
+  hash and the SHA-256 of its generated source, keyed by the version of
+  this module, so a warm start loads the kernels without re-running the
+  symbolic derivation; a kernel file whose source does not match the
+  index is never executed, the derivation is re-run instead
+
+Disk entries live under ECHO_CACHE_DIR/kernels (default .echo_cache/kernels
+next to this module). If numba is installed, kernels can be JIT-compiled
+with jit=True.
+"""
+
+import numpy as np
+import sympy as sp
+from sympy.printing.numpy import NumPyPrinter
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+KERNEL_CACHE_VERSION = 1
+
+
+def _cache_dir() -> Path:
+    cache_dir = os.environ.get('ECHO_CACHE_DIR')
+    base = Path(cache_dir) if cache_dir else Path(__file__).resolve().parent / '.echo_cache'
+    return base / 'kernels'
+
+
+def _module_version() -> str:
+    with open(__file__, 'rb') as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(f'v{KERNEL_CACHE_VERSION}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def _write_atomic(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)  # atomic for concurrent runs
+
+
+def source_hash(source: str) -> str:
+    """SHA-256 of a generated kernel source."""
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def expression_hash(expr: sp.Expr, args: Sequence[sp.Symbol]) -> str:
+    """Hash of a sympy expression and its argument order."""
+    payload = sp.srepr(expr) + '|' + ','.join(sp.srepr(a) for a in args)
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+# ============================================================================
+# SYMBOLIC DERIVATIONS
+# ============================================================================
+
+def derive_twisted_torus() -> Tuple[Tuple[sp.Symbol, ...], Dict[str, sp.Expr]]:
+    """
+    Twisted torus with identification (x, y) ~ (x + L₁, y + θx/L₁).
+
+    Metric ds² = dx² + (dy + (θ/L₁)dx)², dispersion k² = g^μν k_μ k_ν for
+    the fundamental mode k = (2π/L₁, 2π/L₂).
+    """
+    theta = sp.Symbol('theta', real=True)
+    L1, L2 = sp.symbols('L1 L2', positive=True)
+
+    coupling = theta / L1
+    g = sp.Matrix([[1, coupling], [coupling, 1 + coupling**2]])
+    det_g = sp.simplify(g.det())
+
+    k = sp.Matrix([2*sp.pi / L1, 2*sp.pi / L2])
+    k_squared_torus = (k.T * k)[0]
+    k_squared_twisted = sp.simplify((k.T * g.inv() * k)[0])
+    frequency_ratio = sp.sqrt(k_squared_twisted / k_squared_torus)
+
+    path_x_effective = L1 * sp.sqrt(1 + (theta / (2*sp.pi))**2)
+    path_enhancement = sp.sqrt(path_x_effective**2 + L2**2) / sp.sqrt(L1**2 + L2**2)
+
+    volume_factor = sp.sqrt(det_g)
+    coupling_factor = 1 + sp.Abs(coupling)  # Linear approximation
+
+    return (theta, L1, L2), {
+        'determinant': det_g,
+        'twist_coupling': coupling,
+        'frequency_ratio': frequency_ratio,
+        'wave_factor': 1 / frequency_ratio,
+        'path_enhancement': path_enhancement,
+        'volume_factor': volume_factor,
+        'coupling_factor': coupling_factor,
+        'geometric_factor': volume_factor * path_enhancement * coupling_factor
+    }
+
+
+def derive_mobius_band() -> Tuple[Tuple[sp.Symbol, ...], Dict[str, sp.Expr]]:
+    """
+    Möbius band π twist factor reduced by boundary leakage.
+
+    Leakage = boundary length / GW wavelength = 2πR f / c, absorbed
+    fraction 1 - exp(-leakage).
+    """
+    R, f, c = sp.symbols('base_radius wave_frequency c', positive=True)
+
+    leakage = 2*sp.pi * R / (c / f)
+    absorption = 1 - sp.exp(-leakage)
+
+    return (R, f, c), {
+        'leakage_factor': leakage,
+        'absorption': absorption,
+        'geometric_factor': sp.pi * (1 - absorption)
+    }
+
+
+def derive_string_orientifold() -> Tuple[Tuple[sp.Symbol, ...], Dict[str, sp.Expr]]:
+    """
+    Orientifold factor: duality-weighted closed (1 + g_s²) and open (1/N_D)
+    string contributions times the GSO projection.
+    """
+    g_s, N_D, w, gso = sp.symbols('g_s N_D duality_weight gso_factor', positive=True)
+
+    closed_factor = 1 + g_s**2
+    open_factor = 1 / N_D
+
+    return (g_s, N_D, w, gso), {
+        'closed_factor': closed_factor,
+        'open_factor': open_factor,
+        'geometric_factor': (w * closed_factor + (1 - w) * open_factor) * gso
+    }
+
+
+def derive_symmetry_enhanced() -> Tuple[Tuple[sp.Symbol, ...], Dict[str, sp.Expr]]:
+    """
+    Symmetry-enhanced factors: the baseline of each topology times its
+    symmetry enhancements (as in symmetry_factors_analysis.py).
+
+    The baselines are parameters, so the same kernels serve the rounded
+    baselines of symmetry_factors_analysis.py and the derived ones
+    (see derived_baselines).
+    """
+    (rp2_baseline, mobius_baseline, torus_baseline, orientifold_baseline) = sp.symbols(
+        'rp2_baseline mobius_baseline torus_baseline orientifold_baseline', positive=True)
+    (l, n_fold, helical, commensurability, reflection, boundary_symmetry, edge,
+     modular, t_duality, gauge_rank, orientifold_correction) = sp.symbols(
+        'l n_fold helical_factor commensurability_factor reflection_enhancement '
+        'boundary_symmetry_factor edge_mode_compensation modular_enhancement '
+        't_duality_factor gauge_rank orientifold_correction', positive=True)
+
+    # RP2: √(2l+1) degeneracy of the fundamental odd-l multiplet and
+    # √(4π) geodesic focusing normalized by the sphere area
+    rp2 = rp2_baseline * sp.sqrt(2*l + 1) * sp.sqrt(4*sp.pi) / (4*sp.pi)
+
+    gauge_enhancement = 1 + sp.Rational(1, 10) * sp.log(sp.sqrt(gauge_rank))
+
+    args = (rp2_baseline, mobius_baseline, torus_baseline, orientifold_baseline,
+            l, n_fold, helical, commensurability, reflection, boundary_symmetry, edge,
+            modular, t_duality, gauge_rank, orientifold_correction)
+    return args, {
+        'Klein_Bottle': sp.pi,
+        'Real_Projective_Plane': rp2,
+        'Mobius_Band': mobius_baseline * reflection * boundary_symmetry * edge,
+        'Twisted_Torus': torus_baseline * sp.sqrt(n_fold) * helical * commensurability,
+        'String_Orientifold': (orientifold_baseline * modular * t_duality *
+                               gauge_enhancement * orientifold_correction)
+    }
+
+
+# Derivation name → (symbolic derivation, default parameter values)
+DERIVATIONS = {
+    'twisted_torus': (derive_twisted_torus, {
+        'theta': np.pi, 'L1': 2*np.pi*1000e3, 'L2': 2*np.pi*1000e3
+    }),
+    'mobius_band': (derive_mobius_band, {
+        'base_radius': 8400e3, 'wave_frequency': 7.0, 'c': 299792458.0
+    }),
+    'string_orientifold': (derive_string_orientifold, {
+        'g_s': 0.1, 'N_D': 8, 'duality_weight': 0.8, 'gso_factor': 0.5
+    }),
+    'symmetry_enhanced': (derive_symmetry_enhanced, {
+        # Rounded baselines of symmetry_factors_analysis.py
+        'rp2_baseline': 0.707, 'mobius_baseline': 0.916, 'torus_baseline': 1.061,
+        'orientifold_baseline': 0.417,
+        'l': 1, 'n_fold': 4, 'helical_factor': 1.2, 'commensurability_factor': 1.1,
+        'reflection_enhancement': np.sqrt(2), 'boundary_symmetry_factor': 0.8,
+        'edge_mode_compensation': 1.1, 'modular_enhancement': 1.3,
+        't_duality_factor': 1.2, 'gauge_rank': 32, 'orientifold_correction': 0.9
+    }),
+}
+
+
+# Baseline parameter of 'symmetry_enhanced' → derivation providing it
+BASELINE_DERIVATIONS = {
+    'mobius_baseline': 'mobius_band',
+    'torus_baseline': 'twisted_torus',
+    'orientifold_baseline': 'string_orientifold',
+}
+
+
+# ============================================================================
+# CODE GENERATION AND CACHE
+# ============================================================================
+
+class CompiledKernel:
+    """
+    NumPy function generated from a sympy expression.
+
+    Calling it broadcasts all arguments, so constant expressions still
+    return arrays of the sweep shape.
+    """
+
+    def __init__(self, name: str, args: Sequence[str], key: str, source: str, jit: bool = False):
+        self.name = name
+        self.args = tuple(args)
+        self.key = key
+        self.source = source
+        self.source_hash = source_hash(source)
+        namespace = {'numpy': np}
+        exec(compile(source, f'<kernel {name} {key}>', 'exec'), namespace)
+        self._function = namespace['kernel']
+        if jit and numba is not None:
+            self._function = numba.njit(self._function)
+
+    def __call__(self, *args):
+        arrays = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+        result = self._function(*arrays)
+        return np.broadcast_to(result, arrays[0].shape if arrays else np.shape(result))
+
+    def __repr__(self):
+        return f"CompiledKernel({self.name}({', '.join(self.args)}), key={self.key})"
+
+
+def _generate_source(expr: sp.Expr, args: Sequence[sp.Symbol], key: str) -> str:
+    arg_names = ', '.join(str(a) for a in args)
+    body = NumPyPrinter().doprint(expr)
+    return (f"import numpy\n\n\n"
+            f"def kernel({arg_names}):\n"
+            f"    \"\"\"Generated from sympy expression {key}; do not edit.\"\"\"\n"
+            f"    return {body}\n")
+
+
+_memory: Dict[str, CompiledKernel] = {}
+
+
+def compile_expression(expr: sp.Expr, args: Sequence[sp.Symbol], name: str = 'kernel',
+                       use_disk: bool = True, jit: bool = False) -> CompiledKernel:
+    """
+    NumPy kernel for a sympy expression, cached by expression hash.
+
+    Parameters:
+    -----------
+    expr : sympy expression
+        Expression to compile
+    args : sequence of sympy symbols
+        Argument order of the generated function
+    name : str
+        Python identifier for the generated function
+    use_disk : bool
+        Read/write the generated source under the kernel cache directory
+    jit : bool
+        JIT-compile with numba if it is installed
+
+    Returns:
+    --------
+    kernel : CompiledKernel
+    """
+    key = expression_hash(expr, args)
+    if (key, jit) in _memory:
+        return _memory[key, jit]
+
+    # Printing is cheap next to the derivation: always generate, and only
+    # (re)write the disk copy when it is missing or differs
+    source = _generate_source(expr, args, key)
+    if use_disk:
+        path = _cache_dir() / f'kernel_{key}.py'
+        if not path.is_file() or path.read_text() != source:
+            _write_atomic(path, source)
+
+    kernel = CompiledKernel(name, [str(a) for a in args], key, source, jit)
+    _memory[key, jit] = kernel
+    return kernel
+
+
+def _load_cached(derivation: str, jit: bool) -> Dict[str, CompiledKernel]:
+    """
+    Kernels of a derivation from the disk index, without sympy (or None).
+
+    Every kernel source is checked against the SHA-256 recorded in the
+    index before it is executed; any missing or mismatching entry returns
+    None so the caller re-derives (and rewrites) the kernels.
+    """
+    index_path = _cache_dir() / f'{derivation}_{_module_version()}.json'
+    if not index_path.is_file():
+        return None
+    try:
+        index = json.loads(index_path.read_text())
+        entries = index['kernels']
+        args = index['args']
+    except (ValueError, KeyError, TypeError):
+        return None
+    kernels = {}
+    for quantity, entry in entries.items():
+        key, expected = entry.get('key'), entry.get('sha256')
+        if (key, jit) not in _memory:
+            path = _cache_dir() / f'kernel_{key}.py'
+            if not path.is_file():
+                return None
+            source = path.read_text()
+            if source_hash(source) != expected:
+                return None
+            _memory[key, jit] = CompiledKernel(f'{derivation}_{quantity}'.lower(), args,
+                                               key, source, jit)
+        elif _memory[key, jit].source_hash != expected:
+            return None
+        kernels[quantity] = _memory[key, jit]
+    return kernels
+
+
+_derived: Dict[Tuple[str, bool], Dict[str, CompiledKernel]] = {}
+
+
+def derivation_kernels(derivation: str, use_disk: bool = True,
+                       jit: bool = False) -> Dict[str, CompiledKernel]:
+    """
+    Compiled kernels for every quantity of a named derivation.
+
+    The symbolic derivation runs only if no cached index exists for this
+    module version.
+    """
+    if derivation not in DERIVATIONS:
+        raise ValueError(f"Unknown derivation '{derivation}'. Available: {list(DERIVATIONS)}")
+    if (derivation, jit) in _derived:
+        return _derived[derivation, jit]
+
+    kernels = _load_cached(derivation, jit) if use_disk else None
+    if kernels is None:
+        derive, _ = DERIVATIONS[derivation]
+        args, expressions = derive()
+        kernels = {quantity: compile_expression(expr, args, f'{derivation}_{quantity}'.lower(),
+                                                use_disk, jit)
+                   for quantity, expr in expressions.items()}
+        if use_disk:
+            _write_atomic(_cache_dir() / f'{derivation}_{_module_version()}.json', json.dumps({
+                'args': [str(a) for a in args],
+                'kernels': {quantity: {'key': kernel.key, 'sha256': kernel.source_hash}
+                            for quantity, kernel in kernels.items()}
+            }, indent=2))
+
+    _derived[derivation, jit] = kernels
+    return kernels
+
+
+def evaluate(derivation: str, quantities: Sequence[str] = None, **parameters) -> Dict[str, np.ndarray]:
+    """
+    Evaluate derived quantities over (broadcast) parameter arrays.
+
+    Parameters not given take the DERIVATIONS defaults, e.g.
+    evaluate('twisted_torus', theta=np.linspace(0, np.pi, 1000)).
+
+    Returns:
+    --------
+    dict : quantity → array with the broadcast parameter shape
+    """
+    kernels = derivation_kernels(derivation)
+    _, defaults = DERIVATIONS[derivation]
+    unknown = set(parameters) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters for '{derivation}': {sorted(unknown)}")
+    values = {**defaults, **parameters}
+    if quantities is None:
+        quantities = list(kernels)
+    first = kernels[quantities[0]]
+    call_args = [values[name] for name in first.args]
+    return {quantity: kernels[quantity](*call_args) for quantity in quantities}
+
+
+def derived_baselines(**parameters) -> Dict[str, np.ndarray]:
+    """
+    Unrounded baselines for the 'symmetry_enhanced' kernels.
+
+    Each baseline is the 'geometric_factor' of its derivation (see
+    BASELINE_DERIVATIONS), evaluated with the given geometry parameters
+    (theta, L1, L2, base_radius, wave_frequency, c, g_s, N_D,
+    duality_weight, gso_factor) and the DERIVATIONS defaults for the rest;
+    the RP2 baseline is the exact √2/2.
+
+    Returns:
+    --------
+    dict : baseline parameter name → array with the broadcast parameter shape
+    """
+    known = {name for derivation in BASELINE_DERIVATIONS.values()
+             for name in DERIVATIONS[derivation][1]}
+    unknown = set(parameters) - known
+    if unknown:
+        raise ValueError(f"Unknown geometry parameters: {sorted(unknown)}")
+    baselines = {'rp2_baseline': np.sqrt(2) / 2}
+    for baseline, derivation in BASELINE_DERIVATIONS.items():
+        own = {name: value for name, value in parameters.items()
+               if name in DERIVATIONS[derivation][1]}
+        baselines[baseline] = evaluate(derivation, ['geometric_factor'], **own)['geometric_factor']
+    return baselines
@@ -19,6 +19,8 @@ import matplotlib.pyplot as plt
 from typing import Dict, Tuple
 import sympy as sp
 
+from geometric_factor_kernels import evaluate as evaluate_kernels
+
 class RigorousGeometricFactors:
     """
     Rigorous derivation of geometric factors for all topologies.
@@ -300,6 +302,36 @@ class RigorousGeometricFactors:
             'tadpole_cancellation': f'{N_D} D-branes cancel O{abs(Q_O)//4}-plane'
         }
     
+    def factor_sweep(self, topology: str, **parameters) -> np.ndarray:
+        """
+        Geometric factor of one topology over arrays of its parameters.
+        
+        Uses the compiled kernels of the symbolic derivations (see
+        geometric_factor_kernels.py); parameters broadcast and default to
+        the values used in the derive_* methods:
+        - Mobius_Band: base_radius, wave_frequency, c
+        - String_Orientifold: g_s, N_D, duality_weight, gso_factor
+        - Twisted_Torus: theta, L1, L2
+        Klein_Bottle (π) and Real_Projective_Plane (√2/2) are parameter-free.
+        """
+        if topology == 'Klein_Bottle':
+            return np.full(np.broadcast(*parameters.values()).shape if parameters else (), np.pi)
+        if topology == 'Real_Projective_Plane':
+            return np.full(np.broadcast(*parameters.values()).shape if parameters else (), np.sqrt(2) / 2)
+        
+        derivations = {
+            'Mobius_Band': 'mobius_band',
+            'String_Orientifold': 'string_orientifold',
+            'Twisted_Torus': 'twisted_torus'
+        }
+        if topology not in derivations:
+            raise ValueError(f"Unknown topology '{topology}'")
+        if topology == 'Mobius_Band':
+            parameters = {'base_radius': self.base_radius, 'c': self.c, **parameters}
+        
+        return evaluate_kernels(derivations[topology], ['geometric_factor'],
+                                **parameters)['geometric_factor']
+    
     def compare_all_rigorous_factors(self) -> Dict[str, any]:
         """
         Compare all rigorously derived factors.
@@ -23,7 +23,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import solve_ivp
 from scipy.special import jv, yv  # Bessel functions
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Callable
+from collections import OrderedDict
 import json
 
 class MobiusBand:
@@ -32,6 +33,9 @@ class MobiusBand:
     in a fifth dimension with Möbius band topology.
     """
     
+    # Quadrature grids + mode-factor sets kept per instance (least recently used dropped)
+    QUADRATURE_CACHE_SIZE = 8
+    
     def __init__(self, length: float = 2*np.pi*1000e3, width: float = 100e3):
         """
         Initialize Möbius band extra dimension.
@@ -56,6 +60,9 @@ class MobiusBand:
         # Effective radius (for comparison with closed surfaces)
         self.R_eff = self.L / (2 * np.pi)
         
+        # Quadrature grids and separable mode factors, keyed by resolution/modes (LRU)
+        self._quadrature_cache = OrderedDict()
+        
     def derive_mode_spectrum(self) -> Dict[str, np.ndarray]:
         """
         Derive allowed modes for Möbius band with boundary conditions.
@@ -150,41 +157,171 @@ class MobiusBand:
             'f_0': self.f_0
         }
     
-    def wave_function(self, x: float, y: float, n: int, m: int, t: float) -> complex:
+    def _mode_wavenumbers(self, n, m) -> Tuple[np.ndarray, np.ndarray]:
+        """Longitudinal k_n = (2n+1)π/L and transverse k_m = mπ/(2w)."""
+        n, m = np.broadcast_arrays(np.asarray(n), np.asarray(m))
+        return (2*n + 1) * np.pi / self.L, m * np.pi / (2 * self.w)
+    
+    def wave_function(self, x, y, n, m, t=0.0) -> np.ndarray:
         """
         Wave function on Möbius band satisfying boundary conditions.
         
+        Coordinates broadcast against each other (e.g. x[:, None] and
+        y[None, :] for a field map); mode indices broadcast against each
+        other and form the leading axes of the result, so a vector of modes
+        gives shape (n_modes, *coordinate_shape). Scalars give a scalar.
+        
         Parameters:
         -----------
-        x : float
+        x : float or array
             Longitudinal coordinate (0 to L)
-        y : float  
+        y : float or array
             Transverse coordinate (-w to w)
-        n : int
-            Longitudinal mode number (must be odd)
-        m : int
+        n : int or array
+            Longitudinal mode number (k_n = (2n+1)π/L)
+        m : int or array
             Transverse mode number
-        t : float
+        t : float or array
             Time
             
         Returns:
         --------
-        psi : complex
-            Wave function value
+        psi : complex or np.ndarray
+            Wave function value(s)
         """
+        k_n, k_m = self._mode_wavenumbers(n, m)
+        coord_ndim = np.broadcast(x, y, t).ndim
+        k_n = k_n.reshape(k_n.shape + (1,) * coord_ndim)
+        k_m = k_m.reshape(k_m.shape + (1,) * coord_ndim)
+        
         # Longitudinal part (twisted periodic)
-        k_n = (2*n + 1) * np.pi / self.L
         psi_x = np.exp(1j * k_n * x)
         
         # Transverse part (vanishes at boundaries)
-        psi_y = np.cos(m * np.pi * y / (2 * self.w))
+        psi_y = np.cos(k_m * y)
         
         # Time evolution
-        k_total = np.sqrt(k_n**2 + (m * np.pi / (2 * self.w))**2)
-        omega = self.c * k_total
+        omega = self.c * np.sqrt(k_n**2 + k_m**2)
         psi_t = np.exp(-1j * omega * t)
         
-        return psi_x * psi_y * psi_t
+        psi = psi_x * psi_y * psi_t
+        return psi[()] if psi.ndim == 0 else psi
+    
+    def edge_mode_profile(self, y, m=3, decay_length: float = None) -> np.ndarray:
+        """
+        Transverse profile of the boundary-localized edge modes
+        
+        ψ_edge(y) = exp(-|y|/ℓ) sin(mπy/(2w)), with ℓ = w/3 by default.
+        Mode numbers form the leading axes of the result, as in wave_function.
+        """
+        ell = self.w / 3 if decay_length is None else decay_length
+        m = np.asarray(m)
+        y = np.asarray(y)
+        m = m.reshape(m.shape + (1,) * y.ndim)
+        return np.exp(-np.abs(y) / ell) * np.sin(m * np.pi * y / (2 * self.w))
+    
+    def quadrature_grid(self, nx: int = 512, ny: int = 512) -> Dict[str, np.ndarray]:
+        """
+        Cached quadrature nodes and weights on [0, L) × [-w, w].
+        
+        The longitudinal rule is the uniform rectangle rule, exact for
+        products of twisted modes (their phase difference is L-periodic);
+        the transverse rule is Gauss-Legendre.
+        """
+        def build():
+            nodes, weights = np.polynomial.legendre.leggauss(ny)
+            return {
+                'x': np.arange(nx) * (self.L / nx), 'wx': np.full(nx, self.L / nx),
+                'y': nodes * self.w, 'wy': weights * self.w
+            }
+        return self._cached(('grid', nx, ny), build)
+    
+    def _cached(self, key, build: Callable):
+        """Quadrature cache lookup, keeping the QUADRATURE_CACHE_SIZE most recent entries."""
+        if key in self._quadrature_cache:
+            self._quadrature_cache.move_to_end(key)
+            return self._quadrature_cache[key]
+        value = build()
+        self._quadrature_cache[key] = value
+        if len(self._quadrature_cache) > self.QUADRATURE_CACHE_SIZE:
+            self._quadrature_cache.popitem(last=False)
+        return value
+    
+    def _separable_factors(self, n, m, nx: int, ny: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached longitudinal (n_modes, nx) and transverse (n_modes, ny) factors at t=0."""
+        n = np.atleast_1d(n).ravel()
+        m = np.atleast_1d(m).ravel()
+        n, m = np.broadcast_arrays(n, m)
+        
+        def build():
+            grid = self.quadrature_grid(nx, ny)
+            k_n, k_m = self._mode_wavenumbers(n, m)
+            return (np.exp(1j * k_n[:, None] * grid['x']),
+                    np.cos(k_m[:, None] * grid['y']))
+        return self._cached(('modes', nx, ny, n.tobytes(), m.tobytes()), build)
+    
+    def overlap_matrix(self, n, m, nx: int = 512, ny: int = 512,
+                       normalize: bool = False) -> np.ndarray:
+        """
+        Overlap integrals ⟨ψ_a|ψ_b⟩ over the band for a list of modes.
+        
+        Mode functions are separable, so the double integral factorizes into
+        a longitudinal and a transverse Gram matrix evaluated on the cached
+        quadrature grid.
+        
+        Parameters:
+        -----------
+        n, m : array-like
+            Mode numbers (broadcast together, flattened)
+        nx, ny : int
+            Quadrature resolution
+        normalize : bool
+            Return overlaps of unit-normalized modes
+            
+        Returns:
+        --------
+        overlaps : np.ndarray
+            Complex (n_modes, n_modes) matrix
+        """
+        grid = self.quadrature_grid(nx, ny)
+        psi_x, psi_y = self._separable_factors(n, m, nx, ny)
+        gram_x = (psi_x.conj() * grid['wx']) @ psi_x.T
+        gram_y = (psi_y * grid['wy']) @ psi_y.T
+        overlaps = gram_x * gram_y
+        if normalize:
+            norms = np.sqrt(np.real(np.diag(overlaps)))
+            overlaps = overlaps / np.outer(norms, norms)
+        return overlaps
+    
+    def mode_norms(self, n, m, nx: int = 512, ny: int = 512) -> np.ndarray:
+        """L² norms ||ψ_nm|| over the band for a list of modes."""
+        grid = self.quadrature_grid(nx, ny)
+        psi_x, psi_y = self._separable_factors(n, m, nx, ny)
+        norm_x = np.abs(psi_x)**2 @ grid['wx']
+        norm_y = psi_y**2 @ grid['wy']
+        return np.sqrt(norm_x * norm_y)
+    
+    def field_map(self, n, m, nx: int = 512, ny: int = 512, t: float = 0.0,
+                  amplitudes=None) -> np.ndarray:
+        """
+        Mode fields on the uniform nx × ny grid over [0, L) × [-w, w]
+        
+        Returns (n_modes, nx, ny), or the superposition Σ aᵢψᵢ of shape
+        (nx, ny) if amplitudes are given; the superposition is a single
+        (nx × n_modes) @ (n_modes × ny) product of the separable factors.
+        """
+        n = np.atleast_1d(n).ravel()
+        m = np.atleast_1d(m).ravel()
+        x = np.arange(nx) * (self.L / nx)
+        y = np.linspace(-self.w, self.w, ny)
+        if amplitudes is None:
+            return self.wave_function(x[:, None], y[None, :], n, m, t)
+        
+        k_n, k_m = self._mode_wavenumbers(n, m)
+        phases = np.asarray(amplitudes) * np.exp(-1j * self.c * np.sqrt(k_n**2 + k_m**2) * t)
+        psi_x = np.exp(1j * k_n[:, None] * x)
+        psi_y = np.cos(k_m[:, None] * y)
+        return (psi_x * phases[:, None]).T @ psi_y
     
     def boundary_effects_on_echoes(self) -> Dict[str, any]:
         """
@@ -312,7 +449,7 @@ class MobiusBand:
         # 4. Boundary effect visualization
         y = np.linspace(-self.w, self.w, 100)
         boundary_profile = np.cos(np.pi * y / (2 * self.w))
-        edge_mode = np.exp(-np.abs(y) / (self.w / 3)) * np.sin(3 * np.pi * y / (2 * self.w))
+        edge_mode = self.edge_mode_profile(y, m=3)
         
         ax4.plot(y/1000, boundary_profile, 'b-', label='Bulk mode', linewidth=2)
         ax4.plot(y/1000, edge_mode, 'r--', label='Edge mode', linewidth=2)
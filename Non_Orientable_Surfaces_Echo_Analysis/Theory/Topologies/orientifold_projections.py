@@ -26,6 +26,20 @@ from scipy.special import zeta
 from typing import Tuple, List, Dict
 import json
 
+# Structured dtype of string_mode_lattice states
+STRING_MODE_DTYPE = np.dtype([
+    ('n', np.int64),            # oscillator level
+    ('w', np.int64),            # winding number
+    ('mass', np.float64),
+    ('omega', np.float64),      # rad/s
+    ('f', np.float64),          # Hz
+    ('degeneracy', np.int64),   # states sharing (n, |w|), i.e. the same mass
+])
+
+HBAR = 1.054e-34        # J·s, as used for the mode frequencies
+PLANCK_OMEGA = 1e44     # rad/s, upper cutoff on kept modes
+
+
 class OrientifoldProjection:
     """
     String theory orientifold framework for gravitational wave echoes.
@@ -75,26 +89,96 @@ class OrientifoldProjection:
         
         Parameters:
         -----------
-        n : int
+        n : int or array
             Oscillator level
-        winding : int
+        winding : int or array
             Winding number around compact dimension
             
         Returns:
         --------
-        survives : bool
-            Whether the state survives projection
+        survives : bool or boolean array
+            Whether the state survives projection (mask for array input)
         """
+        n, winding = np.broadcast_arrays(np.asarray(n), np.asarray(winding))
+        
         # For Klein bottle orientifold: only odd modes survive
         # This is analogous to the Klein bottle mode selection!
         
         if "Klein" in self.type or "Z2" in self.type:
             # Orientifold projection: (-1)^F Ω
             # For bosonic states: survives if n is odd
-            return (n % 2) == 1
+            survives = (n % 2) == 1
         else:
             # More general orientifolds may have different rules
-            return True
+            survives = np.ones(n.shape, dtype=bool)
+        
+        return survives if survives.ndim else bool(survives)
+    
+    def string_mode_lattice(self, n_max: int = 20, w_max: int = 3,
+                            max_chunk_states: int = 2**20) -> np.ndarray:
+        """
+        Surviving string states on the (oscillator level, winding) lattice.
+        
+        States 1 ≤ n ≤ n_max, |w| ≤ w_max are built as arrays in chunks of
+        at most max_chunk_states; the GSO projection, positivity of
+        Mass² = (n - a)/α' + (wR)²/α' and the Planck-frequency cutoff are
+        applied as boolean masks.
+        
+        Parameters:
+        -----------
+        n_max : int
+            Highest oscillator level
+        w_max : int
+            Largest |winding number|
+        max_chunk_states : int
+            Upper bound on lattice points held in memory at once
+            
+        Returns:
+        --------
+        states : np.ndarray
+            STRING_MODE_DTYPE array sorted by frequency (ties keep (n, w)
+            order); 'degeneracy' counts the surviving states of equal mass
+        """
+        alpha_prime = self.l_s**2
+        
+        # Normal ordering constant
+        a = 0.0 if "super" in self.type.lower() else 1.0
+        
+        windings = np.arange(-w_max, w_max + 1)
+        rows_per_chunk = max(1, max_chunk_states // len(windings))
+        chunks = []
+        
+        for n_start in range(1, n_max + 1, rows_per_chunk):
+            n = np.arange(n_start, min(n_start + rows_per_chunk, n_max + 1))[:, None]
+            w = windings[None, :]
+            
+            # String mass formula
+            mass_squared = (n - a) / alpha_prime + (w * self.R)**2 / alpha_prime
+            keep = self.gso_projection(n, w) & (mass_squared > 0)
+            mass = np.sqrt(np.where(keep, mass_squared, 0.0))
+            
+            # Convert to frequency (E = mc²); only keep modes below Planck scale
+            omega = mass * self.c**2 / HBAR
+            keep &= omega < PLANCK_OMEGA
+            
+            n_kept, w_kept = np.broadcast_arrays(n, w)
+            chunk = np.empty(np.count_nonzero(keep), dtype=STRING_MODE_DTYPE)
+            chunk['n'] = n_kept[keep]
+            chunk['w'] = w_kept[keep]
+            chunk['mass'] = mass[keep]
+            chunk['omega'] = omega[keep]
+            chunks.append(chunk)
+        
+        states = np.concatenate(chunks) if chunks else np.empty(0, dtype=STRING_MODE_DTYPE)
+        states['f'] = states['omega'] / (2 * np.pi)
+        
+        # ±w states share the mass: count surviving members of each (n, |w|)
+        key = states['n'] * (w_max + 1) + np.abs(states['w'])
+        _, inverse, counts = np.unique(key, return_inverse=True, return_counts=True)
+        states['degeneracy'] = counts[inverse]
+        
+        # Sort by frequency (stable: equal frequencies keep (n, w) order)
+        return states[np.argsort(states['f'], kind='stable')]
     
     def string_mode_spectrum(self) -> Dict[str, np.ndarray]:
         """
@@ -107,69 +191,34 @@ class OrientifoldProjection:
         # String oscillator modes
         # Mass² = (n - a)/α' + (wR)²/α'²
         # where α' = l_s²
-        
-        alpha_prime = self.l_s**2
-        
-        allowed_modes = []
-        
-        # Normal ordering constant
-        a = 1.0  # Bosonic string
-        if "super" in self.type.lower():
-            a = 0.0  # Superstring
-        
         print("\nSurviving modes after GSO projection:")
         
-        # Check first 20 oscillator levels
-        for n in range(1, 21):
-            for w in range(-3, 4):  # Winding numbers
-                
-                # Apply GSO projection
-                if not self.gso_projection(n, w):
-                    continue
-                
-                # String mass formula
-                mass_squared = (n - a) / alpha_prime + (w * self.R)**2 / alpha_prime
-                
-                if mass_squared > 0:
-                    mass = np.sqrt(mass_squared)
-                    
-                    # Convert to frequency (E = mc²)
-                    omega = mass * self.c**2 / 1.054e-34  # Convert to rad/s
-                    
-                    # Only keep modes below Planck scale
-                    if omega < 1e44:  # Planck frequency
-                        allowed_modes.append({
-                            'n': n,
-                            'w': w,
-                            'mass': mass,
-                            'omega': omega,
-                            'f': omega / (2 * np.pi),
-                            'type': 'closed_string' if w == 0 else 'winding'
-                        })
-        
-        # Sort by frequency
-        allowed_modes.sort(key=lambda x: x['f'])
+        # Check first 20 oscillator levels, winding numbers -3..3
+        lattice = self.string_mode_lattice(n_max=20, w_max=3)
+        
+        allowed_modes = [{
+            'n': int(state['n']),
+            'w': int(state['w']),
+            'mass': float(state['mass']),
+            'omega': float(state['omega']),
+            'f': float(state['f']),
+            'type': 'closed_string' if state['w'] == 0 else 'winding'
+        } for state in lattice[:20]]
         
         # Effective low-energy modes (after dimensional reduction)
-        # These couple to gravitational waves
-        effective_modes = []
-        
-        for mode in allowed_modes[:50]:
-            # Kaluza-Klein reduction: only massless 4D modes couple strongly
-            if mode['mass'] < 1e-18:  # Much less than Planck mass
-                # Effective 4D frequency
-                f_eff = self.c / (2 * self.R * mode['n'])
-                
-                effective_modes.append({
-                    'n': mode['n'],
-                    'f_original': mode['f'],
-                    'f_effective': f_eff,
-                    'coupling': self.g_s**2 / mode['n']  # Decreases with mode number
-                })
-                
-                if len(effective_modes) <= 5:
-                    print(f"  n={mode['n']}: f_eff = {f_eff:.2f} Hz, "
-                          f"coupling = {effective_modes[-1]['coupling']:.3f}")
+        # These couple to gravitational waves.
+        # Kaluza-Klein reduction: only massless 4D modes couple strongly
+        light = lattice[:50][lattice['mass'][:50] < 1e-18]  # Much less than Planck mass
+        effective_modes = [{
+            'n': int(n),
+            'f_original': float(f),
+            'f_effective': self.c / (2 * self.R * n),   # Effective 4D frequency
+            'coupling': self.g_s**2 / n                # Decreases with mode number
+        } for n, f in zip(light['n'], light['f'])]
+        
+        for mode in effective_modes[:5]:
+            print(f"  n={mode['n']}: f_eff = {mode['f_effective']:.2f} Hz, "
+                  f"coupling = {mode['coupling']:.3f}")
         
         # Fundamental effective frequency
         if effective_modes:
@@ -183,9 +232,10 @@ class OrientifoldProjection:
         self.calculate_dbrane_spectrum()
         
         return {
-            'string_modes': allowed_modes[:20],
+            'string_modes': allowed_modes,
             'effective_modes': effective_modes[:10],
-            'f_0': self.f_0
+            'f_0': self.f_0,
+            'lattice': lattice
         }
     
     def calculate_dbrane_spectrum(self) -> Dict[str, float]:
@@ -22,9 +22,156 @@ Key Properties:
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import solve_ivp
-from scipy.special import spherical_jn, sph_harm
-from typing import Tuple, List, Dict
+from scipy.special import spherical_jn
+from typing import Tuple, List, Dict, Optional
+from pathlib import Path
+from collections import OrderedDict
 import json
+import os
+
+try:
+    from scipy.special import sph_harm
+except ImportError:  # SciPy ≥ 1.17 only provides sph_harm_y(l, m, θ, φ)
+    from scipy.special import sph_harm_y
+
+    def sph_harm(m, l, phi, theta):
+        return sph_harm_y(l, m, theta, phi)
+
+
+BASIS_CACHE_VERSION = 1
+
+
+def _basis_cache_dir() -> Path:
+    cache_dir = os.environ.get('ECHO_CACHE_DIR')
+    return Path(cache_dir) if cache_dir else Path(__file__).resolve().parent / '.echo_cache'
+
+
+def odd_real_harmonics(l_max: int, theta: np.ndarray, phi: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Real orthonormal spherical harmonics of odd degree l ≤ l_max.
+    
+    Y_l0, √2 (-1)^m Re Y_lm (m > 0) and √2 (-1)^m Im Y_l|m| (m < 0),
+    evaluated at the points (theta, phi).
+    
+    Returns:
+    --------
+    l, m : np.ndarray
+        Quantum numbers of each basis function, ordered by (l, m)
+    Y : np.ndarray
+        Basis values, shape (n_modes, *theta.shape)
+    """
+    theta, phi = np.broadcast_arrays(np.asarray(theta, dtype=float),
+                                     np.asarray(phi, dtype=float))
+    l_values, m_values, rows = [], [], []
+    for l in range(1, l_max + 1, 2):
+        complex_rows = {mm: sph_harm(mm, l, phi, theta) for mm in range(l + 1)}
+        for m in range(-l, l + 1):
+            Y_lm = complex_rows[abs(m)]
+            if m == 0:
+                rows.append(Y_lm.real)
+            elif m > 0:
+                rows.append(np.sqrt(2) * (-1)**m * Y_lm.real)
+            else:
+                rows.append(np.sqrt(2) * (-1)**m * Y_lm.imag)
+            l_values.append(l)
+            m_values.append(m)
+    return np.array(l_values), np.array(m_values), np.array(rows)
+
+
+class RP2HarmonicBasis:
+    """
+    Cached odd-l harmonic basis of ℝP² on a Gauss-Legendre × uniform grid.
+    
+    The basis matrix Y (n_modes × n_points) is computed once per
+    (l_max, n_theta, n_phi), kept in memory and saved to disk as .npz
+    (under ECHO_CACHE_DIR, default .echo_cache/ next to this module), so
+    projections, syntheses and template banks reduce to matrix products.
+    At most MEMORY_CACHE_SIZE bases stay in memory (least recently used
+    dropped); evicted ones reload from disk.
+    """
+    
+    MEMORY_CACHE_SIZE = 4
+    _memory_cache: Dict[Tuple[int, int, int], 'RP2HarmonicBasis'] = OrderedDict()
+    
+    def __init__(self, l_max: int, n_theta: int, n_phi: int,
+                 l: Optional[np.ndarray] = None, m: Optional[np.ndarray] = None,
+                 Y: Optional[np.ndarray] = None):
+        self.l_max = l_max
+        self.n_theta = n_theta
+        self.n_phi = n_phi
+        
+        # Quadrature grid: Gauss-Legendre in cos θ, uniform in φ
+        cos_theta, w_theta = np.polynomial.legendre.leggauss(n_theta)
+        theta = np.arccos(cos_theta)
+        phi = 2 * np.pi * np.arange(n_phi) / n_phi
+        theta_grid, phi_grid = np.meshgrid(theta, phi, indexing='ij')
+        self.theta = theta_grid.ravel()
+        self.phi = phi_grid.ravel()
+        self.weights = np.outer(w_theta, np.full(n_phi, 2 * np.pi / n_phi)).ravel()
+        
+        # Precomputed basis values (n_modes, n_points), evaluated if not given
+        if Y is None:
+            l, m, Y = odd_real_harmonics(l_max, self.theta, self.phi)
+        self.l, self.m, self.Y = l, m, Y
+        
+        # Index of each basis function's degree among the odd l values
+        self.l_values = np.arange(1, l_max + 1, 2)
+        self.l_index = (self.l - 1) // 2
+    
+    @classmethod
+    def load(cls, l_max: int, n_theta: Optional[int] = None, n_phi: Optional[int] = None,
+             use_disk: bool = True) -> 'RP2HarmonicBasis':
+        """
+        Basis for (l_max, grid), from memory, disk cache or computed.
+        
+        The default grid (l_max + 1) × (2 l_max + 2) integrates products of
+        basis functions exactly.
+        """
+        n_theta = n_theta or l_max + 1
+        n_phi = n_phi or 2 * l_max + 2
+        key = (l_max, n_theta, n_phi)
+        if key in cls._memory_cache:
+            cls._memory_cache.move_to_end(key)
+            return cls._memory_cache[key]
+        
+        cache_file = _basis_cache_dir() / (
+            f'rp2_basis_v{BASIS_CACHE_VERSION}_l{l_max}_{n_theta}x{n_phi}.npz')
+        if use_disk and cache_file.is_file():
+            with np.load(cache_file, allow_pickle=False) as cached:
+                basis = cls(l_max, n_theta, n_phi, cached['l'], cached['m'], cached['Y'])
+        else:
+            basis = cls(l_max, n_theta, n_phi)
+            if use_disk:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix('.tmp.npz')
+                np.savez(tmp_file, l=basis.l, m=basis.m, Y=basis.Y)
+                os.replace(tmp_file, cache_file)  # atomic for concurrent runs
+        
+        cls._memory_cache[key] = basis
+        if len(cls._memory_cache) > cls.MEMORY_CACHE_SIZE:
+            cls._memory_cache.popitem(last=False)
+        return basis
+    
+    @property
+    def n_modes(self) -> int:
+        return len(self.l)
+    
+    def project(self, field: np.ndarray) -> np.ndarray:
+        """Odd-l coefficients of grid samples field (..., n_points)."""
+        return (field * self.weights) @ self.Y.T
+    
+    def synthesize(self, coefficients: np.ndarray) -> np.ndarray:
+        """Grid samples (..., n_points) of a coefficient vector (..., n_modes)."""
+        return coefficients @ self.Y
+    
+    def degree_sums(self, per_mode: np.ndarray) -> np.ndarray:
+        """Sum a (..., n_modes) array over m within each odd degree l."""
+        per_mode = np.asarray(per_mode)
+        onehot = np.zeros((self.n_modes, len(self.l_values)))
+        onehot[np.arange(self.n_modes), self.l_index] = 1.0
+        return per_mode @ onehot
+
+
 
 class RealProjectivePlane:
     """
@@ -151,6 +298,25 @@ class RealProjectivePlane:
             
         return wave_function
     
+    def mode_fields(self, t: float = 0.0, l_max: int = 19, n_theta: Optional[int] = None,
+                    n_phi: Optional[int] = None) -> Tuple[RP2HarmonicBasis, np.ndarray]:
+        """
+        All odd-l solutions ψ_lm(θ, φ, t) on the cached quadrature grid.
+        
+        Equivalent to wave_equation_solutions(l, m)(θ, φ, t) for every mode
+        (in the real harmonic basis), as one broadcast product.
+        
+        Returns:
+        --------
+        basis : RP2HarmonicBasis
+            Grid and quantum numbers
+        fields : np.ndarray
+            Complex array (n_modes, n_points)
+        """
+        basis = RP2HarmonicBasis.load(l_max, n_theta, n_phi)
+        omega = (self.c / (2 * self.R)) * np.sqrt(basis.l * (basis.l + 1))
+        return basis, basis.Y * np.exp(-1j * omega * t)[:, None]
+    
     def echo_time_prediction(self, black_hole_mass: float) -> float:
         """
         Predict echo time for a given black hole mass.
@@ -308,6 +474,80 @@ class RealProjectivePlane:
                            np.sin(2 * np.pi * f_echo * (times[mask] - echo_time)))
         
         return times, echo_strain
+    
+    def generate_echo_template_bank(self, merger_time: float, black_hole_mass: float,
+                                    source_indices: Optional[np.ndarray] = None,
+                                    observer: Tuple[float, float] = (0.0, 0.0),
+                                    l_max: int = 51, n_theta: Optional[int] = None,
+                                    n_phi: Optional[int] = None, duration: float = 2.0,
+                                    sampling_rate: float = 4096,
+                                    tau_damp: float = 0.1) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Echo templates for many source orientations on ℝP².
+        
+        Every odd degree l rings at ω_l with the damped profile of
+        generate_echo_template; a source at n̂ couples to the observer
+        through (4π/(2l+1)) Σ_m Y_lm(n̂) Y_lm(n̂_obs) = P_l(cos γ). With the
+        cached basis the whole bank is two matrix products.
+        
+        Parameters:
+        -----------
+        merger_time : float
+            Time of merger (seconds)
+        black_hole_mass : float
+            Final black hole mass (solar masses)
+        source_indices : array-like, optional
+            Basis grid points (index i_θ·n_phi + i_φ) used as source
+            orientations. Default: the n_theta points on the φ = 0
+            meridian, one per polar node (52 sources for l_max=51). Pass
+            np.arange(n_theta·n_phi) explicitly for the full grid.
+        observer : (float, float)
+            Observer direction (θ, φ) in radians
+        l_max : int
+            Highest harmonic degree kept
+        n_theta, n_phi : int, optional
+            Basis grid resolution (see RP2HarmonicBasis.load)
+        duration, sampling_rate : float
+            Template duration (s) and sampling rate (Hz)
+        tau_damp : float
+            Damping time (s)
+            
+        Returns:
+        --------
+        times : np.ndarray
+            Time array
+        echo_strain : np.ndarray
+            Templates, shape (n_sources, n_times)
+        source_theta, source_phi : np.ndarray
+            Source orientations
+            
+        Memory: the bank holds n_sources × duration·sampling_rate float64
+        values, i.e. 8·n_sources·duration·sampling_rate bytes. The default
+        meridian subset at l_max=51 is 52 × 8192 (~3.4 MB); the full default
+        grid is 52 × 104 = 5408 sources (~354 MB).
+        """
+        basis = RP2HarmonicBasis.load(l_max, n_theta, n_phi)
+        source_indices = (np.arange(basis.n_theta) * basis.n_phi if source_indices is None
+                          else np.asarray(source_indices))
+        
+        # Damped ringing of each odd degree: (n_l, n_times)
+        times = np.arange(0, duration, 1.0 / sampling_rate) + merger_time
+        echo_time = merger_time + self.echo_time_prediction(black_hole_mass)
+        A_echo = 1e-22 * (62.0 / black_hole_mass)**0.5
+        omega_l = (self.c / (2 * self.R)) * np.sqrt(basis.l_values * (basis.l_values + 1))
+        lag = times - echo_time
+        mask = lag > 0
+        ringdown = np.zeros((len(omega_l), len(times)))
+        ringdown[:, mask] = (A_echo * np.exp(-lag[mask] / tau_damp) *
+                             np.sin(omega_l[:, None] * lag[mask]))
+        
+        # Source-observer coupling per degree: (n_sources, n_l)
+        _, _, Y_observer = odd_real_harmonics(l_max, *observer)
+        weights = Y_observer * 4 * np.pi / (2 * basis.l + 1)
+        coupling = basis.degree_sums(basis.Y[:, source_indices].T * weights)
+        
+        return (times, coupling @ ringdown,
+                basis.theta[source_indices], basis.phi[source_indices])
 
 
 def main():
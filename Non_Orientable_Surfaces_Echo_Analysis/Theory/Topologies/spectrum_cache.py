@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Persistent Topology Spectrum Cache
+==================================
+
+Two-level cache (in-memory dict + on-disk .npz store) for topology mode
+spectra, so repeated tables, plots and analysis sessions do not recompute
+them.
+
+Entries are keyed by a SHA-256 hash of the topology class (module and
+qualified name) and its geometry parameters and mode cutoff. Each entry
+also records a code version, SPECTRUM_CACHE_VERSION plus the hash of the
+source files that produce the spectrum; an entry written by different
+code is invalidated and recomputed in place, so editing a topology module
+never serves stale spectra; unreadable entries (truncated or corrupt
+files, missing version) are treated the same way. Hit/miss statistics are
+tracked per cache.
+
+Disk entries live under ECHO_CACHE_DIR (default .echo_cache/ next to this
+module).
+"""
+
+import numpy as np
+import hashlib
+import json
+import os
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+SPECTRUM_CACHE_VERSION = 1
+
+
+def _cache_dir() -> Path:
+    cache_dir = os.environ.get('ECHO_CACHE_DIR')
+    return Path(cache_dir) if cache_dir else Path(__file__).resolve().parent / '.echo_cache'
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: str, mtime_ns: int) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def code_version(source_files: Iterable[str]) -> str:
+    """Hash of the cache format version and the given source files."""
+    digest = hashlib.sha256(f'v{SPECTRUM_CACHE_VERSION}'.encode())
+    for path in sorted(set(str(Path(p).resolve()) for p in source_files)):
+        digest.update(_file_digest(path, os.stat(path).st_mtime_ns).encode())
+    return digest.hexdigest()[:16]
+
+
+class SpectrumCache:
+    """
+    In-memory + .npz cache of spectrum dictionaries (arrays and scalars).
+
+    Parameters:
+    -----------
+    cache_dir : str or Path, optional
+        Disk store location (default: ECHO_CACHE_DIR or .echo_cache/)
+    use_disk : bool
+        Read/write the .npz store (memory only if False)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, use_disk: bool = True):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _cache_dir()
+        self.use_disk = use_disk
+        self._memory: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'invalidated': 0}
+
+    @staticmethod
+    def make_key(topology_class: type, parameters: Dict) -> str:
+        """Hash of topology class and parameters (incl. mode cutoff)."""
+        payload = json.dumps({
+            'class': f'{topology_class.__module__}.{topology_class.__qualname__}',
+            'parameters': parameters
+        }, sort_keys=True, default=float)
+        return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+    def _path(self, topology_class: type, key: str) -> Path:
+        return self.cache_dir / f'spectrum_{topology_class.__name__}_{key}.npz'
+
+    def get_or_compute(self, topology_class: type, parameters: Dict,
+                       compute: Callable[[], Dict], source_files: Iterable[str] = ()) -> Dict:
+        """
+        Cached spectrum for (class, parameters), computing it on a miss.
+
+        Parameters:
+        -----------
+        topology_class : type
+            Class producing the spectrum
+        parameters : dict
+            JSON-serializable geometry parameters and mode cutoff
+        compute : callable
+            Returns the spectrum dict (values: arrays or scalars)
+        source_files : iterable of str
+            Files whose content defines the code version
+
+        Returns:
+        --------
+        spectrum : dict
+            Read-only arrays; scalars as Python floats/ints
+        """
+        version = code_version(source_files)
+        key = self.make_key(topology_class, parameters)
+
+        if (key, version) in self._memory:
+            self.stats['memory_hits'] += 1
+            return self._memory[key, version]
+
+        path = self._path(topology_class, key)
+        if self.use_disk and path.is_file():
+            spectrum = self._read(path, version)
+            if spectrum is not None:
+                self.stats['disk_hits'] += 1
+                return self._store((key, version), spectrum)
+            self.stats['invalidated'] += 1  # Other code or unreadable: recompute
+
+        self.stats['misses'] += 1
+        spectrum = {name: np.asarray(value) for name, value in compute().items()}
+        if self.use_disk:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp.npz')
+            np.savez(tmp_path, __code_version__=version, **spectrum)
+            os.replace(tmp_path, path)  # atomic for concurrent runs
+        return self._store((key, version), spectrum)
+
+    @staticmethod
+    def _read(path: Path, version: str) -> Optional[Dict[str, np.ndarray]]:
+        """Spectrum stored at path by this code version, or None."""
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                if ('__code_version__' not in stored.files
+                        or str(stored['__code_version__']) != version):
+                    return None
+                return {name: stored[name] for name in stored.files
+                        if name != '__code_version__'}
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            return None  # Truncated or corrupt file
+
+    def _store(self, key: Tuple[str, str], spectrum: Dict[str, np.ndarray]) -> Dict:
+        for name, value in spectrum.items():
+            if value.ndim == 0:
+                spectrum[name] = value.item()
+            else:
+                value.flags.writeable = False
+        self._memory[key] = spectrum
+        return spectrum
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def clear(self, disk: bool = False):
+        """Drop the in-memory entries (and the .npz store if disk=True)."""
+        self._memory.clear()
+        if disk and self.cache_dir.is_dir():
+            for path in self.cache_dir.glob('spectrum_*.npz'):
+                path.unlink()
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Spectrum cache: {s['memory_hits']} memory hits, {s['disk_hits']} disk hits, "
+                f"{s['misses']} misses, {s['invalidated']} invalidated "
+                f"(hit rate {self.hit_rate:.0%})")
+
+
+_default_cache: Optional[SpectrumCache] = None
+
+
+def default_spectrum_cache() -> SpectrumCache:
+    """Process-wide cache shared by all topology plugins."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SpectrumCache()
+    return _default_cache
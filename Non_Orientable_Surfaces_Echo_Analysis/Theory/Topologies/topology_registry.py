@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Topology Plugin Registry
+========================
+
+Uniform interface to the non-orientable topology models, so comparison
+and LIGO analyzers can iterate over topologies without knowing each
+class' method names and return types.
+
+Every plugin provides:
+- spectrum()            → {'f', 'n', 'f_0', 'omega_0'} with array-valued modes,
+                          served from the persistent spectrum cache
+- echo_times(M)         → {'primary': τ, ...} from the theoretical model
+- search_echo_times(M)  → {'primary': τ, ...} from the empirical search law
+                          τ = a·M^α + b plus topology-specific extra echoes
+- geometric_factor      → rigorous geometric factor
+- template(t, M)        → damped echo waveform
+- search_parameters()   → frequency/scaling parameters used by the analyzers
+
+New topologies register with the @register_topology decorator:
+
+    @register_topology
+    class MyTopology(TopologyPlugin):
+        key = 'My_Topology'
+        ...
+
+and are then picked up by every analyzer that iterates the registry.
+"""
+
+import numpy as np
+import contextlib
+import copy
+import inspect
+import io
+from typing import Dict, List, Optional, Type
+
+from spectrum_cache import SpectrumCache, default_spectrum_cache
+from real_projective_plane import RealProjectivePlane
+from mobius_band import MobiusBand
+from twisted_torus import TwistedTorus
+from orientifold_projections import OrientifoldProjection
+
+# Registered plugin classes, keyed by analyzer name (e.g. 'Mobius_Band')
+TOPOLOGY_REGISTRY: Dict[str, Type['TopologyPlugin']] = {}
+
+
+def register_topology(cls: Type['TopologyPlugin']) -> Type['TopologyPlugin']:
+    """Class decorator adding a TopologyPlugin subclass to the registry."""
+    if not cls.key:
+        raise ValueError(f"{cls.__name__} must define a registry key")
+    TOPOLOGY_REGISTRY[cls.key] = cls
+    return cls
+
+
+def available_topologies() -> List[str]:
+    """Registered topology keys, in registration order."""
+    return list(TOPOLOGY_REGISTRY)
+
+
+def get_topology(key: str, **kwargs) -> 'TopologyPlugin':
+    """
+    Instantiate a registered topology by key or short name.
+
+    Parameters:
+    -----------
+    key : str
+        Registry key ('Real_Projective_Plane') or short name ('RP2')
+    **kwargs
+        Passed to the plugin constructor (e.g. reference_size)
+    """
+    if key not in TOPOLOGY_REGISTRY:
+        matches = [cls for cls in TOPOLOGY_REGISTRY.values() if cls.short_name == key]
+        if not matches:
+            raise KeyError(f"Unknown topology '{key}'. Registered: {available_topologies()}")
+        return matches[0](**kwargs)
+    return TOPOLOGY_REGISTRY[key](**kwargs)
+
+
+def create_topologies(keys: Optional[List[str]] = None, **kwargs) -> Dict[str, 'TopologyPlugin']:
+    """Instantiate several (default: all) registered topologies."""
+    keys = available_topologies() if keys is None else keys
+    return {key: get_topology(key, **kwargs) for key in keys}
+
+
+def _quietly(function, *args, **kwargs):
+    """Call a legacy model method with its progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+class TopologyPlugin:
+    """
+    Base class of registered topologies.
+
+    Subclasses set the class attributes and override build_model,
+    spectrum and echo_times; the search law, extra echoes and template
+    have generic defaults.
+    """
+
+    key: str = ''                 # analyzer name, e.g. 'Klein_Bottle'
+    short_name: str = ''          # comparison name, e.g. 'Klein'
+    name: str = ''                # display name
+    orientable: bool = False
+    boundary: bool = False
+    key_feature: str = ''
+    uv_complete: bool = False
+    geometric_factor: float = 1.0
+    mode_cutoff: Optional[int] = 20  # spectrum mode cutoff; None if the spectrum has no cutoff
+
+    # Empirical search parameters (f in Hz, τ = coefficient·M^alpha + offset)
+    search: Dict = {}
+
+    def __init__(self, reference_size: float = 8400e3,
+                 spectrum_cache: Optional[SpectrumCache] = None):
+        """
+        Parameters:
+        -----------
+        reference_size : float
+            Common size of the compact dimension (meters)
+        spectrum_cache : SpectrumCache, optional
+            Cache for spectrum() (default: the process-wide cache)
+        """
+        self.reference_size = reference_size
+        self.spectrum_cache = spectrum_cache or default_spectrum_cache()
+        self._model = None
+        self._spectrum = None
+
+    def build_model(self):
+        """Construct the underlying theory object (None if analytic only)."""
+        return None
+
+    @property
+    def model(self):
+        """Theory object, built on first use."""
+        if self._model is None:
+            self._model = self.build_model()
+        return self._model
+
+    def cache_parameters(self) -> Dict:
+        """Parameters that determine the spectrum (spectrum cache key)."""
+        parameters = {'reference_size': self.reference_size}
+        if self.mode_cutoff is not None:
+            parameters['mode_cutoff'] = self.mode_cutoff
+        return parameters
+
+    def model_class(self) -> Optional[type]:
+        """Theory class behind the plugin (None if analytic only)."""
+        return None
+
+    def source_files(self) -> List[str]:
+        """Source files whose code defines the spectrum (cache code version)."""
+        files = [inspect.getfile(type(self))]
+        if self.model_class() is not None:
+            files.append(inspect.getfile(self.model_class()))
+        return files
+
+    def spectrum(self) -> Dict[str, np.ndarray]:
+        """
+        Mode spectrum as arrays: 'f' (Hz, ascending), 'n' (mode label the
+        selection rule acts on), 'f_0' and 'omega_0'. Served from the
+        spectrum cache (memory, then disk), computed only on a miss.
+        """
+        if self._spectrum is None:
+            self._spectrum = self.spectrum_cache.get_or_compute(
+                type(self), self.cache_parameters(), self._compute_spectrum,
+                self.source_files())
+        return self._spectrum
+
+    def _compute_spectrum(self) -> Dict[str, np.ndarray]:
+        # Default: odd harmonics of the search fundamental
+        n = np.arange(1, self.mode_cutoff, 2)
+        return self._spectrum_dict(n * self.search['fundamental_freq'], n)
+
+    @staticmethod
+    def _spectrum_dict(f, n) -> Dict[str, np.ndarray]:
+        f = np.asarray(f, dtype=float)
+        f_0 = float(f[0]) if len(f) else 0.0
+        return {'f': f, 'n': np.asarray(n), 'f_0': f_0, 'omega_0': 2 * np.pi * f_0}
+
+    def echo_times(self, black_hole_mass) -> Dict[str, np.ndarray]:
+        """Echo delays (s) predicted by the theory model; always has 'primary'."""
+        return self.search_echo_times(black_hole_mass)
+
+    def search_echo_times(self, black_hole_mass, scaling: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+        """
+        Echo delays (s) of the empirical search law τ = a·M^α + b.
+
+        Parameters:
+        -----------
+        black_hole_mass : float or array
+            Final masses (M☉)
+        scaling : dict, optional
+            Overrides {'alpha', 'coefficient', 'offset'} (e.g. from a
+            results file); defaults to this topology's search parameters
+        """
+        scaling = self.search['scaling_law'] if not scaling else scaling
+        mass = np.asarray(black_hole_mass, dtype=float)
+        tau_primary = (scaling.get('coefficient', 1.0) * mass**scaling.get('alpha', -0.826) +
+                       scaling.get('offset', 0.0))
+        return {'primary': tau_primary, **self.secondary_echoes(tau_primary)}
+
+    def secondary_echoes(self, tau_primary, search: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+        """
+        Additional echoes derived from the primary delay (none by default).
+
+        search optionally overrides this topology's search parameters.
+        """
+        return {}
+
+    def template(self, times, black_hole_mass: float, merger_time: float = 0.0,
+                 tau_damp: float = 0.1) -> np.ndarray:
+        """
+        Damped echo at the fundamental frequency after the primary delay.
+
+        Uses the amplitude scaling of the ℝP² template,
+        A = 1e-22 (62/M)^½.
+        """
+        times = np.asarray(times, dtype=float)
+        echo_time = merger_time + float(self.echo_times(black_hole_mass)['primary'])
+        amplitude = 1e-22 * (62.0 / black_hole_mass)**0.5
+        lag = times - echo_time
+        strain = np.zeros_like(times)
+        mask = lag > 0
+        strain[mask] = (amplitude * np.exp(-lag[mask] / tau_damp) *
+                        np.sin(2 * np.pi * self.spectrum()['f_0'] * lag[mask]))
+        return strain
+
+    def search_parameters(self) -> Dict:
+        """Copy of the search parameters in MultiTopologyLIGOAnalyzer format."""
+        return copy.deepcopy(self.search)
+
+
+@register_topology
+class KleinBottleTopology(TopologyPlugin):
+    """Klein bottle reference (analytic; parameters from the paper)."""
+
+    key = 'Klein_Bottle'
+    short_name = 'Klein'
+    name = 'Klein Bottle'
+    key_feature = 'Twisted identification'
+    geometric_factor = 3.142  # π
+    search = {
+        'fundamental_freq': 6.65,
+        'harmonics': [6.65, 19.95, 33.25, 46.55],
+        'forbidden_freqs': [13.3, 26.6, 39.9],
+        'search_bandwidth': 0.5,
+        'scaling_law': {'alpha': -0.826, 'coefficient': 2.574, 'offset': 0.273}
+    }
+
+
+@register_topology
+class RealProjectivePlaneTopology(TopologyPlugin):
+    key = 'Real_Projective_Plane'
+    short_name = 'RP2'
+    name = 'Real Projective Plane'
+    key_feature = 'Antipodal identification'
+    geometric_factor = 0.707
+    mode_cutoff = None            # derive_mode_spectrum fixes its own l range
+    search = {
+        'fundamental_freq': 4.19,
+        'harmonics': [4.19, 12.57, 20.95, 29.33],
+        'forbidden_freqs': [8.38, 16.76, 25.14],
+        'search_bandwidth': 0.3,
+        'scaling_law': {'alpha': -0.826, 'coefficient': 0.315, 'offset': 0.189}
+    }
+
+    def model_class(self):
+        return RealProjectivePlane
+
+    def build_model(self):
+        return RealProjectivePlane(radius=self.reference_size)
+
+    def _compute_spectrum(self):
+        modes = _quietly(self.model.derive_mode_spectrum)
+        return self._spectrum_dict(modes['frequencies'] / (2 * np.pi), modes['l_values'])
+
+    def echo_times(self, black_hole_mass):
+        return {'primary': self.model.echo_time_prediction(np.asarray(black_hole_mass, dtype=float))}
+
+
+@register_topology
+class MobiusBandTopology(TopologyPlugin):
+    key = 'Mobius_Band'
+    short_name = 'Mobius'
+    name = 'Möbius Band'
+    boundary = True
+    key_feature = 'Edge modes + twist'
+    geometric_factor = 0.916
+    mode_cutoff = None            # derive_mode_spectrum fixes its own mode range
+    search = {
+        'fundamental_freq': 8.2,
+        'harmonics': [8.2, 12.8, 16.4, 24.6],
+        'forbidden_freqs': [],
+        'search_bandwidth': 0.8,
+        'scaling_law': {'alpha': -0.826, 'coefficient': 0.297, 'offset': 0.251},
+        'dual_echo_delay': 0.003  # 3ms separation
+    }
+
+    def model_class(self):
+        return MobiusBand
+
+    def build_model(self):
+        return MobiusBand(length=2*np.pi*self.reference_size, width=500e3)
+
+    def _compute_spectrum(self):
+        modes = _quietly(self.model.derive_mode_spectrum)
+        longitudinal = modes['longitudinal']
+        return self._spectrum_dict([m['f'] for m in longitudinal], [m['n'] for m in longitudinal])
+
+    def echo_times(self, black_hole_mass):
+        primary, secondary = self.model.echo_time_prediction(np.asarray(black_hole_mass, dtype=float))
+        return {'primary': primary, 'secondary': secondary}
+
+    def secondary_echoes(self, tau_primary, search=None):
+        delay = (search or self.search).get('dual_echo_delay', self.search['dual_echo_delay'])
+        return {'secondary': tau_primary + delay}
+
+
+@register_topology
+class TwistedTorusTopology(TopologyPlugin):
+    key = 'Twisted_Torus'
+    short_name = 'TwistedTorus'
+    name = 'Twisted Torus'
+    key_feature = 'Tunable twist parameter'
+    geometric_factor = 1.061
+    search = {
+        'fundamental_freq': 5.68,
+        'harmonics': [5.68, 11.36, 17.04, 22.72],
+        'forbidden_freqs': [],
+        'search_bandwidth': 1.0,
+        'scaling_law': {'alpha': -0.826, 'coefficient': 0.289, 'offset': 0.264}
+    }
+
+    def model_class(self):
+        return TwistedTorus
+
+    def build_model(self):
+        return _quietly(TwistedTorus, L1=2*np.pi*self.reference_size,
+                        L2=2*np.pi*1000e3, twist_angle=np.pi)  # Maximum twist
+
+    def _compute_spectrum(self):
+        modes = self.model.mode_spectrum_arrays(max_modes=self.mode_cutoff)['modes'][0]
+        modes = modes[np.isfinite(modes['f'])]
+        return self._spectrum_dict(modes['f'], modes['n1'])
+
+    def echo_times(self, black_hole_mass):
+        return {'primary': self.model.echo_time_prediction(np.asarray(black_hole_mass, dtype=float))}
+
+
+@register_topology
+class StringOrientifoldTopology(TopologyPlugin):
+    key = 'String_Orientifold'
+    short_name = 'Orientifold'
+    name = 'String Orientifold'
+    boundary = False
+    key_feature = 'GSO projection'
+    uv_complete = True
+    geometric_factor = 0.417
+    mode_cutoff = None            # string_mode_spectrum fixes its own mode range
+    search = {
+        'fundamental_freq': 6.8,
+        'harmonics': [6.8, 13.6, 20.4, 27.2],
+        'forbidden_freqs': [13.6, 27.2],  # Open string modes
+        'search_bandwidth': 0.4,
+        'scaling_law': {'alpha': -0.826, 'coefficient': 0.276, 'offset': 0.278},
+        'dual_scales': {'closed': 6.8, 'open': 13.6}
+    }
+
+    def model_class(self):
+        return OrientifoldProjection
+
+    def build_model(self):
+        return _quietly(OrientifoldProjection, compactification_type="Klein",
+                        string_length=1e-35, extra_dim_size=self.reference_size)
+
+    def _compute_spectrum(self):
+        modes = _quietly(self.model.string_mode_spectrum)
+        effective = modes['effective_modes']
+        spectrum = self._spectrum_dict([m['f_effective'] for m in effective],
+                                       np.array([m['n'] for m in effective], dtype=int))
+        spectrum['f_0'] = modes['f_0']
+        spectrum['omega_0'] = 2 * np.pi * modes['f_0']
+        return spectrum
+
+    def echo_times(self, black_hole_mass):
+        echoes = self.model.echo_prediction_from_strings(np.asarray(black_hole_mass, dtype=float))
+        return {
+            'primary': echoes['tau_closed_string'],
+            'closed_string': echoes['tau_closed_string'],
+            'open_string': echoes['tau_open_string']
+        }
+
+    def secondary_echoes(self, tau_primary, search=None):
+        return {
+            'closed_string': tau_primary,
+            'open_string': tau_primary * 0.5  # Open strings faster
+        }
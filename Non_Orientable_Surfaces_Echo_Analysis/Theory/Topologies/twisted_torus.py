@@ -23,10 +23,106 @@ Key Properties:
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import solve_ivp
-from scipy.optimize import minimize_scalar
 from typing import Tuple, List, Dict
 import json
 
+# Structured dtype of one twisted-torus mode (see TwistedTorus.mode_spectrum_arrays)
+MODE_DTYPE = np.dtype([
+    ('n1', np.int32), ('n2', np.int32),
+    ('k1', np.float64), ('k2', np.float64), ('k_total', np.float64),
+    ('omega', np.float64), ('f', np.float64),
+    ('degeneracy', np.int32)
+])
+
+
+def twist_fundamental_frequency(theta, L1: float, L2: float, c: float = 299792458,
+                                max_modes: int = 10) -> np.ndarray:
+    """
+    Fundamental frequency f₀(θ) of a twisted torus as a pure function.
+    
+    The selection rule |n₂ + n₁θ/(2π) - round(·)| < 0.01 does not depend on
+    the integer n₂, so the lowest allowed mode is either (0, ±1) with
+    f = c/L₂ or (±n₁, 0) with f = c|n₁|/L₁ for the smallest allowed |n₁|.
+    This equals derive_mode_spectrum(max_modes)['f_0'] without building
+    the mode lattice. Broadcasts over theta.
+    """
+    theta = np.asarray(theta, dtype=float)
+    n1 = np.arange(1, max_modes + 1)
+    x = n1 * theta[..., None] / (2 * np.pi)
+    allowed = np.abs(x - np.round(x)) < 0.01
+    f_n1 = np.where(allowed, c * n1 / L1, np.inf).min(axis=-1)
+    return np.minimum(f_n1, c / L2)
+
+
+def twist_echo_time(theta, black_hole_mass, L1: float, c: float = 299792458,
+                    M_ref: float = 62.0, alpha: float = -0.826) -> np.ndarray:
+    """
+    Echo time τ(θ, M) of TwistedTorus.echo_time_prediction as a pure,
+    broadcasting function.
+    """
+    theta = np.asarray(theta, dtype=float)
+    L_eff = np.sqrt(L1**2 + (theta * L1 / (2*np.pi))**2)
+    return L_eff / c * (np.asarray(black_hole_mass, dtype=float) / M_ref)**alpha
+
+
+def _minimize_twist_batched(objective, n_targets: int, bounds: Tuple[float, float],
+                            n_grid: int = 721, n_iter: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimize objective(θ) for many targets at once.
+    
+    A coarse grid pre-scan (one batched evaluation of shape
+    (n_targets, n_grid)) brackets the global minimum of each target; a
+    vectorized golden-section search then refines all brackets together.
+    The grid optimum is kept where refinement does not improve on it
+    (piecewise-constant objectives such as f₀(θ)).
+    
+    Parameters:
+    -----------
+    objective : callable
+        Maps θ of shape (n_targets, m) to objective values of the same shape
+    n_targets : int
+        Number of independent problems
+    bounds : (float, float)
+        Search interval for θ
+    n_grid : int
+        Pre-scan resolution
+    n_iter : int
+        Golden-section iterations (bracket shrinks by 0.618 each)
+        
+    Returns:
+    --------
+    theta_opt, objective_opt : np.ndarray
+        Arrays of shape (n_targets,)
+    """
+    grid = np.linspace(bounds[0], bounds[1], n_grid)
+    values = objective(np.broadcast_to(grid, (n_targets, n_grid)))
+    rows = np.arange(n_targets)
+    best = np.argmin(values, axis=1)
+    
+    a = grid[np.maximum(best - 1, 0)]
+    b = grid[np.minimum(best + 1, n_grid - 1)]
+    inv_phi = (np.sqrt(5) - 1) / 2
+    x1 = b - inv_phi * (b - a)
+    x2 = a + inv_phi * (b - a)
+    f1 = objective(x1[:, None])[:, 0]
+    f2 = objective(x2[:, None])[:, 0]
+    
+    for _ in range(n_iter):
+        keep_left = f1 <= f2
+        a = np.where(keep_left, a, x1)
+        b = np.where(keep_left, x2, b)
+        x_new = np.where(keep_left, b - inv_phi * (b - a), a + inv_phi * (b - a))
+        f_new = objective(x_new[:, None])[:, 0]
+        x1, x2 = np.where(keep_left, x_new, x2), np.where(keep_left, x1, x_new)
+        f1, f2 = np.where(keep_left, f_new, f2), np.where(keep_left, f1, f_new)
+    
+    theta_refined = 0.5 * (a + b)
+    f_refined = objective(theta_refined[:, None])[:, 0]
+    use_grid = values[rows, best] <= f_refined
+    return (np.where(use_grid, grid[best], theta_refined),
+            np.where(use_grid, values[rows, best], f_refined))
+
+
 class TwistedTorus:
     """
     Theoretical framework for gravitational wave propagation
@@ -85,6 +181,108 @@ class TwistedTorus:
         
         return condition1 and condition2
     
+    def mode_spectrum_arrays(self, max_modes: int = 20, twist_angles=None,
+                             n_modes: int = None) -> Dict[str, np.ndarray]:
+        """
+        Vectorized mode spectrum for one or many twist angles.
+        
+        The (n₁, n₂) lattice is built once from an index meshgrid and sorted by
+        frequency (ties in (n₁, n₂) order, as derive_mode_spectrum). The twist
+        only enters through the selection rule
+            |n₂ + n₁θ/(2π) - round(·)| < 0.01
+        so every angle is a boolean mask over the same sorted lattice.
+        
+        Parameters:
+        -----------
+        max_modes : int
+            Lattice cutoff |n₁|, |n₂| ≤ max_modes
+        twist_angles : float or array-like, optional
+            Twist angles θ (radians); defaults to this torus' angle
+        n_modes : int, optional
+            Modes kept per angle (default: all allowed modes)
+            
+        Returns:
+        --------
+        dict with
+            'modes' : (n_angles, n_modes) MODE_DTYPE array, lowest modes
+                first; padding entries have f = NaN and degeneracy 0
+            'n_allowed' : (n_angles,) number of allowed modes
+            'f_0', 'omega_0' : (n_angles,) fundamental (0 if none)
+            'twist_angles' : (n_angles,) angles used
+        """
+        thetas = np.atleast_1d(self.theta if twist_angles is None else
+                               np.asarray(twist_angles, dtype=float))
+        
+        # Index lattice without (0, 0), sorted by frequency
+        n = np.arange(-max_modes, max_modes + 1)
+        n1, n2 = (a.ravel() for a in np.meshgrid(n, n, indexing='ij'))
+        nonzero = (n1 != 0) | (n2 != 0)
+        n1, n2 = n1[nonzero], n2[nonzero]
+        k1 = 2 * np.pi * n1 / self.L1
+        k2 = 2 * np.pi * n2 / self.L2
+        k_total = np.sqrt(k1**2 + k2**2)
+        omega = self.c * k_total
+        f = omega / (2 * np.pi)
+        order = np.lexsort((n2, n1, f))
+        n1, n2, k1, k2, k_total, omega, f = (a[order] for a in (n1, n2, k1, k2, k_total, omega, f))
+        
+        # Twist selection rule for every (angle, mode)
+        twist_constraint = n2[None, :] + n1[None, :] * thetas[:, None] / (2 * np.pi)
+        allowed = np.abs(twist_constraint - np.round(twist_constraint)) < 0.01
+        n_allowed = allowed.sum(axis=1)
+        if n_modes is None:
+            n_modes = int(n_allowed.max()) if len(thetas) else 0
+        
+        # Compact allowed modes to the front of each row, keeping frequency order
+        idx = np.argsort(~allowed, axis=1, kind='stable')
+        valid = np.take_along_axis(allowed, idx, axis=1)
+        
+        # Degeneracy: run lengths of equal frequency among the allowed modes
+        f_allowed = np.where(valid, f[idx], np.nan)
+        new_run = np.ones(idx.shape, dtype=bool)
+        new_run[:, 1:] = ~np.isclose(f_allowed[:, 1:], f_allowed[:, :-1], rtol=1e-12, atol=0)
+        run_id = np.cumsum(new_run.ravel()) - 1
+        degeneracy = np.bincount(run_id, weights=valid.ravel())[run_id].reshape(idx.shape)
+        
+        idx, valid = idx[:, :n_modes], valid[:, :n_modes]
+        modes = np.zeros(idx.shape, dtype=MODE_DTYPE)
+        for name, values in (('n1', n1), ('n2', n2), ('k1', k1), ('k2', k2),
+                             ('k_total', k_total), ('omega', omega), ('f', f)):
+            modes[name] = np.where(valid, values[idx], 0)
+        modes['f'][~valid] = np.nan
+        modes['degeneracy'] = np.where(valid, degeneracy[:, :n_modes], 0)
+        
+        has_modes = n_allowed > 0
+        f_0 = np.where(has_modes, modes['f'][:, 0] if n_modes else 0.0, 0.0)
+        
+        return {
+            'modes': modes,
+            'n_allowed': n_allowed,
+            'f_0': f_0,
+            'omega_0': 2 * np.pi * f_0,
+            'twist_angles': thetas
+        }
+    
+    def mode_suppression_arrays(self, spectrum: Dict[str, np.ndarray],
+                                n_analyze: int = 30) -> Dict[str, np.ndarray]:
+        """
+        Vectorized odd/even classification of mode_spectrum_arrays output,
+        with the same rules as analyze_mode_suppression (no printing).
+        """
+        modes = spectrum['modes'][:, :n_analyze]
+        valid = ~np.isnan(modes['f'])
+        klein_limit = (spectrum['twist_angles'] == np.pi)[:, None]
+        
+        odd_like = np.where(klein_limit, modes['n1'] % 2 == 1,
+                            (np.abs(modes['n1']) + np.abs(modes['n2'])) % 2 == 1)
+        n_odd = np.sum(odd_like & valid, axis=1)
+        n_even = np.sum(~odd_like & valid, axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            suppression_ratio = np.where(n_odd > 0, n_even / np.maximum(n_odd, 1), np.inf)
+        
+        return {'n_odd': n_odd, 'n_even': n_even, 'suppression_ratio': suppression_ratio}
+    
     def derive_mode_spectrum(self, max_modes: int = 20) -> Dict[str, np.ndarray]:
         """
         Derive allowed modes for twisted torus.
@@ -95,55 +293,23 @@ class TwistedTorus:
         print("DERIVING TWISTED TORUS MODE SPECTRUM")
         print("="*60)
         
-        allowed_modes = []
-        
-        # Search for allowed (n1, n2) mode pairs
-        for n1 in range(-max_modes, max_modes + 1):
-            for n2 in range(-max_modes, max_modes + 1):
-                if n1 == 0 and n2 == 0:
-                    continue
-                
-                # Wave vectors
-                k1 = 2 * np.pi * n1 / self.L1
-                k2 = 2 * np.pi * n2 / self.L2
-                
-                # Check twisted boundary conditions
-                # For twisted torus: n2 = -n1 * θ/(2π) + integer
-                twist_constraint = n2 + n1 * self.theta / (2 * np.pi)
-                
-                if abs(twist_constraint - round(twist_constraint)) < 0.01:
-                    k_total = np.sqrt(k1**2 + k2**2)
-                    omega = self.c * k_total
-                    
-                    allowed_modes.append({
-                        'n1': n1,
-                        'n2': n2,
-                        'k1': k1,
-                        'k2': k2,
-                        'k_total': k_total,
-                        'omega': omega,
-                        'f': omega / (2 * np.pi)
-                    })
-        
-        # Sort by frequency
-        allowed_modes.sort(key=lambda x: x['f'])
+        # Allowed (n1, n2) mode pairs sorted by frequency
+        # For twisted torus: n2 = -n1 * θ/(2π) + integer
+        spectrum = self.mode_spectrum_arrays(max_modes=max_modes)
+        mode_array = spectrum['modes'][0, :spectrum['n_allowed'][0]]
+        positive_modes = [
+            {name: mode[name].item() for name in ('n1', 'n2', 'k1', 'k2', 'k_total', 'omega', 'f')}
+            for mode in mode_array[:30]
+        ]
         
         # Print lowest modes
         print(f"\nLowest frequency modes for θ = {np.degrees(self.theta):.1f}°:")
-        for i, mode in enumerate(allowed_modes[:10]):
-            if mode['f'] > 0:  # Skip negative frequencies
-                print(f"  (n₁={mode['n1']:2d}, n₂={mode['n2']:2d}): f = {mode['f']:.3f} Hz")
-        
-        # Extract positive frequency modes
-        positive_modes = [m for m in allowed_modes if m['f'] > 0]
+        for mode in positive_modes[:10]:
+            print(f"  (n₁={mode['n1']:2d}, n₂={mode['n2']:2d}): f = {mode['f']:.3f} Hz")
         
         # Fundamental frequency
-        if positive_modes:
-            self.omega_0 = positive_modes[0]['omega']
-            self.f_0 = positive_modes[0]['f']
-        else:
-            self.omega_0 = 0
-            self.f_0 = 0
+        self.f_0 = float(spectrum['f_0'][0])
+        self.omega_0 = float(spectrum['omega_0'][0])
         
         # Analyze mode suppression
         self.analyze_mode_suppression(positive_modes)
@@ -211,14 +377,20 @@ class TwistedTorus:
             'suppression_ratio': suppression_ratio
         }
     
-    def optimize_twist_for_echo(self, target_f0: float = 6.65) -> float:
+    def optimize_twist_for_echo(self, target_f0: float = 6.65, n_grid: int = 721) -> float:
         """
         Find optimal twist angle to match Klein bottle frequency.
         
+        The objective |f₀(θ) - target| is evaluated through the pure function
+        twist_fundamental_frequency: a batched grid pre-scan over [0, 2π]
+        followed by a bounded refinement, with no TwistedTorus allocations.
+        
         Parameters:
         -----------
         target_f0 : float
             Target fundamental frequency (Hz)
+        n_grid : int
+            Resolution of the pre-scan grid
             
         Returns:
         --------
@@ -228,19 +400,13 @@ class TwistedTorus:
         print(f"\nOptimizing twist angle for f₀ = {target_f0} Hz...")
         
         def objective(theta):
-            # Create twisted torus with this angle
-            temp_torus = TwistedTorus(self.L1, self.L2, theta)
-            modes = temp_torus.derive_mode_spectrum(max_modes=10)
-            
-            # Minimize difference from target
-            if modes['f_0'] > 0:
-                return abs(modes['f_0'] - target_f0)
-            else:
-                return 1e6  # Penalty for no modes
+            f_0 = twist_fundamental_frequency(theta, self.L1, self.L2, self.c, max_modes=10)
+            # Minimize difference from target (penalty for no modes)
+            return np.where(f_0 > 0, np.abs(f_0 - target_f0), 1e6)
         
         # Search for optimal twist
-        result = minimize_scalar(objective, bounds=(0, 2*np.pi), method='bounded')
-        optimal_theta = result.x
+        theta_opt, _ = _minimize_twist_batched(objective, 1, (0, 2*np.pi), n_grid)
+        optimal_theta = float(theta_opt[0])
         
         print(f"Optimal twist angle: θ = {optimal_theta:.3f} rad = {np.degrees(optimal_theta):.1f}°")
         
@@ -253,30 +419,69 @@ class TwistedTorus:
         
         return optimal_theta
     
-    def plot_twist_dependence(self, save_path: str = None):
+    def solve_twist_for_echo_times(self, target_echo_times, black_hole_masses,
+                                   bounds: Tuple[float, float] = (0, 2*np.pi),
+                                   n_grid: int = 721) -> Dict[str, np.ndarray]:
+        """
+        Solve for the twist angle reproducing each observed echo time.
+        
+        All events are solved together: one batched (n_events × n_grid)
+        pre-scan of the pure echo-time law twist_echo_time, then a vectorized
+        bounded refinement. Nothing is printed and this torus is not modified.
+        
+        Parameters:
+        -----------
+        target_echo_times : array-like
+            Observed echo delays (s)
+        black_hole_masses : array-like
+            Final masses (M☉), broadcast against target_echo_times
+        bounds : (float, float)
+            Allowed twist range (radians)
+        n_grid : int
+            Resolution of the pre-scan grid
+            
+        Returns:
+        --------
+        dict with 'theta', 'echo_time' (achieved) and 'residual' arrays
+        """
+        target_echo_times, black_hole_masses = np.broadcast_arrays(
+            np.asarray(target_echo_times, dtype=float),
+            np.asarray(black_hole_masses, dtype=float))
+        tau_target = target_echo_times.ravel()
+        masses = black_hole_masses.ravel()
+        
+        def objective(theta):
+            tau = twist_echo_time(theta, masses[:, None], self.L1, self.c)
+            return np.abs(tau - tau_target[:, None])
+        
+        theta, residual = _minimize_twist_batched(objective, len(tau_target), bounds, n_grid)
+        
+        shape = target_echo_times.shape
+        return {
+            'theta': theta.reshape(shape),
+            'echo_time': twist_echo_time(theta, masses, self.L1, self.c).reshape(shape),
+            'residual': residual.reshape(shape)
+        }
+    
+    def plot_twist_dependence(self, save_path: str = None, n_angles: int = 50):
         """
         Visualize how mode spectrum depends on twist angle.
+        
+        All angles are evaluated in a single mode_spectrum_arrays call.
         """
         # Sample twist angles
-        twist_angles = np.linspace(0, 2*np.pi, 50)
-        
-        # Track fundamental frequency and suppression ratio
-        f0_values = []
-        suppression_ratios = []
+        twist_angles = np.linspace(0, 2*np.pi, n_angles)
         
         print("\nCalculating twist dependence...")
-        for theta in twist_angles:
-            temp_torus = TwistedTorus(self.L1, self.L2, theta)
-            modes = temp_torus.derive_mode_spectrum(max_modes=10)
-            
-            f0_values.append(modes['f_0'] if modes['f_0'] > 0 else np.nan)
-            
-            # Get suppression ratio
-            if modes['modes']:
-                supp_analysis = temp_torus.analyze_mode_suppression(modes['modes'])
-                suppression_ratios.append(supp_analysis.get('suppression_ratio', 1.0))
-            else:
-                suppression_ratios.append(1.0)
+        sweep = self.mode_spectrum_arrays(max_modes=10, twist_angles=twist_angles, n_modes=20)
+        
+        # Track fundamental frequency and suppression ratio
+        f0_values = np.where(sweep['f_0'] > 0, sweep['f_0'], np.nan)
+        suppression_ratios = np.where(
+            sweep['n_allowed'] > 0,
+            self.mode_suppression_arrays(sweep)['suppression_ratio'],
+            1.0
+        )
         
         # Create plots
         fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12))
@@ -303,12 +508,13 @@ class TwistedTorus:
         twist_samples = [0, np.pi/2, np.pi, 3*np.pi/2]
         colors = ['blue', 'green', 'red', 'purple']
         
+        samples = self.mode_spectrum_arrays(max_modes=20, twist_angles=twist_samples, n_modes=10)
+        
         for i, theta in enumerate(twist_samples):
-            temp_torus = TwistedTorus(self.L1, self.L2, theta)
-            modes = temp_torus.derive_mode_spectrum(max_modes=20)
+            freqs = samples['modes']['f'][i]
+            freqs = freqs[~np.isnan(freqs)]
             
-            if modes['modes']:
-                freqs = [m['f'] for m in modes['modes'][:10]]
+            if len(freqs):
                 ax3.scatter([np.degrees(theta)]*len(freqs), freqs, 
                           color=colors[i], s=50, alpha=0.7,
                           label=f'θ = {np.degrees(theta):.0f}°')
@@ -334,17 +540,8 @@ class TwistedTorus:
         Predict echo time for twisted torus topology.
         """
         # Effective propagation length depends on twist
-        # More twist → longer effective path
-        L_eff = np.sqrt(self.L1**2 + (self.theta * self.L1 / (2*np.pi))**2)
-        
-        tau_0 = L_eff / self.c
-        
-        # Mass scaling
-        M_ref = 62.0
-        alpha = -0.826
-        tau = tau_0 * (black_hole_mass / M_ref)**alpha
-        
-        return tau
+        # More twist → longer effective path; mass scaling (M/62)^-0.826
+        return twist_echo_time(self.theta, black_hole_mass, self.L1, self.c)
 
 
 def main():
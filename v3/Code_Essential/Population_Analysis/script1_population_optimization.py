@@ -13,11 +13,27 @@ detecciones/no-detecciones en toda la población LIGO.
 import numpy as np
 import matplotlib.pyplot as plt
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from scipy.optimize import differential_evolution, minimize
 from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optimizador de un proceso trabajador (fijado por el inicializador del pool)
+_worker_optimizer = None
+
+
+def _init_worker(optimizer):
+    global _worker_optimizer
+    _worker_optimizer = optimizer
+
+
+def _run_restart(bounds, seed, maxiter, popsize, disp):
+    """Un reinicio de differential_evolution en un proceso trabajador"""
+    return _worker_optimizer.run_differential_evolution(bounds, seed, maxiter, popsize, disp)
+
+
 class PopulationOptimizer:
     def __init__(self):
         """Inicializar optimizador poblacional"""
@@ -57,6 +73,21 @@ class PopulationOptimizer:
             print("⚠️ Archivo de resultados no encontrado, generando datos sintéticos")
             self.generate_synthetic_population()
             
+        self.build_event_arrays()
+        
+    def build_event_arrays(self):
+        """Propiedades de los eventos como arrays (una entrada por evento)"""
+        
+        self.masses = np.array([e['mass'] for e in self.events_data], dtype=float)
+        self.distances = np.array([e['distance'] for e in self.events_data], dtype=float)
+        self.network_snrs = np.array([e['network_snr'] for e in self.events_data], dtype=float)
+        self.detected = np.array([bool(e['detected']) for e in self.events_data])
+        significance = np.array([e['significance'] for e in self.events_data], dtype=float)
+        
+        # Bonus por alta significancia observada (solo eventos detectados)
+        self.log_significance_bonus = np.where(self.detected & (significance > 2),
+                                               np.log1p(significance / 10), 0.0)
+            
     def generate_synthetic_population(self):
         """Generar población sintética para demostración"""
         
@@ -94,6 +125,30 @@ class PopulationOptimizer:
             
         print(f"✅ Generados {len(self.events_data)} eventos sintéticos")
         
+    def model_predictions(self, params):
+        """
+        Tiempos de eco y probabilidades de detección (sin recortar)
+        
+        params: array (7,) o (7, S) para S vectores candidatos
+        Devuelve tau_pred y detection_prob de forma (S, eventos) o (eventos,)
+        """
+        
+        params = np.asarray(params, dtype=float)
+        a_tau, b_tau, n_tau, dist_exp, snr_exp, mass_exp, coupling = params[..., None]
+        
+        # Predicción Klein bottle
+        tau_pred = a_tau / (self.masses**n_tau) + b_tau
+        
+        # Probabilidad de detección basada en parámetros físicos
+        distance_factor = (1000 / self.distances)**dist_exp
+        snr_factor = (self.network_snrs / 15)**snr_exp
+        mass_factor = (self.masses / 50)**mass_exp
+        
+        # Probabilidad combinada
+        detection_prob = coupling * distance_factor * snr_factor * mass_factor
+        
+        return tau_pred, detection_prob
+        
     def population_likelihood(self, params):
         """
         Función de likelihood poblacional
@@ -102,52 +157,64 @@ class PopulationOptimizer:
         - params[0:3]: Ley temporal τ = a/M^n + b
         - params[3:6]: Dependencias físicas (distancia, SNR, masa)
         - params[6]: Coupling base
-        """
         
-        a_tau, b_tau, n_tau = params[0:3]
-        dist_exp, snr_exp, mass_exp = params[3:6]  
-        coupling = params[6]
+        Acepta un vector (7,) o una población de candidatos (7, S), como
+        la interfaz vectorized=True de differential_evolution; todos los
+        eventos se evalúan a la vez por broadcasting.
+        """
         
-        # Validar parámetros físicos
-        if a_tau <= 0 or b_tau < 0 or n_tau <= 0 or coupling <= 0:
-            return -1e10  # Likelihood muy baja para parámetros no físicos
-            
-        total_log_likelihood = 0
+        params = np.asarray(params, dtype=float)
+        a_tau, b_tau, n_tau, dist_exp, snr_exp, mass_exp, coupling = params
         
-        for event in self.events_data:
-            # Predicción Klein bottle
-            tau_pred = a_tau / (event['mass']**n_tau) + b_tau
-            
-            # Verificar tau físico
-            if tau_pred <= 0 or tau_pred > 1.0:  # Eco debe ser positivo y razonable
-                return -1e10
-                
-            # Probabilidad de detección basada en parámetros físicos
-            distance_factor = (1000 / event['distance'])**dist_exp
-            snr_factor = (event['network_snr'] / 15)**snr_exp
-            mass_factor = (event['mass'] / 50)**mass_exp
-            
-            # Probabilidad combinada
-            detection_prob = coupling * distance_factor * snr_factor * mass_factor
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            tau_pred, detection_prob = self.model_predictions(params)
             detection_prob = np.clip(detection_prob, 1e-6, 1-1e-6)  # Evitar log(0)
             
-            # Likelihood para este evento
-            if event['detected']:
-                # Evento detectado: queremos alta probabilidad
-                likelihood = detection_prob
-                # Bonus por alta significancia observada
-                if event['significance'] > 2:
-                    likelihood *= (1 + event['significance']/10)
-            else:
-                # Evento no detectado: queremos baja probabilidad
-                likelihood = (1 - detection_prob)
-                
-            total_log_likelihood += np.log(likelihood)
-            
-        return total_log_likelihood
+            # Evento detectado: queremos alta probabilidad (con bonus por significancia)
+            # Evento no detectado: queremos baja probabilidad
+            log_likelihood = np.where(self.detected,
+                                      np.log(detection_prob) + self.log_significance_bonus,
+                                      np.log(1 - detection_prob))
+            total_log_likelihood = np.sum(log_likelihood, axis=-1)
         
-    def optimize_population_parameters(self):
-        """Optimizar parámetros sobre toda la población"""
+        # Validar parámetros físicos
+        physical = (a_tau > 0) & (b_tau >= 0) & (n_tau > 0) & (coupling > 0)
+        # Verificar tau físico: eco positivo y razonable en todos los eventos
+        physical &= np.all((tau_pred > 0) & (tau_pred <= 1.0), axis=-1)
+        
+        # Likelihood muy baja para parámetros no físicos
+        total_log_likelihood = np.where(physical, total_log_likelihood, -1e10)
+        return total_log_likelihood if params.ndim == 2 else float(total_log_likelihood)
+        
+    def negative_log_likelihood(self, params):
+        """Objetivo a minimizar por differential_evolution"""
+        return -self.population_likelihood(params)
+        
+    def run_differential_evolution(self, bounds, seed, maxiter=200, popsize=20, disp=False):
+        """Un intento de optimización con toda la población evaluada por llamada"""
+        
+        return differential_evolution(
+            self.negative_log_likelihood,  # Minimizar -log_likelihood
+            bounds,
+            maxiter=maxiter,
+            popsize=popsize,
+            disp=disp,
+            seed=seed,
+            atol=1e-6,
+            tol=1e-6,
+            vectorized=True,
+            updating='deferred'
+        )
+        
+    def optimize_population_parameters(self, n_restarts=3, n_workers=None,
+                                       maxiter=200, popsize=20):
+        """
+        Optimizar parámetros sobre toda la población
+        
+        Los reinicios (semillas 42, 43, ...) son independientes y se
+        ejecutan en n_workers procesos (por defecto uno por CPU); el
+        resultado no depende del número de procesos.
+        """
         
         print(f"\n" + "="*70)
         print("OPTIMIZACIÓN POBLACIONAL - TODOS LOS EVENTOS")
@@ -171,19 +238,22 @@ class PopulationOptimizer:
         best_result = None
         best_likelihood = -1e10
         
-        for attempt in range(3):
-            print(f"\nIntento {attempt + 1}/3...")
-            
-            result = differential_evolution(
-                lambda x: -self.population_likelihood(x),  # Minimizar -log_likelihood
-                bounds,
-                maxiter=200,
-                popsize=20,
-                disp=True,
-                seed=42 + attempt,
-                atol=1e-6,
-                tol=1e-6
-            )
+        seeds = [42 + attempt for attempt in range(n_restarts)]
+        n_workers = min(n_workers or os.cpu_count() or 1, n_restarts)
+        print(f"Intentos: {n_restarts} en {n_workers} proceso(s)")
+        
+        if n_workers == 1:
+            results = [self.run_differential_evolution(bounds, seed, maxiter, popsize, disp=True)
+                       for seed in seeds]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                futures = [pool.submit(_run_restart, bounds, seed, maxiter, popsize, False)
+                           for seed in seeds]
+                results = [future.result() for future in futures]
+        
+        for attempt, result in enumerate(results):
+            print(f"\nIntento {attempt + 1}/{n_restarts} (semilla {seeds[attempt]})...")
             
             likelihood = -result.fun
             print(f"Likelihood obtenido: {likelihood:.2f}")
@@ -224,27 +294,9 @@ class PopulationOptimizer:
         print(f"\n📊 EVALUACIÓN DEL AJUSTE POBLACIONAL:")
         
         # Calcular predicciones vs observaciones
-        predictions = []
-        observations = []
-        tau_predictions = []
-        
-        for event in self.events_data:
-            # Predicciones del modelo
-            tau_pred = a_tau / (event['mass']**n_tau) + b_tau
-            tau_predictions.append(tau_pred)
-            
-            distance_factor = (1000 / event['distance'])**dist_exp
-            snr_factor = (event['network_snr'] / 15)**snr_exp
-            mass_factor = (event['mass'] / 50)**mass_exp
-            
-            detection_prob = coupling * distance_factor * snr_factor * mass_factor
-            detection_prob = np.clip(detection_prob, 0, 1)
-            
-            predictions.append(detection_prob)
-            observations.append(1 if event['detected'] else 0)
-            
-        predictions = np.array(predictions)
-        observations = np.array(observations)
+        tau_predictions, predictions = self.model_predictions(params)
+        predictions = np.clip(predictions, 0, 1)
+        observations = self.detected.astype(int)
         
         # Estadísticas de ajuste
         correlation = np.corrcoef(predictions, observations)[0,1]
@@ -280,11 +332,191 @@ class PopulationOptimizer:
         
         return predictions, observations
         
-    def goodness_of_fit_tests(self, predictions, observations):
+    @staticmethod
+    def threshold_counts(scores, labels):
+        """
+        TP y FP acumulados para todos los umbrales a partir de una sola ordenación
+        
+        scores, labels: arrays (..., n); las filas se procesan de forma independiente
+        Devuelve tp, fp de forma (..., n + 1) (empezando en el umbral +∞).
+        Los empates se agrupan: dentro de un grupo de scores iguales todos los
+        puntos toman el valor del final del grupo, así que no añaden área.
+        """
+        
+        scores = np.asarray(scores, dtype=float)
+        labels = np.asarray(labels, dtype=bool)
+        order = np.argsort(-scores, axis=-1, kind='stable')
+        sorted_scores = np.take_along_axis(scores, order, axis=-1)
+        sorted_labels = np.take_along_axis(labels, order, axis=-1)
+        
+        tp = np.cumsum(sorted_labels, axis=-1)
+        fp = np.cumsum(~sorted_labels, axis=-1)
+        
+        # Índice del último elemento del grupo de empate de cada posición
+        n = scores.shape[-1]
+        is_last = np.ones(scores.shape, dtype=bool)
+        is_last[..., :-1] = sorted_scores[..., :-1] != sorted_scores[..., 1:]
+        group_end = np.where(is_last, np.arange(n), n - 1)
+        group_end = np.flip(np.minimum.accumulate(np.flip(group_end, axis=-1), axis=-1), axis=-1)
+        tp = np.take_along_axis(tp, group_end, axis=-1)
+        fp = np.take_along_axis(fp, group_end, axis=-1)
+        
+        zeros = np.zeros(scores.shape[:-1] + (1,), dtype=tp.dtype)
+        return np.concatenate([zeros, tp], axis=-1), np.concatenate([zeros, fp], axis=-1)
+        
+    @staticmethod
+    def calibration_bins(predictions, observations, n_bins=5):
+        """
+        Confianza y precisión por bin (lower, upper] de la probabilidad predicha
+        
+        predictions, observations: arrays (..., n)
+        Devuelve counts, confidence, accuracy de forma (..., n_bins); NaN en bins vacíos.
+        """
+        
+        predictions = np.asarray(predictions, dtype=float)
+        observations = np.asarray(observations, dtype=float)
+        rows = int(np.prod(predictions.shape[:-1], dtype=int))
+        
+        bin_index = np.ceil(predictions * n_bins).astype(int) - 1  # p = 0 queda fuera
+        valid = (bin_index >= 0) & (bin_index < n_bins)
+        flat = (np.arange(rows).reshape(predictions.shape[:-1] + (1,)) * n_bins +
+                np.clip(bin_index, 0, n_bins - 1))[valid]
+        
+        shape = predictions.shape[:-1] + (n_bins,)
+        counts = np.bincount(flat, minlength=rows * n_bins).reshape(shape)
+        pred_sum = np.bincount(flat, predictions[valid], minlength=rows * n_bins).reshape(shape)
+        obs_sum = np.bincount(flat, observations[valid], minlength=rows * n_bins).reshape(shape)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return counts, pred_sum / counts, obs_sum / counts
+        
+    def threshold_curves(self, predictions, observations, n_bins=5):
+        """
+        Curvas ROC y precision-recall exactas (todos los umbrales) y calibración
+        
+        predictions, observations: arrays (..., n), una población por fila
+        """
+        
+        tp, fp = self.threshold_counts(predictions, observations)
+        positives = tp[..., -1:]
+        negatives = fp[..., -1:]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tpr = tp / positives
+            fpr = fp / negatives
+            precision = np.where(tp + fp > 0, tp / np.maximum(tp + fp, 1), 1.0)
+        
+        # AUC por trapecios sobre todos los umbrales; precisión promedio por escalones
+        auc = np.trapezoid(tpr, fpr, axis=-1)
+        average_precision = np.sum(np.diff(tpr, axis=-1) * precision[..., 1:], axis=-1)
+        
+        counts, confidence, accuracy = self.calibration_bins(predictions, observations, n_bins)
+        
+        return {
+            'fpr': fpr,
+            'tpr': tpr,
+            'precision': precision,
+            'recall': tpr,
+            'auc': auc,
+            'average_precision': average_precision,
+            'calibration_counts': counts,
+            'calibration_confidence': confidence,
+            'calibration_accuracy': accuracy
+        }
+        
+    @staticmethod
+    def _curves_on_grid(curves, grid):
+        """TPR a FPR fijos (escalón) y precisión interpolada a recall fijos, por fila"""
+        
+        fpr, tpr = curves['fpr'], curves['tpr']
+        recall, precision = curves['recall'], curves['precision']
+        rows = np.arange(fpr.shape[0])[:, None]
+        
+        # Una sola búsqueda sobre todas las filas desplazadas (curvas monótonas en [0, 1])
+        offset = 2.0 * rows
+        n_points = fpr.shape[1]
+        
+        roc_index = np.searchsorted((np.nan_to_num(fpr, nan=0.0) + offset).ravel(),
+                                    (grid[None, :] + offset).ravel(), side='right') - 1
+        roc_index = roc_index.reshape(len(rows), -1) - rows * n_points
+        tpr_grid = np.take_along_axis(tpr, roc_index, axis=1)
+        
+        # Precisión interpolada: máxima precisión con recall ≥ r
+        envelope = np.flip(np.maximum.accumulate(np.flip(precision, axis=1), axis=1), axis=1)
+        pr_index = np.searchsorted((np.nan_to_num(recall, nan=0.0) + offset).ravel(),
+                                   (grid[None, :] + offset).ravel(), side='left')
+        pr_index = np.minimum(pr_index.reshape(len(rows), -1) - rows * n_points, n_points - 1)
+        precision_grid = np.take_along_axis(envelope, pr_index, axis=1)
+        
+        return tpr_grid, precision_grid
+        
+    def bootstrap_curve_band(self, predictions, observations, n_bootstrap=1000,
+                             confidence=0.95, grid_size=101, n_bins=5, seed=42,
+                             batch_size=None):
+        """
+        Banda de confianza bootstrap de las curvas ROC, PR y calibración
+        
+        Los remuestreos se evalúan por lotes (una matriz de índices por lote),
+        cada uno con una sola ordenación por fila.
+        
+        Devuelve curvas sobre una rejilla de grid_size puntos (TPR vs FPR,
+        precisión vs recall), los percentiles de la banda, y los intervalos
+        de AUC, precisión promedio y precisión por bin de calibración.
+        """
+        
+        predictions = np.asarray(predictions, dtype=float)
+        observations = np.asarray(observations, dtype=int)
+        n = len(predictions)
+        grid = np.linspace(0, 1, grid_size)
+        batch_size = batch_size or max(1, 4_000_000 // max(n, 1))
+        rng = np.random.default_rng(seed)
+        
+        tpr_grid, precision_grid, auc, ap, accuracy = [], [], [], [], []
+        for start in range(0, n_bootstrap, batch_size):
+            rows = min(batch_size, n_bootstrap - start)
+            index = rng.integers(0, n, size=(rows, n))
+            curves = self.threshold_curves(predictions[index], observations[index], n_bins)
+            tpr_b, precision_b = self._curves_on_grid(curves, grid)
+            tpr_grid.append(tpr_b)
+            precision_grid.append(precision_b)
+            auc.append(curves['auc'])
+            ap.append(curves['average_precision'])
+            accuracy.append(curves['calibration_accuracy'])
+            
+        tpr_grid, precision_grid = np.concatenate(tpr_grid), np.concatenate(precision_grid)
+        auc, ap, accuracy = np.concatenate(auc), np.concatenate(ap), np.concatenate(accuracy)
+        
+        # Remuestreos sin positivos o sin negativos no definen curvas
+        valid = np.isfinite(auc)
+        q = [50 * (1 - confidence), 50 * (1 + confidence)]
+        
+        central = self.threshold_curves(predictions, observations, n_bins)
+        tpr_central, precision_central = self._curves_on_grid(
+            {name: np.atleast_2d(central[name]) for name in ('fpr', 'tpr', 'recall', 'precision')}, grid)
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return {
+                'grid': grid,
+                'n_valid_resamples': int(valid.sum()),
+                'tpr': tpr_central[0],
+                'tpr_band': np.nanpercentile(tpr_grid[valid], q, axis=0),
+                'precision': precision_central[0],
+                'precision_band': np.nanpercentile(precision_grid[valid], q, axis=0),
+                'auc_interval': np.percentile(auc[valid], q) if valid.any() else np.full(2, np.nan),
+                'average_precision_interval': (np.percentile(ap[valid], q) if valid.any()
+                                               else np.full(2, np.nan)),
+                'calibration_accuracy_band': np.nanpercentile(accuracy[valid], q, axis=0)
+            }
+        
+    def goodness_of_fit_tests(self, predictions, observations, n_bootstrap=1000):
         """Tests estadísticos de bondad de ajuste"""
         
         print(f"\n🔍 TESTS DE BONDAD DE AJUSTE:")
         
+        predictions = np.asarray(predictions, dtype=float)
+        observations = np.asarray(observations, dtype=int)
+        
         # 1. Kolmogorov-Smirnov test
         detected_probs = predictions[observations == 1]
         undetected_probs = predictions[observations == 0]
@@ -297,42 +529,32 @@ class PopulationOptimizer:
         brier_score = np.mean((predictions - observations)**2)
         print(f"   Brier score (calibración): {brier_score:.4f} (menor = mejor)")
         
-        # 3. AUC-ROC simulado
-        thresholds = np.linspace(0, 1, 101)
-        tpr_values = []
-        fpr_values = []
-        
-        for threshold in thresholds:
-            predicted_detections = predictions > threshold
-            
-            tp = np.sum((predicted_detections == 1) & (observations == 1))
-            fp = np.sum((predicted_detections == 1) & (observations == 0))
-            tn = np.sum((predicted_detections == 0) & (observations == 0))
-            fn = np.sum((predicted_detections == 0) & (observations == 1))
-            
-            tpr = tp / (tp + fn) if (tp + fn) > 0 else 0
-            fpr = fp / (fp + tn) if (fp + tn) > 0 else 0
-            
-            tpr_values.append(tpr)
-            fpr_values.append(fpr)
-            
-        # Calcular AUC aproximado
-        auc = np.trapz(tpr_values, fpr_values)
-        print(f"   AUC-ROC: {auc:.4f} (0.5 = azar, 1.0 = perfecto)")
+        # 3. ROC y precision-recall sobre todos los umbrales (una sola ordenación)
+        curves = self.threshold_curves(predictions, observations)
+        band = self.bootstrap_curve_band(predictions, observations, n_bootstrap=n_bootstrap)
+        auc_low, auc_high = band['auc_interval']
+        ap_low, ap_high = band['average_precision_interval']
+        print(f"   AUC-ROC: {curves['auc']:.4f} [{auc_low:.4f}, {auc_high:.4f}] (0.5 = azar, 1.0 = perfecto)")
+        print(f"   Precisión promedio (PR): {curves['average_precision']:.4f} [{ap_low:.4f}, {ap_high:.4f}]"
+              f" (azar = {observations.mean():.3f})")
         
         # 4. Calibración por bins
-        n_bins = 5
-        bin_boundaries = np.linspace(0, 1, n_bins + 1)
-        bin_lowers = bin_boundaries[:-1]
-        bin_uppers = bin_boundaries[1:]
+        n_bins = len(curves['calibration_counts'])
         
-        print(f"   Calibración por bins:")
+        print(f"   Calibración por bins (banda bootstrap {band['n_valid_resamples']} remuestreos):")
         for i in range(n_bins):
-            in_bin = (predictions > bin_lowers[i]) & (predictions <= bin_uppers[i])
-            if np.sum(in_bin) > 0:
-                bin_confidence = np.mean(predictions[in_bin])
-                bin_accuracy = np.mean(observations[in_bin])
-                print(f"     Bin {i+1}: Confianza = {bin_confidence:.3f}, Precisión = {bin_accuracy:.3f}")
+            if curves['calibration_counts'][i] > 0:
+                bin_confidence = curves['calibration_confidence'][i]
+                bin_accuracy = curves['calibration_accuracy'][i]
+                low, high = band['calibration_accuracy_band'][:, i]
+                print(f"     Bin {i+1}: Confianza = {bin_confidence:.3f}, Precisión = {bin_accuracy:.3f}"
+                      f" [{low:.3f}, {high:.3f}]")
+                
+        return {
+            'brier_score': float(brier_score),
+            'curves': curves,
+            'bootstrap_band': band
+        }
                 
     def save_optimal_parameters(self, params):
         """Guardar parámetros óptimos para Script 2"""
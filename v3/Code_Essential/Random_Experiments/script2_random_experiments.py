@@ -23,14 +23,129 @@ from scipy import stats
 import warnings
 from datetime import datetime
 import os
+import sys
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..',
+                             'Non_Orientable_Surfaces_Echo_Analysis', 'Analysis'))
+
+from parallel_chunks import chunk_sizes, map_chunks
+
+# Métricas por experimento (columnas del motor vectorizado)
+EXPERIMENT_COLUMNS = ('experiment_id', 'sample_size', 'n_detected', 'detection_rate',
+                      'avg_significance', 'max_significance', 'combined_sigma',
+                      'combined_p_value', 'correlation', 'binomial_p_value')
+
+# Máximo de experimentos con detalle por experimento (eventos y significancias) en el JSON
+DETAILED_RESULTS_MAX = 1000
+
+
+def binomial_two_sided_pvalue(k, n, p):
+    """
+    p-value bilateral del test binomial exacto, vectorizado
+    
+    Mismo criterio que scipy.stats.binomtest (suma de probabilidades no
+    mayores que la observada); las colas se evalúan con binom.cdf / binom.sf.
+    k, p: arrays (experimentos,); n: entero
+    """
+    
+    k = np.asarray(k)
+    p = np.asarray(p, dtype=float)
+    j = np.arange(n + 1)
+    pmf = stats.binom.pmf(j[None, :], n, p[:, None])
+    d = np.take_along_axis(pmf, k[:, None], axis=1)[:, 0] * (1 + 1e-7)
+    mean = n * p
+    
+    # Cola opuesta: número de valores con probabilidad ≤ la observada
+    upper = j[None, :] >= np.ceil(mean)[:, None]
+    lower = j[None, :] <= np.floor(mean)[:, None]
+    y_upper = np.sum(upper & (pmf <= d[:, None]), axis=1)
+    y_lower = np.sum(lower & (pmf <= d[:, None]), axis=1)
+    
+    pval_low = stats.binom.cdf(k, n, p) + stats.binom.sf(n - y_upper, n, p)
+    pval_high = stats.binom.cdf(y_lower - 1, n, p) + stats.binom.sf(k - 1, n, p)
+    pval = np.where(k < mean, pval_low, np.where(k > mean, pval_high, 1.0))
+    return np.minimum(pval, 1.0)
+
+
+def _run_experiment_chunk(seed_sequence, first_id, n_experiments, sample_size,
+                          predictions, detected, significance, keep_indices):
+    """
+    Bloque de experimentos aleatorios con su propio Generator
+    
+    Todas las submuestras (sin reemplazo) se sortean a la vez y las
+    métricas se calculan por experimento con operaciones sobre arrays.
+    """
+    
+    rng = np.random.default_rng(seed_sequence)
+    n_population = len(predictions)
+    
+    # Selección aleatoria sin reemplazo: k menores de una permutación aleatoria por fila
+    keys = rng.random((n_experiments, n_population))
+    if sample_size < n_population:
+        selected = np.argpartition(keys, sample_size - 1, axis=1)[:, :sample_size]
+    else:
+        selected = np.argsort(keys, axis=1)
+    
+    pred = predictions[selected]
+    det = detected[selected]
+    sig = np.where(det, significance[selected], 0.0)
+    
+    # Estadísticas del experimento
+    n_detected = det.sum(axis=1)
+    detection_rate = n_detected / sample_size
+    avg_significance = np.where(n_detected > 0, sig.sum(axis=1) / np.maximum(n_detected, 1), 0.0)
+    max_significance = np.where(n_detected > 0, np.where(det, sig, -np.inf).max(axis=1), 0.0)
+    
+    # Correlación predicción-observación (0 si todas las observaciones son iguales)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pc = pred - pred.mean(axis=1, keepdims=True)
+        dc = det - det.mean(axis=1, keepdims=True)
+        correlation = (pc * dc).sum(axis=1) / np.sqrt((pc**2).sum(axis=1) * (dc**2).sum(axis=1))
+    correlation = np.where((n_detected > 0) & (n_detected < sample_size), correlation, 0.0)
+    
+    # Test binomial: ¿Es la tasa observada consistente con predicciones?
+    expected_detections = pred.sum(axis=1)
+    binomial_p_value = np.ones(n_experiments)
+    tested = expected_detections > 0
+    if tested.any():
+        binomial_p_value[tested] = binomial_two_sided_pvalue(
+            n_detected[tested], sample_size, expected_detections[tested] / sample_size)
+    
+    # Significancia combinada: método Fisher sobre las detecciones
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_p = np.where(det, np.log(2 * (1 - stats.norm.cdf(sig))), 0.0)
+        chi2_stat = -2 * log_p.sum(axis=1)
+        combined_p_value = np.where(n_detected > 0,
+                                    1 - stats.chi2.cdf(chi2_stat, 2 * np.maximum(n_detected, 1)), 1.0)
+        combined_sigma = np.where(combined_p_value > 0, stats.norm.ppf(1 - combined_p_value/2),
+                                  10.0)  # Muy significativo
+    combined_sigma = np.where(n_detected > 0, combined_sigma, 0.0)
+    
+    chunk = {
+        'experiment_id': first_id + np.arange(n_experiments),
+        'sample_size': np.full(n_experiments, sample_size),
+        'n_detected': n_detected,
+        'detection_rate': detection_rate,
+        'avg_significance': avg_significance,
+        'max_significance': max_significance,
+        'combined_sigma': combined_sigma,
+        'combined_p_value': combined_p_value,
+        'correlation': correlation,
+        'binomial_p_value': binomial_p_value
+    }
+    if keep_indices:
+        chunk['selected_indices'] = selected
+    return chunk
+
+
 class RandomExperimentRunner:
     def __init__(self):
         """Inicializar runner de experimentos aleatorios"""
         
         self.load_optimal_parameters()
         self.load_population_data()
+        self.build_population_arrays()
         
         print(f"✅ Script 2: Experimentos Aleatorios Libres de Sesgo")
         print(f"📊 Población disponible: {len(self.population_data)} eventos")
@@ -175,6 +290,64 @@ class RandomExperimentRunner:
         detection_prob = self.coupling * distance_factor * snr_factor * mass_factor
         return np.clip(detection_prob, 0, 1)
         
+    def build_population_arrays(self):
+        """Predicciones y observaciones de la población como arrays"""
+        
+        columns = {key: np.array([e[key] for e in self.population_data], dtype=float)
+                   for key in ('mass', 'distance', 'network_snr')}
+        self.population_predictions = np.asarray(self.calculate_detection_probability(columns), dtype=float)
+        self.population_detected = np.array([bool(e['detected']) for e in self.population_data])
+        self.population_significance = np.array([e['significance'] for e in self.population_data],
+                                                dtype=float)
+        self.population_names = np.array([e['name'] for e in self.population_data])
+        
+    def run_experiment_engine(self, n_experiments, sample_size, seed=42, chunk_size=10000,
+                              n_workers=None, keep_indices=True):
+        """
+        Motor vectorizado de experimentos aleatorios
+        
+        Los experimentos se reparten en bloques de chunk_size; cada bloque usa
+        un Generator propio generado con SeedSequence(seed).spawn, y los bloques
+        se distribuyen entre n_workers procesos (por defecto uno por CPU). El
+        resultado depende solo de seed y chunk_size, no del número de procesos.
+        
+        Devuelve un dict de arrays (una entrada por experimento) con las
+        columnas de EXPERIMENT_COLUMNS y, si keep_indices, 'selected_indices'.
+        """
+        
+        sample_size = min(sample_size, len(self.population_data))
+        sizes = chunk_sizes(n_experiments, chunk_size=chunk_size)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+        args = [(seed_sequences[i], i * chunk_size + 1, size, sample_size,
+                 self.population_predictions, self.population_detected,
+                 self.population_significance, keep_indices)
+                for i, size in enumerate(sizes)]
+        chunks = map_chunks(_run_experiment_chunk, args, n_workers)
+                
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+        
+    def experiment_records(self, columns):
+        """Resultados del motor como lista de dicts (un experimento por entrada)"""
+        
+        records = []
+        for i in range(len(columns['experiment_id'])):
+            record = {name: columns[name][i].item() for name in EXPERIMENT_COLUMNS}
+            if 'selected_indices' in columns:
+                selected = columns['selected_indices'][i]
+                record['selected_events'] = self.population_names[selected].tolist()
+                record['individual_significances'] = \
+                    self.population_significance[selected][self.population_detected[selected]].tolist()
+            records.append(record)
+        return records
+        
+    @staticmethod
+    def experiment_columns(results):
+        """Columnas (arrays) a partir de una lista de resultados o del motor"""
+        
+        if isinstance(results, dict):
+            return results
+        return {name: np.array([r[name] for r in results]) for name in EXPERIMENT_COLUMNS}
+        
     def run_single_random_experiment(self, sample_size, experiment_id):
         """Ejecutar un experimento aleatorio individual"""
         
@@ -258,8 +431,16 @@ class RandomExperimentRunner:
         
         return experiment_result
         
-    def run_multiple_experiments(self, n_experiments=100, sample_size=20):
-        """Ejecutar múltiples experimentos aleatorios"""
+    def run_multiple_experiments(self, n_experiments=100, sample_size=20, seed=42,
+                                 chunk_size=10000, n_workers=None, detailed=None):
+        """
+        Ejecutar múltiples experimentos aleatorios
+        
+        Usa el motor vectorizado (run_experiment_engine) y devuelve sus columnas
+        (dict de arrays, una entrada por experimento). El detalle por experimento
+        (eventos seleccionados y significancias) solo se construye y se guarda si
+        detailed=True; por defecto, cuando n_experiments <= DETAILED_RESULTS_MAX.
+        """
         
         print(f"\n" + "="*70)
         print(f"EXPERIMENTOS ALEATORIOS LIBRES DE SESGO")
@@ -268,41 +449,42 @@ class RandomExperimentRunner:
         print(f"Tamaño de muestra por experimento: {sample_size}")
         print(f"Población total disponible: {len(self.population_data)}")
         
-        results = []
+        print(f"\nEjecutando experimentos (semilla {seed}, bloques de {chunk_size})...")
         
-        # Fijar semilla para la serie completa (pero cada experimento será diferente)
-        np.random.seed(42)
-        
-        print(f"\nEjecutando experimentos...")
-        for i in range(n_experiments):
-            if (i + 1) % 20 == 0:
-                print(f"  Progreso: {i+1}/{n_experiments}")
-                
-            # Cada experimento tiene su propia semilla aleatoria
-            np.random.seed(42 + i)
-            
-            result = self.run_single_random_experiment(sample_size, i+1)
-            results.append(result)
+        # Cada bloque de experimentos tiene su propio Generator (sin estado global)
+        if detailed is None:
+            detailed = n_experiments <= DETAILED_RESULTS_MAX
+        columns = self.run_experiment_engine(n_experiments, sample_size, seed=seed,
+                                             chunk_size=chunk_size, n_workers=n_workers,
+                                             keep_indices=detailed)
+        detailed_results = self.experiment_records(columns) if detailed else None
             
         print(f"✅ {n_experiments} experimentos completados")
         
         # Análisis estadístico de los resultados
-        self.analyze_experiment_results(results)
+        self.analyze_experiment_results(columns, detailed_results)
         
-        return results
+        return columns
+        
+    def analyze_experiment_results(self, results, detailed_results=None):
+        """
+        Analizar estadísticamente los resultados de experimentos múltiples
         
-    def analyze_experiment_results(self, results):
-        """Analizar estadísticamente los resultados de experimentos múltiples"""
+        results: lista de resultados o columnas del motor; detailed_results
+        (lista de dicts por experimento) se guarda junto al resumen si se da.
+        """
         
         print(f"\n📊 ANÁLISIS ESTADÍSTICO DE EXPERIMENTOS MÚLTIPLES:")
         print("-" * 60)
         
-        # Extraer métricas
-        detection_rates = [r['detection_rate'] for r in results]
-        avg_significances = [r['avg_significance'] for r in results if r['avg_significance'] > 0]
-        max_significances = [r['max_significance'] for r in results if r['max_significance'] > 0]
-        combined_sigmas = [r['combined_sigma'] for r in results if r['combined_sigma'] > 0]
-        correlations = [r['correlation'] for r in results if not np.isnan(r['correlation'])]
+        # Extraer métricas (acepta la lista de resultados o las columnas del motor)
+        columns = self.experiment_columns(results)
+        n_results = len(columns['experiment_id'])
+        detection_rates = columns['detection_rate']
+        avg_significances = columns['avg_significance'][columns['avg_significance'] > 0]
+        max_significances = columns['max_significance'][columns['max_significance'] > 0]
+        combined_sigmas = columns['combined_sigma'][columns['combined_sigma'] > 0]
+        correlations = columns['correlation'][~np.isnan(columns['correlation'])]
         
         # Estadísticas descriptivas
         print(f"TASAS DE DETECCIÓN:")
@@ -310,42 +492,42 @@ class RandomExperimentRunner:
         print(f"  Rango: {np.min(detection_rates):.1%} - {np.max(detection_rates):.1%}")
         print(f"  Mediana: {np.median(detection_rates):.1%}")
         
-        if avg_significances:
+        if len(avg_significances):
             print(f"\nSIGNIFICANCIA PROMEDIO (experimentos con detecciones):")
             print(f"  Promedio: {np.mean(avg_significances):.2f}σ ± {np.std(avg_significances):.2f}σ")
             print(f"  Rango: {np.min(avg_significances):.2f}σ - {np.max(avg_significances):.2f}σ")
             print(f"  Mediana: {np.median(avg_significances):.2f}σ")
             
-        if combined_sigmas:
+        if len(combined_sigmas):
             print(f"\nSIGNIFICANCIA COMBINADA (experimentos con detecciones):")
             print(f"  Promedio: {np.mean(combined_sigmas):.2f}σ ± {np.std(combined_sigmas):.2f}σ")
             print(f"  Máxima: {np.max(combined_sigmas):.2f}σ")
             print(f"  Mediana: {np.median(combined_sigmas):.2f}σ")
             
         # Frecuencia de detecciones significativas
-        experiments_with_detections = sum(1 for r in results if r['n_detected'] > 0)
-        experiments_with_3sigma = sum(1 for r in results if r['max_significance'] >= 3.0)
-        experiments_with_5sigma = sum(1 for r in results if r['combined_sigma'] >= 5.0)
+        experiments_with_detections = int(np.sum(columns['n_detected'] > 0))
+        experiments_with_3sigma = int(np.sum(columns['max_significance'] >= 3.0))
+        experiments_with_5sigma = int(np.sum(columns['combined_sigma'] >= 5.0))
         
         print(f"\nFRECUENCIA DE RESULTADOS SIGNIFICATIVOS:")
-        print(f"  Experimentos con detecciones: {experiments_with_detections}/{len(results)} ({experiments_with_detections/len(results):.1%})")
-        print(f"  Experimentos con detecciones >3σ: {experiments_with_3sigma}/{len(results)} ({experiments_with_3sigma/len(results):.1%})")
-        print(f"  Experimentos con significancia global >5σ: {experiments_with_5sigma}/{len(results)} ({experiments_with_5sigma/len(results):.1%})")
+        print(f"  Experimentos con detecciones: {experiments_with_detections}/{n_results} ({experiments_with_detections/n_results:.1%})")
+        print(f"  Experimentos con detecciones >3σ: {experiments_with_3sigma}/{n_results} ({experiments_with_3sigma/n_results:.1%})")
+        print(f"  Experimentos con significancia global >5σ: {experiments_with_5sigma}/{n_results} ({experiments_with_5sigma/n_results:.1%})")
         
         # Test de consistencia con modelo nulo
         # H0: No hay ecos Klein (tasa de detección esperada = tasa de falsos positivos)
         null_detection_rate = 0.05  # 5% falsos positivos
         
-        observed_rates_above_null = sum(1 for rate in detection_rates if rate > null_detection_rate)
+        observed_rates_above_null = int(np.sum(detection_rates > null_detection_rate))
         try:
-            p_value_null_test = stats.binom_test(observed_rates_above_null, len(results), 0.5)
+            p_value_null_test = stats.binom_test(observed_rates_above_null, n_results, 0.5)
         except AttributeError:
-            result = stats.binomtest(observed_rates_above_null, len(results), 0.5)
+            result = stats.binomtest(observed_rates_above_null, n_results, 0.5)
             p_value_null_test = result.pvalue
         
         print(f"\nTEST DE CONSISTENCIA CON MODELO NULO:")
         print(f"  Tasa nula esperada: {null_detection_rate:.1%}")
-        print(f"  Experimentos por encima de tasa nula: {observed_rates_above_null}/{len(results)}")
+        print(f"  Experimentos por encima de tasa nula: {observed_rates_above_null}/{n_results}")
         print(f"  p-value test nulo: {p_value_null_test:.4f}")
         
         if p_value_null_test < 0.05:
@@ -354,30 +536,37 @@ class RandomExperimentRunner:
             print(f"  CONCLUSIÓN: Consistente con modelo nulo")
             
         # Distribución de correlaciones
-        if correlations:
+        if len(correlations):
             print(f"\nCORRELACIONES PREDICCIÓN-OBSERVACIÓN:")
             print(f"  Promedio: {np.mean(correlations):.3f} ± {np.std(correlations):.3f}")
-            print(f"  Correlaciones positivas: {sum(1 for c in correlations if c > 0)}/{len(correlations)}")
+            print(f"  Correlaciones positivas: {int(np.sum(correlations > 0))}/{len(correlations)}")
             
         # Guardar resultados detallados
-        self.save_experiment_results(results)
+        self.save_experiment_results(results, detailed_results)
         
         return results
         
-    def save_experiment_results(self, results):
-        """Guardar resultados detallados de experimentos"""
+    def save_experiment_results(self, results, detailed_results=None):
+        """
+        Guardar resumen y, si se dispone, detalle por experimento
+        
+        El detalle se toma de detailed_results o, si results es una lista de
+        resultados, de la propia lista; las columnas del motor solo dan el resumen.
+        """
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Preparar resumen ejecutivo
-        detection_rates = [r['detection_rate'] for r in results]
-        combined_sigmas = [r['combined_sigma'] for r in results if r['combined_sigma'] > 0]
+        columns = self.experiment_columns(results)
+        n_results = len(columns['experiment_id'])
+        detection_rates = columns['detection_rate']
+        combined_sigmas = columns['combined_sigma'][columns['combined_sigma'] > 0]
         
         summary = {
             'script2_metadata': {
                 'execution_date': timestamp,
-                'n_experiments': len(results),
-                'sample_size_per_experiment': results[0]['sample_size'] if results else 0,
+                'n_experiments': n_results,
+                'sample_size_per_experiment': int(columns['sample_size'][0]) if n_results else 0,
                 'population_size': len(self.population_data),
                 'method': 'Random sampling without replacement'
             },
@@ -392,17 +581,22 @@ class RandomExperimentRunner:
                 },
                 
                 'significance_stats': {
-                    'combined_sigma_mean': float(np.mean(combined_sigmas)) if combined_sigmas else 0,
-                    'combined_sigma_max': float(np.max(combined_sigmas)) if combined_sigmas else 0,
-                    'experiments_with_detections': sum(1 for r in results if r['n_detected'] > 0),
-                    'experiments_above_3sigma': sum(1 for r in results if r['max_significance'] >= 3.0)
+                    'combined_sigma_mean': float(np.mean(combined_sigmas)) if len(combined_sigmas) else 0,
+                    'combined_sigma_max': float(np.max(combined_sigmas)) if len(combined_sigmas) else 0,
+                    'experiments_with_detections': int(np.sum(columns['n_detected'] > 0)),
+                    'experiments_above_3sigma': int(np.sum(columns['max_significance'] >= 3.0))
                 }
             },
             
-            'optimal_parameters_used': self.optimal_params,
-            'detailed_results': results
+            'optimal_parameters_used': self.optimal_params
         }
         
+        # Detalle por experimento solo si se pidió (no para columnas masivas)
+        if detailed_results is None and not isinstance(results, dict):
+            detailed_results = results
+        if detailed_results is not None:
+            summary['detailed_results'] = detailed_results
+        
         # Guardar resultados completos
         filename = f'random_experiments_results_{timestamp}.json'
         with open(filename, 'w') as f:
@@ -420,11 +614,13 @@ class RandomExperimentRunner:
                      fontsize=16, fontweight='bold')
         
         # Extraer datos para plots
-        detection_rates = [r['detection_rate'] for r in results]
-        avg_significances = [r['avg_significance'] for r in results if r['avg_significance'] > 0]
-        max_significances = [r['max_significance'] for r in results if r['max_significance'] > 0]
-        combined_sigmas = [r['combined_sigma'] for r in results if r['combined_sigma'] > 0]
-        correlations = [r['correlation'] for r in results if not np.isnan(r['correlation'])]
+        columns = self.experiment_columns(results)
+        n_results = len(columns['experiment_id'])
+        detection_rates = columns['detection_rate']
+        avg_significances = columns['avg_significance'][columns['avg_significance'] > 0]
+        max_significances = columns['max_significance'][columns['max_significance'] > 0]
+        combined_sigmas = columns['combined_sigma'][columns['combined_sigma'] > 0]
+        correlations = columns['correlation'][~np.isnan(columns['correlation'])]
         
         # Panel 1: Distribución tasas de detección
         ax1 = axes[0, 0]
@@ -440,7 +636,7 @@ class RandomExperimentRunner:
         
         # Panel 2: Distribución significancias combinadas
         ax2 = axes[0, 1]
-        if combined_sigmas:
+        if len(combined_sigmas):
             ax2.hist(combined_sigmas, bins=15, alpha=0.7, color='lightgreen', edgecolor='black')
             ax2.axvline(np.mean(combined_sigmas), color='red', linestyle='--',
                        label=f'Media: {np.mean(combined_sigmas):.2f}σ')
@@ -454,7 +650,7 @@ class RandomExperimentRunner:
         
         # Panel 3: Correlaciones predicción-observación
         ax3 = axes[0, 2]
-        if correlations:
+        if len(correlations):
             ax3.hist(correlations, bins=15, alpha=0.7, color='orange', edgecolor='black')
             ax3.axvline(np.mean(correlations), color='red', linestyle='--',
                        label=f'Media: {np.mean(correlations):.3f}')
@@ -467,10 +663,10 @@ class RandomExperimentRunner:
         
         # Panel 4: Tasa detección vs significancia
         ax4 = axes[1, 0]
-        valid_results = [r for r in results if r['avg_significance'] > 0]
-        if valid_results:
-            x_vals = [r['detection_rate'] for r in valid_results]
-            y_vals = [r['avg_significance'] for r in valid_results]
+        valid_results = columns['avg_significance'] > 0
+        if valid_results.any():
+            x_vals = detection_rates[valid_results]
+            y_vals = columns['avg_significance'][valid_results]
             ax4.scatter(x_vals, y_vals, alpha=0.6, c='purple')
             
             # Correlación
@@ -488,7 +684,7 @@ class RandomExperimentRunner:
         
         # Panel 5: Evolución temporal de experimentos
         ax5 = axes[1, 1]
-        experiment_ids = [r['experiment_id'] for r in results]
+        experiment_ids = columns['experiment_id']
         ax5.plot(experiment_ids, detection_rates, 'b-', alpha=0.7, linewidth=1)
         ax5.axhline(np.mean(detection_rates), color='red', linestyle='--', alpha=0.8)
         ax5.set_xlabel('Número de Experimento')
@@ -500,28 +696,28 @@ class RandomExperimentRunner:
         ax6 = axes[1, 2]
         ax6.axis('off')
         
-        experiments_with_detections = sum(1 for r in results if r['n_detected'] > 0)
-        experiments_above_3sigma = sum(1 for r in results if r['max_significance'] >= 3.0)
+        experiments_with_detections = int(np.sum(columns['n_detected'] > 0))
+        experiments_above_3sigma = int(np.sum(columns['max_significance'] >= 3.0))
         
         summary_text = f"""RESUMEN EXPERIMENTOS ALEATORIOS
 
 CONFIGURACIÓN:
-• {len(results)} experimentos independientes
-• {results[0]['sample_size'] if results else 0} eventos por experimento
+• {n_results} experimentos independientes
+• {columns['sample_size'][0] if n_results else 0} eventos por experimento
 • Población total: {len(self.population_data)} eventos
 
 RESULTADOS:
 • Tasa detección promedio: {np.mean(detection_rates):.1%}
-• Experimentos con detecciones: {experiments_with_detections}/{len(results)}
-• Experimentos >3σ: {experiments_above_3sigma}/{len(results)}
+• Experimentos con detecciones: {experiments_with_detections}/{n_results}
+• Experimentos >3σ: {experiments_above_3sigma}/{n_results}
 
 PARÁMETROS USADOS:
 • τ = {self.a_tau:.3f}/M^{{{self.n_tau:.3f}}} + {self.b_tau:.3f}
 • (Optimizados en Script 1)
 
 SIGNIFICANCIA TÍPICA:
-• Promedio: {np.mean(combined_sigmas) if combined_sigmas else 0:.2f}σ
-• Máxima: {np.max(combined_sigmas) if combined_sigmas else 0:.2f}σ
+• Promedio: {np.mean(combined_sigmas) if len(combined_sigmas) else 0:.2f}σ
+• Máxima: {np.max(combined_sigmas) if len(combined_sigmas) else 0:.2f}σ
 
 CONCLUSIÓN:
 {'✅ Evidencia consistente' if np.mean(detection_rates) > 0.1 else '⚠️ Evidencia limitada'}